@@ -0,0 +1,130 @@
+"""Armazém de imagens enviadas, endereçado pelo conteúdo.
+
+O Streamlit reexecuta o script inteiro a cada interação, e cada
+reexecução regravava todas as imagens enviadas. Aqui cada conteúdo é gravado
+uma única vez em ``.objetos/<sha256>.png``, em blocos, sem montar o arquivo
+inteiro em memória. O nome visível em ``imagens/`` é um link para esse
+objeto, então imagens iguais usadas por sistemas diferentes ocupam espaço
+uma vez só, e reenvios do mesmo conteúdo não escrevem nada em disco.
+
+Com ``processar`` (ex.: ``normalizacao_imagens.normalizar_png``), o upload
+é transformado antes de ser guardado; o processamento roda uma vez por
+upload, e as informações que ele devolve ficam em ``metadados.json``.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+BLOCO = 256 * 1024
+PASTA_OBJETOS = ".objetos"
+ARQUIVO_METADADOS = "metadados.json"
+
+
+def _hash_stream(arquivo):
+    h = hashlib.sha256()
+    arquivo.seek(0)
+    for parte in iter(lambda: arquivo.read(BLOCO), b""):
+        h.update(parte)
+    arquivo.seek(0)
+    return h.hexdigest()
+
+
+def _hash_caminho(caminho):
+    with open(caminho, "rb") as f:
+        return _hash_stream(f)
+
+
+class ArmazemImagens:
+    """Guarda uploads por hash de conteúdo e expõe cada um pelo nome escolhido"""
+
+    def __init__(self, pasta, memo=None, processar=None):
+        self.pasta = Path(pasta)
+        self.objetos = self.pasta / PASTA_OBJETOS
+        # Memória (ex.: st.session_state) de uploads já vistos -> registro
+        self.memo = {} if memo is None else memo
+        self.processar = processar
+        self.escritas = 0
+
+    def _chave_upload(self, arquivo, nome):
+        identificador = getattr(arquivo, "file_id", None)
+        if not identificador:
+            return None
+        return (nome, identificador, getattr(arquivo, "size", None), self.processar is not None)
+
+    def _objeto(self, digest, nome):
+        return self.objetos / f"{digest}{Path(nome).suffix.lower()}"
+
+    def _gravar_objeto(self, arquivo, objeto):
+        self.objetos.mkdir(parents=True, exist_ok=True)
+        fd, temporario = tempfile.mkstemp(suffix=".tmp", dir=self.objetos)
+        try:
+            with os.fdopen(fd, "wb") as destino:
+                arquivo.seek(0)
+                shutil.copyfileobj(arquivo, destino, BLOCO)
+            os.replace(temporario, objeto)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+        arquivo.seek(0)
+        self.escritas += 1
+
+    def _ligar(self, objeto, destino):
+        """Cria ``destino`` apontando para o objeto (link físico ou cópia)"""
+        temporario = destino.with_name(f".{destino.name}.tmp")
+        if temporario.exists():
+            temporario.unlink()
+        try:
+            os.link(objeto, temporario)
+        except OSError:
+            shutil.copyfile(objeto, temporario)
+        os.replace(temporario, destino)
+        self.escritas += 1
+
+    def _registrar_metadados(self, nome, info):
+        """Atualiza metadados.json só quando a entrada da imagem muda"""
+        caminho = self.pasta / ARQUIVO_METADADOS
+        metadados = {}
+        if caminho.exists():
+            with open(caminho, encoding="utf-8") as f:
+                metadados = json.load(f)
+        if metadados.get(nome) == info:
+            return
+        metadados[nome] = info
+        temporario = caminho.with_name(f".{caminho.name}.tmp")
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(metadados, f, indent=2, sort_keys=True, ensure_ascii=False)
+        os.replace(temporario, caminho)
+        self.escritas += 1
+
+    def guardar(self, arquivo, nome):
+        """Guarda o upload com o nome dado e devolve o registro dele
+
+        O registro tem o caminho final (``caminho``), o hash do conteúdo
+        guardado (``sha256``) e o que ``processar`` tiver informado. Não
+        escreve nada se o conteúdo já estiver lá.
+        """
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        chave = self._chave_upload(arquivo, nome)
+        registro = self.memo.get(chave) if chave is not None else None
+        if registro is None or not self._objeto(registro["sha256"], nome).exists():
+            conteudo, info = self.processar(arquivo) if self.processar else (arquivo, {})
+            registro = dict(info, sha256=_hash_stream(conteudo))
+            objeto = self._objeto(registro["sha256"], nome)
+            if not objeto.exists():
+                self._gravar_objeto(conteudo, objeto)
+            if chave is not None:
+                self.memo[chave] = registro
+        objeto = self._objeto(registro["sha256"], nome)
+
+        destino = self.pasta / nome
+        if not destino.exists() or not (
+            os.path.samefile(destino, objeto) or _hash_caminho(destino) == registro["sha256"]
+        ):
+            self._ligar(objeto, destino)
+        if self.processar is not None:
+            self._registrar_metadados(nome, {k: v for k, v in registro.items() if k != "sha256"})
+        return dict(registro, caminho=destino)
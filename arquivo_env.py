@@ -0,0 +1,60 @@
+"""Gravação em lote do arquivo .env.
+
+Lê e interpreta o arquivo uma vez, aplica todas as alterações em memória e
+substitui o arquivo de uma só vez (grava um temporário na mesma pasta e
+renomeia por cima). Uma falha no meio do caminho deixa o .env antigo
+intacto, então não é preciso fazer backup antes.
+"""
+import io
+import os
+import tempfile
+
+from dotenv.parser import parse_stream
+
+
+def formatar_linha(chave, valor):
+    """Formata ``CHAVE='valor'`` com as mesmas aspas do ``dotenv.set_key``"""
+    valor = (valor or "").replace("'", "\\'")
+    return f"{chave}='{valor}'\n"
+
+
+def atualizar_env(caminho, alteracoes):
+    """Aplica todas as ``alteracoes`` (chave -> valor) numa única escrita atômica"""
+    caminho = os.path.abspath(caminho)
+    conteudo = ""
+    if os.path.exists(caminho):
+        with open(caminho, encoding="utf-8") as f:
+            conteudo = f.read()
+
+    # Como o dotenv.set_key, reescreve todas as ocorrências de uma chave
+    # repetida (senão a última, que é a que vale, continuaria com o valor antigo)
+    pendentes = dict(alteracoes)
+    saida = io.StringIO()
+    for binding in parse_stream(io.StringIO(conteudo)):
+        original = binding.original.string
+        if binding.key in alteracoes:
+            saida.write(formatar_linha(binding.key, alteracoes[binding.key]))
+            pendentes.pop(binding.key, None)
+        else:
+            saida.write(original)
+    if pendentes:
+        texto = saida.getvalue()
+        if texto and not texto.endswith("\n"):
+            saida.write("\n")
+        for chave, valor in pendentes.items():
+            saida.write(formatar_linha(chave, valor))
+
+    pasta = os.path.dirname(caminho)
+    fd, temporario = tempfile.mkstemp(prefix=".env.", dir=pasta)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(saida.getvalue())
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(caminho):
+            os.chmod(temporario, os.stat(caminho).st_mode)
+        os.replace(temporario, caminho)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
@@ -1,111 +1,118 @@
+"""Bom dia por voz a partir da pasta do projeto (entrada legada).
+
+O pacote de cada usuário traz o ``voz_listener.py`` e o ``bom_dia.py``; este
+arquivo faz o mesmo direto desta pasta, para testar sem gerar o pacote (o
+web app grava aqui o ``.env`` e o ``plano.json``). Como o listener gerado,
+lê o ``plano.json`` desta pasta: não sonda mais ``LOGIN_*`` de uma lista
+fixa de sistemas nem ``URL_CUSTOM_0``, ``URL_CUSTOM_1``... O
+``automacao_generica.py`` é só um outro nome para este arquivo.
+"""
+import argparse
 import os
-import pyautogui
-import pyperclip
-from dotenv import load_dotenv
-from time import sleep
-import webbrowser
-import speech_recognition as sr
-import subprocess
 import threading
+from time import sleep
 
-# Carrega variáveis do .env
-dotenv_path = os.path.join(os.path.dirname(__file__), '.env')
-load_dotenv(dotenv_path)
-
-def ouvir_comando():
-    """Função para ouvir e reconhecer a fala"""
-    recognizer = sr.Recognizer()
-    with sr.Microphone() as source:
-        print("Aguardando comando de voz...")
-        recognizer.adjust_for_ambient_noise(source)
-        audio = recognizer.listen(source)
-        try:
-            comando = recognizer.recognize_google(audio, language='pt-BR')
-            print(f"Comando reconhecido: {comando}")
-            return comando.lower()
-        except sr.UnknownValueError:
-            print("Não foi possível entender o áudio")
-            return None
-        except sr.RequestError as e:
-            print(f"Erro ao fazer requisição ao Google Speech Recognition; {e}")
-            return None
-
-def executar_bom_dia():
-    """Função para executar o script bom_dia.py"""
-    try:
-        caminho_bom_dia = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'bom_dia.py')
-        subprocess.run(['python', caminho_bom_dia])
-    except Exception as e:
-        print(f"Erro ao executar bom_dia.py: {e}")
+# Os módulos pesados (pyautogui, speech_recognition, numpy, dotenv) só são
+# importados dentro das funções que precisam deles, então importar este
+# arquivo é barato (ex.: a partir do web app ou de testes)
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+dotenv_path = os.path.join(PASTA, '.env')
+
+def carregar_env():
+    """Carrega variáveis do .env (antes de importar os módulos que leem o ambiente)"""
+    from dotenv import load_dotenv
+    load_dotenv(dotenv_path)
+
+def carregar_plano(pasta=PASTA):
+    """Lê o plano.json da pasta"""
+    import plano
+
+    return plano.carregar(os.path.join(pasta, plano.ARQUIVO_PLANO))
+
+def executar_bom_dia(executor):
+    """Função para disparar a rotina do bom_dia.py já carregada"""
+    from rastreamento import fase
+
+    with fase("disparo_rotina", isolada=executor.isolar):
+        executor.disparar()
 
 def monitorar_comandos():
     """Função para monitorar comandos de voz continuamente"""
+    import plano
+    from captura_audio import CapturaContinua
+    from comandos import comandos_padrao
+    from executor_rotina import ExecutorRotina
+    from ouvinte import Ouvinte
+    from palavra_chave import MODO_OFFLINE, DetectorPalavraChave
+
+    # Um único microfone aberto e calibrado uma vez para toda a sessão; a
+    # captura contínua segue gravando enquanto uma frase é reconhecida e o
+    # filtro local evita mandar conversa de fundo para o Google
+    ouvinte = Ouvinte(
+        detector=DetectorPalavraChave.de_pasta(),
+        offline=MODO_OFFLINE,
+        captura=CapturaContinua(),
+    )
+    ouvinte.iniciar()
+    # A rotina fica importada e pronta; o gatilho só a dispara
+    executor = ExecutorRotina(os.path.join(PASTA, 'bom_dia.py'))
+    executor.aquecer()
+    plano_usuario = carregar_plano()
+    # "bom dia" dispara a rotina inteira; "abrir SEI", "ler notícias"... um sistema só,
+    # na mesma thread da rotina (um comando por vez)
+    registro = comandos_padrao(
+        lambda: executar_bom_dia(executor),
+        plano.sistemas(plano_usuario),
+        lambda nome, url: plano.abrir_sistema(plano_usuario, nome, pasta=PASTA),
+        despachar=executor.despachar,
+    )
+    print("Aguardando comando de voz...")
     while True:
-        comando = ouvir_comando()
-        if comando and "bom dia" in comando:
-            print("Executando automação do bom dia...")
-            executar_bom_dia()
-        sleep(1)
-
-# Inicia o monitoramento de comandos em uma thread separada
-thread_comandos = threading.Thread(target=monitorar_comandos)
-thread_comandos.daemon = True
-thread_comandos.start()
-
-# Função para abrir um site e preencher login/senha
-def abrir_site(url, login=None, senha=None, delay=5):
-    webbrowser.open(url)
-    sleep(delay)  # Aguarda o site abrir
-    if login:
-        pyperclip.copy(login)
-        pyautogui.hotkey('ctrl', 'v')
-        pyautogui.press('tab')
-        sleep(1)
-    if senha:
-        pyperclip.copy(senha)
-        pyautogui.hotkey('ctrl', 'v')
-        pyautogui.press('enter')
-        sleep(2)
-
-# Exemplo para sistemas populares
-sistemas = [
-    ("GMAIL", "https://mail.google.com"),
-    ("SPOTIFY", "https://open.spotify.com"),
-    ("GOOGLE_AGENDA", "https://calendar.google.com"),
-    ("SITES_DE_NOTICIAS", "https://g1.globo.com"),
-    ("YOUTUBE", "https://www.youtube.com"),
-    ("WEBMAIL", "https://webmail.itec.al.gov.br"),
-    ("SEI", "https://sei.al.gov.br/sip/login.php"),
-    ("TJ_AL", "https://www2.tjal.jus.br/sajcas/login"),
-    ("SOLAR", "https://solar.defensoria.al.def.br/atendimento/"),
-    ("CHATGPT", "https://chat.openai.com"),
-    ("DIARIO_OFICIAL", "https://defensoria.al.def.br/diario-oficial")
-]
-
-for nome, url in sistemas:
-    login = os.getenv(f"LOGIN_{nome}")
-    senha = os.getenv(f"SENHA_{nome}")
-    if login or senha:
-        print(f"Abrindo {nome}...")
-        abrir_site(url, login, senha)
-
-# Para sistemas personalizados
-idx = 0
-while True:
-    url = os.getenv(f"URL_CUSTOM_{idx}")
-    login = os.getenv(f"LOGIN_CUSTOM_{idx}")
-    senha = os.getenv(f"SENHA_CUSTOM_{idx}")
-    if not url:
-        break
-    print(f"Abrindo sistema personalizado: {url}")
-    abrir_site(url, login, senha)
-    idx += 1
-
-print("Automação concluída!")
-
-# Mantém o programa rodando para continuar monitorando comandos de voz
-try:
-    while True:
-        sleep(1)
-except KeyboardInterrupt:
-    print("\nPrograma encerrado pelo usuário.") 
+        comando = ouvinte.interpretar(ouvinte.ouvir())
+        if comando:
+            registro.executar(comando)
+
+def iniciar_monitoramento():
+    """Inicia o monitoramento de comandos em uma thread separada"""
+    thread_comandos = threading.Thread(target=monitorar_comandos)
+    thread_comandos.daemon = True
+    thread_comandos.start()
+    return thread_comandos
+
+def executar_uma_vez(pasta=PASTA):
+    """Roda o plano da pasta: abre os sites de uma vez e preenche os logins em série"""
+    import plano
+
+    plano.executar(carregar_plano(pasta), pasta)
+    print("Automação concluída!")
+
+def manter_ativo():
+    """Mantém o programa rodando para continuar monitorando comandos de voz"""
+    try:
+        while True:
+            sleep(1)
+    except KeyboardInterrupt:
+        print("\nPrograma encerrado pelo usuário.")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Automação do bom dia por voz")
+    subcomandos = parser.add_subparsers(dest="comando")
+    subcomandos.add_parser("listen", help="Só escuta o comando de voz \"bom dia\"")
+    subcomandos.add_parser("run-once", help="Executa a rotina uma vez e sai")
+    args = parser.parse_args(argv)
+
+    carregar_env()
+    if args.comando == "listen":
+        iniciar_monitoramento()
+        manter_ativo()
+    elif args.comando == "run-once":
+        executar_uma_vez()
+    else:
+        # Sem subcomando: escuta e executa a rotina uma vez, como antes
+        iniciar_monitoramento()
+        executar_uma_vez()
+        manter_ativo()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""Mede a rotina do bom dia de ponta a ponta, sem navegador nem teclado.
+
+Roda ``automacao_voz.executar_uma_vez()`` com um ``plano.json`` temporário
+(todos os sistemas do catálogo + sites personalizados) contra um navegador falso registrado no ``webbrowser`` e
+módulos falsos de ``pyautogui``, ``pyperclip`` e ``pygetwindow``. O
+navegador falso abre uma aba por URL, e cada aba leva o tempo de
+carregamento simulado configurado até parar de mudar na tela; a "tela"
+devolvida pelo ``screenshot`` falso e o título da janela dependem da aba em
+foco e do estado dela (carregando, pronta, logada).
+
+Mede:
+
+- latência de cada site: abertura, página pronta e login enviado (Enter),
+  em segundos desde o início da rotina;
+- tempo total da rotina;
+- tempo dormindo (``time.sleep``) contra tempo trabalhando (o resto).
+
+O resultado vai para um JSON (por padrão ``benchmarks/resultados/bom_dia.json``,
+fora do controle de versão), para comparar versões sem monitor:
+
+    python benchmarks/bench_bom_dia.py [--carga 0.5-3] [--custom 2] [--semente 1] [--saida arquivo.json]
+
+``--carga`` aceita um valor fixo (``2``) ou um intervalo (``0.5-3``), de
+onde sai um tempo aleatório por site. A captura de tela falsa não custa
+nada, então o trabalho medido é só o do próprio código da rotina.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import types
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+SAIDA_PADRAO = os.path.join(RAIZ, "benchmarks", "resultados", "bom_dia.json")
+
+# --- relógio de sono ------------------------------------------------------
+
+_sleep_real = time.sleep
+_dormindo = [0.0]
+
+
+def _sleep_medido(segundos):
+    inicio = time.perf_counter()
+    _sleep_real(segundos)
+    _dormindo[0] += time.perf_counter() - inicio
+
+
+# --- navegador e tela falsos ----------------------------------------------
+
+COR_DESKTOP = 10
+TEMPO_ENVIO_LOGIN = 0.3
+
+
+class Aba:
+    def __init__(self, url, aberta_em, carga):
+        self.url = url
+        self.aberta_em = aberta_em
+        self.pronta_em = aberta_em + carga
+        self.login_em = None
+
+    def cor(self, indice, agora, quadro):
+        # Carregando: a tela muda a cada captura
+        if agora < self.pronta_em:
+            return 0 if quadro % 2 else 255
+        if self.login_em is None:
+            return 150 + (indice % 8) * 12
+        if agora < self.login_em + TEMPO_ENVIO_LOGIN:
+            return 0 if quadro % 2 else 255
+        return 20 + (indice % 8) * 12
+
+    def titulo(self, agora):
+        # Como no Chrome: o endereço (sem o esquema) enquanto a página não
+        # define um título
+        endereco = urlparse(self.url)
+        endereco = endereco.hostname + endereco.path.rstrip("/")
+        return endereco if agora < self.pronta_em else f"Entrar - {endereco}"
+
+
+class JanelaFalsa:
+    """Janela do navegador falso, como o ``pygetwindow`` a devolve"""
+
+    def __init__(self, navegador):
+        self.navegador = navegador
+
+    @property
+    def title(self):
+        navegador = self.navegador
+        if navegador.ativa is None:
+            return "Área de trabalho"
+        return navegador.abas[navegador.ativa].titulo(navegador.agora()) + " - Navegador falso"
+
+    def activate(self):
+        pass
+
+
+class NavegadorFalso:
+    def __init__(self, cargas):
+        self.cargas = cargas
+        self.abas = []
+        self.ativa = None
+        self.inicio = None
+        self.area_transferencia = ""
+        self.eventos = []
+        self.capturas = 0
+
+    def agora(self):
+        return time.perf_counter() - self.inicio
+
+    # webbrowser
+    def open(self, url, new=0, autoraise=True):
+        self.abas.append(Aba(url, self.agora(), self.cargas[url]))
+        self.ativa = len(self.abas) - 1
+        return True
+
+    # pyautogui
+    def screenshot(self):
+        from PIL import Image
+
+        self.capturas += 1
+        if self.ativa is None:
+            cor = COR_DESKTOP
+        else:
+            cor = self.abas[self.ativa].cor(self.ativa, self.agora(), self.capturas)
+        return Image.new("L", (64, 36), cor)
+
+    def hotkey(self, *teclas):
+        self.eventos.append(("hotkey", teclas, self.agora()))
+        if teclas == ("ctrl", "9") and self.abas:
+            self.ativa = len(self.abas) - 1
+        elif teclas == ("ctrl", "pageup") and self.ativa:
+            self.ativa -= 1
+
+    def press(self, teclas, presses=1, interval=0.0):
+        for tecla in [teclas] if isinstance(teclas, str) else teclas:
+            self.eventos.append(("press", tecla, self.agora()))
+            if tecla == "enter" and self.ativa is not None:
+                self.abas[self.ativa].login_em = self.agora()
+
+    def click(self, *args, **kwargs):
+        self.eventos.append(("click", args, self.agora()))
+
+    # pyperclip
+    def copy(self, texto):
+        self.area_transferencia = texto
+
+    def paste(self):
+        return self.area_transferencia
+
+
+def instalar_falsos(navegador):
+    """Coloca os módulos falsos no lugar dos reais (só neste processo)"""
+    import webbrowser
+
+    # Registrado como navegador preferido: sem linha de comando, o
+    # navegador.abrir_urls abre uma URL por vez, como um navegador real
+    webbrowser.register("falso", None, navegador, preferred=True)
+    pyautogui = types.ModuleType("pyautogui")
+    pyautogui.screenshot = navegador.screenshot
+    pyautogui.hotkey = navegador.hotkey
+    pyautogui.press = navegador.press
+    pyautogui.click = navegador.click
+    pyautogui.PAUSE = 0
+    pyperclip = types.ModuleType("pyperclip")
+    pyperclip.copy = navegador.copy
+    pyperclip.paste = navegador.paste
+    pygetwindow = types.ModuleType("pygetwindow")
+    pygetwindow.getActiveWindow = lambda: JanelaFalsa(navegador)
+    sys.modules.update(pyautogui=pyautogui, pyperclip=pyperclip, pygetwindow=pygetwindow)
+
+
+# --- execução -------------------------------------------------------------
+
+def sortear_carga(especificacao, sorteio):
+    if "-" in especificacao:
+        minimo, maximo = (float(v) for v in especificacao.split("-", 1))
+        return round(sorteio.uniform(minimo, maximo), 3)
+    return float(especificacao)
+
+
+def medir(carga="0.5-3", custom=2, semente=1):
+    # O sono medido precisa estar no lugar antes de importar a rotina, que
+    # faz ``from time import sleep``
+    time.sleep = _sleep_medido
+    import automacao_voz
+    from gerador_pacote import SISTEMAS_POPULARES, montar_plano
+
+    sorteio = random.Random(semente)
+    personalizados = [{"nome": f"Custom {i}", "url": f"https://custom{i}.exemplo"} for i in range(custom)]
+    plano = montar_plano(SISTEMAS_POPULARES, personalizados)
+    for passo in plano["passos"]:
+        os.environ[passo["login"]] = f"usuario_{passo['nome'].lower()}"
+        os.environ[passo["senha"]] = "senha"
+    pasta = tempfile.mkdtemp(prefix="bench_bom_dia_")
+    with open(os.path.join(pasta, "plano.json"), "w", encoding="utf-8") as f:
+        json.dump(plano, f)
+
+    urls = [passo["url"] for passo in plano["passos"]]
+    cargas = {url: sortear_carga(carga, sorteio) for url in urls}
+    navegador = NavegadorFalso(cargas)
+    instalar_falsos(navegador)
+
+    navegador.inicio = time.perf_counter()
+    _dormindo[0] = 0.0
+    automacao_voz.executar_uma_vez(pasta)
+    shutil.rmtree(pasta, ignore_errors=True)
+    total = navegador.agora()
+    dormindo = _dormindo[0]
+
+    sites = []
+    for aba in navegador.abas:
+        sites.append({
+            "url": aba.url,
+            "carga_simulada": cargas[aba.url],
+            "aberto": round(aba.aberta_em, 4),
+            "pronto": round(aba.pronta_em, 4),
+            "login_enviado": None if aba.login_em is None else round(aba.login_em, 4),
+        })
+    return {
+        "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "parametros": {"carga": carga, "custom": custom, "semente": semente},
+        "total": round(total, 4),
+        "dormindo": round(dormindo, 4),
+        "trabalhando": round(total - dormindo, 4),
+        "capturas_de_tela": navegador.capturas,
+        "carga_mais_lenta": max(cargas.values()),
+        "soma_das_cargas": round(sum(cargas.values()), 3),
+        "sites": sites,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--carga", default="0.5-3", help="tempo de carregamento (s): fixo ou intervalo min-max")
+    parser.add_argument("--custom", type=int, default=2, help="quantidade de sites personalizados")
+    parser.add_argument("--semente", type=int, default=1)
+    parser.add_argument("--saida", default=SAIDA_PADRAO, help="arquivo JSON com o resultado")
+    args = parser.parse_args()
+
+    resultado = medir(args.carga, args.custom, args.semente)
+    os.makedirs(os.path.dirname(os.path.abspath(args.saida)), exist_ok=True)
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+
+    # Resumo legível; a saída da própria rotina vai junto, acima
+    print()
+    for site in resultado["sites"]:
+        print(f"{site['url']:48s} carga {site['carga_simulada']:5.2f} s  login {site['login_enviado']} s")
+    print(f"total {resultado['total']:.2f} s (mais lenta {resultado['carga_mais_lenta']:.2f} s, "
+          f"soma {resultado['soma_das_cargas']:.2f} s)")
+    print(f"dormindo {resultado['dormindo']:.2f} s, trabalhando {resultado['trabalhando']:.2f} s")
+    print(f"resultado em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""CPU e bytes por frase no preparo do áudio para o reconhecimento.
+
+Uma frase sintética (silêncio, "voz" com harmônicos, silêncio) na taxa do
+microfone é preparada de três formas:
+
+- ``flac``: o que o ``recognize_google`` faz (programa ``flac`` externo, taxa
+  nativa); só roda se o conversor estiver instalado;
+- ``pcm_nativo``: o áudio cru, como referência de tamanho;
+- ``l16_16k``: ``codificacao_audio.codificar`` (16 kHz, sem silêncio nas pontas).
+
+O tempo de CPU inclui os processos filhos (o ``flac``).
+
+    python benchmarks/bench_codificacao.py [--taxa 44100] [--repeticoes 50]
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import speech_recognition as sr
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from codificacao_audio import codificar  # noqa: E402
+
+
+def frase_sintetica(taxa, silencio_antes=0.6, fala=1.2, silencio_depois=0.8, semente=0):
+    """Ruído de fundo baixo em volta de um trecho com harmônicos modulados"""
+    sorteio = np.random.default_rng(semente)
+    total = int((silencio_antes + fala + silencio_depois) * taxa)
+    sinal = sorteio.normal(0, 30, total)
+    t = np.arange(int(fala * taxa)) / taxa
+    voz = sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 12))
+    voz *= 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t) ** 2   # sílabas
+    inicio = int(silencio_antes * taxa)
+    sinal[inicio:inicio + len(voz)] += 4000 * voz
+    return sr.AudioData(np.clip(sinal, -32768, 32767).astype("<i2").tobytes(), taxa, 2)
+
+
+def tempo_cpu():
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def medir(nome, preparar, repeticoes):
+    inicio = tempo_cpu()
+    for _ in range(repeticoes):
+        tamanho = len(preparar())
+    cpu = (tempo_cpu() - inicio) / repeticoes
+    print(f"{nome:12s} CPU {cpu * 1000:7.2f} ms/frase  {tamanho:8d} bytes/frase")
+    return cpu, tamanho
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--taxa", type=int, default=44100, help="taxa do microfone simulado")
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+
+    audio = frase_sintetica(args.taxa)
+    print(f"frase de {len(audio.frame_data) / 2 / args.taxa:.1f} s a {args.taxa} Hz")
+    try:
+        audio.get_flac_data()
+        medir("flac", audio.get_flac_data, args.repeticoes)
+    except OSError as e:
+        print(f"flac        indisponível ({e})")
+    medir("pcm_nativo", lambda: audio.frame_data, args.repeticoes)
+    medir("l16_16k", lambda: codificar(audio)[0], args.repeticoes)
+    _, _, resumo = codificar(audio)
+    print(f"duração enviada {resumo['duracao_enviada']:.2f} s de {resumo['duracao_original']:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
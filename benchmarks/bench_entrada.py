@@ -0,0 +1,103 @@
+"""Custo de preencher um login: colar campo a campo contra digitar numa chamada.
+
+Um pyautogui falso aplica a ``PAUSE`` depois de cada chamada (como o real)
+e um pyperclip falso inicia um processo a cada cópia, como o ``xclip`` no
+Linux. Para cada forma de preencher (login + Tab + senha + Enter) mede o
+tempo por login, os processos iniciados, as chamadas ao pyautogui e o que
+sobra na área de transferência no fim.
+
+- ``antigo``: ``pyperclip.copy`` + Ctrl+V por campo, ``PAUSE`` padrão (0,1 s);
+- ``area_transferencia``: ``EntradaAreaTransferencia``;
+- ``teclado``: ``EntradaTeclado``.
+
+    python benchmarks/bench_entrada.py [--logins 20]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from entrada import EntradaAreaTransferencia, EntradaTeclado  # noqa: E402
+
+LOGIN = "maria.silva@defensoria.al.def.br"
+SENHA = "S3nha-Forte!2024"
+
+
+class PyautoguiFalso:
+    PAUSE = 0.1
+
+    def __init__(self):
+        self.chamadas = 0
+        self.teclas = []
+
+    def _chamada(self):
+        self.chamadas += 1
+        time.sleep(self.PAUSE)
+
+    def hotkey(self, *teclas):
+        self.teclas.append("+".join(teclas))
+        self._chamada()
+
+    def press(self, teclas, presses=1, interval=0.0):
+        for tecla in [teclas] if isinstance(teclas, str) else teclas:
+            self.teclas.append(tecla)
+            if interval:
+                time.sleep(interval)
+        self._chamada()
+
+
+class PyperclipFalso:
+    def __init__(self):
+        self.conteudo = ""
+        self.processos = 0
+
+    def copy(self, texto):
+        # O xclip/xsel de verdade: um processo novo por cópia
+        subprocess.run(["true"])
+        self.processos += 1
+        self.conteudo = texto
+
+
+def antigo(pyautogui, pyperclip, login, senha):
+    """preencher_credenciais antes do backend de entrada"""
+    pyperclip.copy(login)
+    pyautogui.hotkey('ctrl', 'v')
+    pyautogui.press('tab')
+    pyperclip.copy(senha)
+    pyautogui.hotkey('ctrl', 'v')
+    pyautogui.press('enter')
+
+
+def com_backend(classe):
+    def preencher(pyautogui, pyperclip, login, senha):
+        entrada = classe(pyautogui=pyautogui, pyperclip=pyperclip)
+        entrada.preencher(login, senha)
+        entrada.confirmar()
+    return preencher
+
+
+def medir(nome, preencher, logins):
+    pyautogui, pyperclip = PyautoguiFalso(), PyperclipFalso()
+    inicio = time.perf_counter()
+    for _ in range(logins):
+        preencher(pyautogui, pyperclip, LOGIN, SENHA)
+    duracao = (time.perf_counter() - inicio) / logins
+    sobra = "senha" if pyperclip.conteudo == SENHA else repr(pyperclip.conteudo)
+    print(f"{nome:18s} {duracao * 1000:7.1f} ms/login  processos {pyperclip.processos / logins:.0f}  "
+          f"chamadas {pyautogui.chamadas / logins:.0f}  área de transferência no fim: {sobra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=20)
+    args = parser.parse_args()
+
+    medir("antigo", antigo, args.logins)
+    medir("area_transferencia", com_backend(EntradaAreaTransferencia), args.logins)
+    medir("teclado", com_backend(EntradaTeclado), args.logins)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Mede o custo de importar os scripts de automação (estilo ``-X importtime``).
+
+Compara três cenários, cada um num interpretador novo:
+
+- ``cabecalho_antigo``: os imports que ``automacao_voz.py`` fazia no topo
+  antes de ganhar ``main()`` (pyautogui, pyperclip, dotenv,
+  speech_recognition...). O script antigo não pode ser importado de fato,
+  porque abria os sites e ligava o microfone já no import.
+- ``automacao_voz``: importar o módulo atual.
+- ``run_once``: os imports do caminho ``run-once`` (sem áudio).
+
+Sem tela (``DISPLAY`` vazio), ``pyautogui`` e ``pyscreeze`` falham já no
+import; nesse caso o cabeçalho antigo roda com os dois trocados por módulos
+vazios em ``sys.modules``, e o número dele fica sem o custo dessas duas
+bibliotecas (é um piso). Os cenários cujas demais dependências não
+estiverem instaladas são indicados como indisponíveis.
+
+    python benchmarks/bench_importacao.py [repeticoes]
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CENARIOS = {
+    "cabecalho_antigo": "import os, pyautogui, pyperclip, dotenv, time, webbrowser, "
+                        "speech_recognition, subprocess, threading",
+    "automacao_voz": "import automacao_voz",
+    "run_once": "import automacao_voz, dotenv, rotina",
+}
+
+# Módulos vazios no lugar das bibliotecas que exigem tela
+SEM_TELA = (
+    "import sys, types\n"
+    "for _nome in ('pyautogui', 'pyscreeze'):\n"
+    "    sys.modules.setdefault(_nome, types.ModuleType(_nome))\n"
+)
+
+LINHA = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def medir(codigo):
+    """Soma o tempo cumulativo (µs) dos imports de primeiro nível"""
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+    )
+    if resultado.returncode != 0:
+        return None
+    total = 0
+    for linha in resultado.stderr.splitlines():
+        m = LINHA.match(linha)
+        if m and not m.group(3):
+            total += int(m.group(2))
+    return total
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    sem_tela = os.name != "nt" and sys.platform != "darwin" and not os.environ.get("DISPLAY")
+    for nome, codigo in CENARIOS.items():
+        if sem_tela and nome == "cabecalho_antigo":
+            codigo = SEM_TELA + codigo
+            nome += "*"
+        amostras = [medir(codigo) for _ in range(repeticoes)]
+        if any(a is None for a in amostras):
+            print(f"{nome:18s} indisponível (dependência não instalada)")
+            continue
+        print(f"{nome:18s} {statistics.median(amostras) / 1000:8.1f} ms (mediana de {repeticoes})")
+    if sem_tela:
+        print("* sem tela: pyautogui e pyscreeze substituídos por módulos vazios")
+
+
+if __name__ == "__main__":
+    main()
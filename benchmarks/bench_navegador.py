@@ -0,0 +1,95 @@
+"""Abertura das URLs da rotina: uma chamada por URL contra uma chamada só.
+
+Um "navegador" falso (um script que anota os argumentos recebidos e demora
+``--atraso`` segundos, como a conversa com a instância já aberta) é
+registrado no ``webbrowser`` de duas formas:
+
+- ``chrome``: como ``webbrowser.Chrome`` (caminho dos navegadores Unix);
+- ``comando``: como ``webbrowser.BackgroundBrowser`` (linha de comando genérica).
+
+Para cada uma, compara ``webbrowser.open`` em cada URL com
+``navegador.abrir_urls`` (uma chamada com todas), em processos iniciados,
+tempo até a última URL entregue e ordem em que chegaram.
+
+    python benchmarks/bench_navegador.py [--urls 12] [--atraso 0.15]
+"""
+import argparse
+import json
+import os
+import stat
+import sys
+import tempfile
+import time
+import webbrowser
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from navegador import abrir_urls  # noqa: E402
+
+NAVEGADOR_FALSO = """#!{python}
+import json, os, sys, time
+with open(os.environ["REGISTRO_NAVEGADOR"], "a") as f:
+    f.write(json.dumps({{"pid": os.getpid(), "args": sys.argv[1:], "t": time.time()}}) + "\\n")
+time.sleep({atraso})
+"""
+
+
+def criar_navegador_falso(pasta, atraso):
+    caminho = os.path.join(pasta, "navegador_falso")
+    with open(caminho, "w") as f:
+        f.write(NAVEGADOR_FALSO.format(python=sys.executable, atraso=atraso))
+    os.chmod(caminho, os.stat(caminho).st_mode | stat.S_IEXEC)
+    return caminho
+
+
+def ler_registro(caminho):
+    if not os.path.exists(caminho):
+        return []
+    with open(caminho) as f:
+        return [json.loads(linha) for linha in f]
+
+
+def medir(nome, abrir, urls, registro, atraso):
+    if os.path.exists(registro):
+        os.remove(registro)
+    inicio = time.time()
+    abrir(urls)
+    retorno = time.time() - inicio
+    # Os processos em segundo plano podem ainda estar anotando
+    limite = time.time() + 5 + atraso * len(urls)
+    while time.time() < limite:
+        chamadas = ler_registro(registro)
+        if sum(len([a for a in c["args"] if a.startswith("http")]) for c in chamadas) >= len(urls):
+            break
+        time.sleep(0.01)
+    entregues = [a for c in chamadas for a in c["args"] if a.startswith("http")]
+    fim = max((c["t"] for c in chamadas), default=inicio)
+    print(f"{nome:22s} processos {len(chamadas):3d}  retorno {retorno * 1000:7.1f} ms  "
+          f"última URL {(fim - inicio) * 1000:7.1f} ms  ordem {'ok' if entregues == list(urls) else 'trocada'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--urls", type=int, default=12)
+    parser.add_argument("--atraso", type=float, default=0.15, help="tempo de cada chamada ao navegador (s)")
+    args = parser.parse_args()
+
+    urls = [f"https://sistema{i}.exemplo/login" for i in range(args.urls)]
+    with tempfile.TemporaryDirectory() as pasta:
+        executavel = criar_navegador_falso(pasta, args.atraso)
+        registro = os.environ["REGISTRO_NAVEGADOR"] = os.path.join(pasta, "registro.jsonl")
+        webbrowser.register("falso-chrome", None, webbrowser.Chrome(executavel))
+        webbrowser.register("falso-comando", None, webbrowser.BackgroundBrowser([executavel, "%s"]))
+
+        for tipo in ("chrome", "comando"):
+            controlador = webbrowser.get(f"falso-{tipo}")
+
+            def uma_por_url(lista):
+                for url in lista:
+                    controlador.open(url)
+
+            medir(f"{tipo}: uma por URL", uma_por_url, urls, registro, args.atraso)
+            medir(f"{tipo}: abrir_urls", lambda lista: abrir_urls(lista, controlador), urls, registro, args.atraso)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Mede a sobrecarga por frase do ouvir_comando antigo e do Ouvinte.
+
+Usa uma fonte de áudio falsa que entrega os blocos no ritmo real (silêncio,
+depois 0,5 s de fala e silêncio de novo), então a calibração custa o mesmo
+tempo de áudio morto que custaria com o microfone de verdade. A sobrecarga é
+o tempo entre o início da chamada e o momento em que a captura da frase
+começa. O reconhecimento no Google não entra na conta.
+
+    python benchmarks/bench_ouvinte.py [repeticoes]
+"""
+import math
+import os
+import struct
+import sys
+import time
+
+import speech_recognition as sr
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ouvinte import Ouvinte  # noqa: E402
+
+TAXA = 16000
+BLOCO = 1024
+
+
+class StreamFalso:
+    """Stream que gera silêncio e um trecho de fala a cada frase"""
+
+    def __init__(self):
+        self.inicio_fala = None
+
+    def preparar_frase(self, atraso=0.1):
+        self.inicio_fala = time.monotonic() + atraso
+
+    def read(self, tamanho):
+        time.sleep(tamanho / TAXA)
+        agora = time.monotonic()
+        falando = self.inicio_fala is not None and 0 <= agora - self.inicio_fala < 0.5
+        amplitude = 8000 if falando else 30
+        return b"".join(
+            struct.pack("<h", int(amplitude * math.sin(2 * math.pi * 440 * i / TAXA)))
+            for i in range(tamanho)
+        )
+
+
+class MicrofoneFalso(sr.AudioSource):
+    def __init__(self, stream):
+        self.SAMPLE_RATE = TAXA
+        self.SAMPLE_WIDTH = 2
+        self.CHUNK = BLOCO
+        self.stream = None
+        self._stream = stream
+
+    def __enter__(self):
+        self.stream = self._stream
+        return self
+
+    def __exit__(self, *exc):
+        self.stream = None
+
+
+def marcar_inicio_captura(recognizer, stream, marcas):
+    """Registra quando listen() é chamado e prepara a fala falsa"""
+    listen_original = recognizer.listen
+
+    def listen(source, *args, **kwargs):
+        marcas.append(time.monotonic())
+        stream.preparar_frase()
+        return listen_original(source, *args, **kwargs)
+    recognizer.listen = listen
+
+
+def ouvir_antigo(stream):
+    """Corpo do ouvir_comando original, sem o reconhecimento"""
+    inicio = time.monotonic()
+    marcas = []
+    recognizer = sr.Recognizer()
+    marcar_inicio_captura(recognizer, stream, marcas)
+    with MicrofoneFalso(stream) as source:
+        recognizer.adjust_for_ambient_noise(source)
+        recognizer.listen(source)
+    return marcas[0] - inicio
+
+
+def ouvir_novo(ouvinte):
+    inicio = time.monotonic()
+    marcas = []
+    marcar_inicio_captura(ouvinte.recognizer, ouvinte.microfone.stream, marcas)
+    ouvinte.ouvir()
+    return marcas[0] - inicio
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    stream = StreamFalso()
+    antigo = [ouvir_antigo(stream) for _ in range(repeticoes)]
+
+    stream = StreamFalso()
+    inicio = time.monotonic()
+    ouvinte = Ouvinte(microfone=MicrofoneFalso(stream))
+    ouvinte.iniciar()
+    partida = time.monotonic() - inicio
+    novo = [ouvir_novo(ouvinte) for _ in range(repeticoes)]
+    limiar = ouvinte.recognizer.energy_threshold
+    # Sem fala, o ajuste dinâmico traz o limiar de volta para perto do ruído
+    stream.inicio_fala = None
+    stream.preparar_frase = lambda atraso=0.1: None
+    try:
+        ouvinte.ouvir(timeout=2)
+    except sr.WaitTimeoutError:
+        pass
+    limiar_silencio = ouvinte.recognizer.energy_threshold
+    ouvinte.parar()
+
+    print(f"Sobrecarga por frase (antes): {1000 * sum(antigo) / len(antigo):.1f} ms")
+    print(f"Sobrecarga por frase (depois): {1000 * sum(novo) / len(novo):.1f} ms")
+    print(f"Calibração única na partida: {1000 * partida:.1f} ms")
+    print(f"Limiar de energia logo depois das frases: {limiar:.0f}, "
+          f"depois de 2 s de silêncio: {limiar_silencio:.0f} (ruído falso: amplitude 30; fala: 8000)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Ensaio do pré-aquecimento com o navegador falso do bench_bom_dia.
+
+Duas partes, sem navegador nem teclado de verdade:
+
+1. Agenda: com um relógio simulado, percorre um dia (de 30 em 30 s, como o
+   laço do listener) e mostra quando o ``Preaquecedor`` em modo de ensaio
+   (``simular=True``) abriria os sites,
+   para a janela fixa (``--janela``) e para a aprendida com gatilhos
+   sorteados entre 08:10 e 08:40 nos dias úteis anteriores.
+2. Latência: roda ``rotina.executar_rotina`` contra o navegador falso e mede
+   do gatilho até o último login enviado, sem pré-aquecimento e com os
+   sites abertos ``--antecedencia`` segundos antes do gatilho.
+
+    python benchmarks/bench_preaquecimento.py [--sites 6] [--carga 0.5-3] [--antecedencia 5]
+        [--janela 08:00-08:30] [--agora 2024-05-06]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_bom_dia import NavegadorFalso, instalar_falsos, sortear_carga  # noqa: E402
+
+import preaquecimento  # noqa: E402
+from preaquecimento import Preaquecedor, formatar, ler_janela  # noqa: E402
+
+
+class Relogio:
+    def __init__(self, momento):
+        self.momento = momento
+
+    def __call__(self):
+        return self.momento.timestamp()
+
+
+# --- 1. agenda -------------------------------------------------------------
+
+def urls_exemplo():
+    return ["https://sistema.exemplo"]
+
+
+def simular_dia(preaquecedor, relogio, dia):
+    """Horários em que o preaquecedor abriria os sites ao longo do dia"""
+    abertos = []
+    relogio.momento = datetime.combine(dia, datetime.min.time())
+    while relogio.momento.date() == dia:
+        if preaquecedor.verificar():
+            abertos.append(relogio.momento)
+        relogio.momento += timedelta(seconds=preaquecimento.INTERVALO_VERIFICACAO)
+    return abertos
+
+
+def agenda(janela, dia, semente):
+    print(f"Agenda em {dia:%a %d/%m/%Y}:")
+    relogio = Relogio(datetime.combine(dia, datetime.min.time()))
+    with tempfile.TemporaryDirectory() as pasta:
+        fixa = Preaquecedor(urls_exemplo, janela=ler_janela(janela), pasta=pasta, relogio=relogio, simular=True)
+        abertos = simular_dia(fixa, relogio, dia)
+        print(f"  janela fixa {janela}: abre às {', '.join(f'{m:%H:%M:%S}' for m in abertos) or 'nunca'}")
+
+        sorteio = random.Random(semente)
+        aprendida = Preaquecedor(urls_exemplo, aprender=True, pasta=pasta, relogio=relogio, simular=True)
+        for atras in range(28, 0, -1):
+            anterior = dia - timedelta(days=atras)
+            if anterior.weekday() in preaquecimento.DIAS_UTEIS:
+                minutos = sorteio.uniform(8 * 60 + 10, 8 * 60 + 40)
+                relogio.momento = datetime.combine(anterior, datetime.min.time()) + timedelta(minutes=minutos)
+                aprendida.registrar_gatilho()
+        relogio.momento = datetime.combine(dia, datetime.min.time())
+        inicio, fim = aprendida.janela()
+        abertos = simular_dia(aprendida, relogio, dia)
+        print(f"  janela aprendida com {len(aprendida.gatilhos())} gatilhos: {formatar(inicio)}-{formatar(fim)}, "
+              f"abre às {', '.join(f'{m:%H:%M:%S}' for m in abertos) or 'nunca'}")
+
+
+# --- 2. latência -----------------------------------------------------------
+
+def rodar(sites, cargas, antecedencia):
+    """Segundos do gatilho ao último login (Enter) no navegador falso"""
+    import rotina
+
+    navegador = NavegadorFalso(cargas)
+    instalar_falsos(navegador)
+    rotina._entrada = None
+    navegador.inicio = time.perf_counter()
+    if antecedencia is not None:
+        preaquecedor = Preaquecedor(lambda: [s.url for s in sites], janela=(0, 86400),
+                                    capturar_janela=lambda: "falsa", ativar=lambda janela: True,
+                                    do_navegador=lambda janela: True)
+        preaquecedor.preaquecer()
+        time.sleep(antecedencia)
+    gatilho = navegador.agora()
+    rotina.executar_rotina(sites)
+    logins = [aba.login_em for aba in navegador.abas]
+    if None in logins:
+        raise RuntimeError("algum site ficou sem login")
+    return max(logins) - gatilho
+
+
+def latencia(quantidade, carga, antecedencia, semente):
+    from rotina import Site
+
+    sorteio = random.Random(semente)
+    sites = [Site(f"SISTEMA{i}", f"https://sistema{i}.exemplo", f"usuario{i}", "senha")
+             for i in range(quantidade)]
+    cargas = {s.url: sortear_carga(carga, sorteio) for s in sites}
+    sem = rodar(sites, cargas, None)
+    com = rodar(sites, cargas, antecedencia)
+    print()
+    print(f"{quantidade} sites, carga {carga} s (mais lenta {max(cargas.values()):.2f} s)")
+    print(f"  gatilho -> último login sem pré-aquecimento: {sem:6.2f} s")
+    print(f"  gatilho -> último login com pré-aquecimento: {com:6.2f} s "
+          f"(sites abertos {antecedencia:.0f} s antes)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sites", type=int, default=6)
+    parser.add_argument("--carga", default="0.5-3", help="tempo de carregamento (s): fixo ou intervalo min-max")
+    parser.add_argument("--antecedencia", type=float, default=5, help="segundos entre abrir e o gatilho")
+    parser.add_argument("--janela", default="08:00-08:30")
+    parser.add_argument("--agora", default=None, help="dia simulado (AAAA-MM-DD); padrão: hoje")
+    parser.add_argument("--semente", type=int, default=1)
+    args = parser.parse_args()
+
+    # O navegador falso não precisa de tempo para aparecer na frente
+    preaquecimento.ESPERA_JANELA = 0
+    dia = datetime.strptime(args.agora, "%Y-%m-%d").date() if args.agora else datetime.now().date()
+    agenda(args.janela, dia, args.semente)
+    latencia(args.sites, args.carga, args.antecedencia, args.semente)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Carga no caminho de reconhecimento contra o servidor local (sem internet).
+
+Compara, com o mesmo áudio e o mesmo ``ServidorLocal``:
+
+- ``nova_conexao``: uma conexão HTTP por frase, como o ``recognize_google``
+  faz (urllib, sem novas tentativas);
+- ``BackendHttp``: sessão com conexões mantidas abertas e novas tentativas.
+
+Mostra latência p50/p95 por requisição, conexões abertas no servidor e, com
+``--falhas``, quantas frases ainda assim foram reconhecidas.
+
+    python benchmarks/bench_reconhecimento.py [--frases 50] [--atraso 0.05] [--falhas 0.2]
+"""
+import argparse
+import os
+import sys
+import time
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+import speech_recognition as sr
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rastreamento import percentil  # noqa: E402
+from reconhecimento import CHAVE_GOOGLE, BackendHttp, ServidorLocal, interpretar_resposta  # noqa: E402
+
+TAXA = 16000
+
+
+def audio_teste(segundos=1.5):
+    return sr.AudioData(b"\x10\x00" * int(TAXA * segundos), TAXA, 2)
+
+
+def nova_conexao(url, audio):
+    """O que o recognize_google faz: urllib, uma conexão por requisição"""
+    parametros = urlencode({"client": "chromium", "lang": "pt-BR", "key": CHAVE_GOOGLE, "pFilter": 0})
+    requisicao = Request(f"{url}?{parametros}", data=audio.get_flac_data(convert_width=2),
+                         headers={"Content-Type": f"audio/x-flac; rate={TAXA}"})
+    try:
+        return interpretar_resposta(urlopen(requisicao, timeout=10).read().decode("utf-8"))
+    except (HTTPError, URLError) as e:
+        raise sr.RequestError(str(e))
+
+
+def rodar(nome, reconhecer, servidor, frases, audio):
+    conexoes_antes = servidor.conexoes
+    duracoes, reconhecidas = [], 0
+    for _ in range(frases):
+        inicio = time.perf_counter()
+        try:
+            reconhecer(audio)
+            reconhecidas += 1
+        except sr.RequestError:
+            pass
+        duracoes.append(time.perf_counter() - inicio)
+    duracoes.sort()
+    print(f"{nome:14s} p50 {percentil(duracoes, 50) * 1000:7.1f} ms  p95 {percentil(duracoes, 95) * 1000:7.1f} ms  "
+          f"reconhecidas {reconhecidas}/{frases}  conexões novas {servidor.conexoes - conexoes_antes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frases", type=int, default=50)
+    parser.add_argument("--atraso", type=float, default=0.05, help="tempo de resposta simulado (s)")
+    parser.add_argument("--falhas", type=float, default=0.0, help="fração de respostas HTTP 503")
+    args = parser.parse_args()
+
+    audio = audio_teste()
+    with ServidorLocal(atraso=args.atraso, taxa_falhas=args.falhas, semente=1) as servidor:
+        rodar("nova_conexao", lambda a: nova_conexao(servidor.url, a), servidor, args.frases, audio)
+        backend = BackendHttp(endpoint=servidor.url, espera_base=0.05)
+        # A conexão do aquecimento é aberta antes da medição e reaproveitada nela
+        backend.aquecer()
+        rodar("BackendHttp", backend.reconhecer, servidor, args.frases, audio)
+        print(f"métricas do backend: {backend.metricas()}")
+
+
+if __name__ == "__main__":
+    main()
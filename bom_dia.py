@@ -0,0 +1,28 @@
+"""Rotina do bom dia: executa o plano.json que está ao lado deste arquivo.
+
+Este arquivo é igual em todos os pacotes; o que muda de um usuário para
+outro está só no ``plano.json`` (e as credenciais, no .env).
+"""
+import os
+
+from dotenv import load_dotenv
+
+import plano as _plano
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+
+# Carrega variáveis do .env
+load_dotenv(os.path.join(PASTA, '.env'))
+
+# Lido uma vez, na importação (o listener importa este arquivo no aquecimento)
+plano = _plano.carregar(os.path.join(PASTA, _plano.ARQUIVO_PLANO))
+
+
+def main():
+    print("Iniciando automação...")
+    _plano.executar(plano, PASTA)
+    print("Automação concluída!")
+
+
+if __name__ == "__main__":
+    main()
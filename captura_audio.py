@@ -0,0 +1,259 @@
+"""Captura de áudio contínua, sem buracos enquanto o reconhecimento roda.
+
+O PortAudio entrega os blocos do microfone por callback, que só copia os
+bytes para um buffer circular de tamanho fixo. Uma thread de segmentação lê
+desse buffer, separa as frases pela energia e as coloca numa fila limitada;
+quem reconhece (Google, filtro local etc.) consome essa fila no seu próprio
+ritmo. Assim o microfone nunca para de ouvir, e a memória usada tem teto:
+se o consumidor atrasar demais, o áudio mais antigo é sobrescrito e os
+contadores de descarte registram a perda.
+"""
+import audioop
+import queue
+import threading
+from collections import deque
+
+import speech_recognition as sr
+
+
+class BufferCircular:
+    """Buffer circular de bytes com capacidade fixa"""
+
+    def __init__(self, capacidade):
+        self.capacidade = capacidade
+        self.bytes_descartados = 0
+        self._dados = bytearray(capacidade)
+        self._lidos = 0
+        self._escritos = 0
+        self._fechado = False
+        self._condicao = threading.Condition()
+
+    def __len__(self):
+        return self._escritos - self._lidos
+
+    def escrever(self, dados):
+        """Grava os bytes; se o leitor estiver atrasado, sobrescreve os mais antigos"""
+        with self._condicao:
+            n = len(dados)
+            if n > self.capacidade:
+                self.bytes_descartados += n - self.capacidade
+                dados = dados[-self.capacidade:]
+                n = self.capacidade
+            pos = self._escritos % self.capacidade
+            primeiro = min(n, self.capacidade - pos)
+            self._dados[pos:pos + primeiro] = dados[:primeiro]
+            self._dados[:n - primeiro] = dados[primeiro:]
+            self._escritos += n
+            excesso = self._escritos - self._lidos - self.capacidade
+            if excesso > 0:
+                self.bytes_descartados += excesso
+                self._lidos += excesso
+            self._condicao.notify()
+
+    def ler(self, n, timeout=None):
+        """Lê exatamente ``n`` bytes; devolve None no timeout ou se fechado"""
+        with self._condicao:
+            pronto = self._condicao.wait_for(lambda: len(self) >= n or self._fechado, timeout)
+            if not pronto or len(self) < n:
+                return None
+            pos = self._lidos % self.capacidade
+            primeiro = min(n, self.capacidade - pos)
+            saida = bytes(self._dados[pos:pos + primeiro]) + bytes(self._dados[:n - primeiro])
+            self._lidos += n
+            return saida
+
+    def fechar(self):
+        with self._condicao:
+            self._fechado = True
+            self._condicao.notify_all()
+
+
+class CapturaContinua:
+    """Captura por callback, segmentação por energia e fila de frases"""
+
+    def __init__(self, taxa=None, largura=2, bloco=1024, segundos_buffer=10.0,
+                 max_frases_pendentes=4, duracao_calibracao=1.0, razao_energia=1.5,
+                 energia_minima=300, pausa=0.8, pre_fala=0.5, duracao_minima=0.25,
+                 duracao_maxima=10.0, suavizacao=0.05, device_index=None):
+        self.taxa = taxa
+        self.largura = largura
+        self.bloco = bloco
+        self.segundos_buffer = segundos_buffer
+        self.duracao_calibracao = duracao_calibracao
+        self.razao_energia = razao_energia
+        self.energia_minima = energia_minima
+        self.pausa = pausa
+        self.pre_fala = pre_fala
+        self.duracao_minima = duracao_minima
+        self.duracao_maxima = duracao_maxima
+        self.suavizacao = suavizacao
+        self.device_index = device_index
+        self.frases = queue.Queue(maxsize=max_frases_pendentes)
+
+        self.buffer = None
+        self.piso_ruido = None
+        self.quadros_recebidos = 0
+        self.quadros_perdidos_dispositivo = 0
+        self.frases_emitidas = 0
+        self.frases_descartadas = 0
+        self.frases_cortadas = 0
+
+        self._pyaudio = None
+        self._stream = None
+        self._thread = None
+        self._ativo = False
+
+    # --- captura -------------------------------------------------------
+
+    def iniciar(self):
+        """Abre o stream do microfone em modo callback e inicia a segmentação"""
+        import pyaudio
+
+        self._pyaudio = pyaudio.PyAudio()
+        if self.taxa is None:
+            if self.device_index is None:
+                info = self._pyaudio.get_default_input_device_info()
+            else:
+                info = self._pyaudio.get_device_info_by_index(self.device_index)
+            self.taxa = int(info["defaultSampleRate"])
+        self._preparar()
+        self._stream = self._pyaudio.open(
+            format=self._pyaudio.get_format_from_width(self.largura),
+            channels=1,
+            rate=self.taxa,
+            input=True,
+            input_device_index=self.device_index,
+            frames_per_buffer=self.bloco,
+            stream_callback=self._callback,
+        )
+        self._stream.start_stream()
+
+    def _preparar(self):
+        """Cria o buffer e a thread de segmentação (sem abrir o microfone)"""
+        capacidade = int(self.segundos_buffer * self.taxa) * self.largura
+        self.buffer = BufferCircular(capacidade)
+        self._ativo = True
+        self._thread = threading.Thread(target=self._segmentar, daemon=True)
+        self._thread.start()
+
+    def _callback(self, dados, quantidade, info_tempo, status):
+        import pyaudio
+
+        if status & pyaudio.paInputOverflow:
+            self.quadros_perdidos_dispositivo += quantidade
+        self.alimentar(dados)
+        return None, pyaudio.paContinue
+
+    def alimentar(self, dados):
+        """Corpo do callback: só copia os bytes para o buffer circular"""
+        self.quadros_recebidos += len(dados) // self.largura
+        self.buffer.escrever(dados)
+
+    def parar(self):
+        """Fecha o microfone e encerra a segmentação"""
+        self._ativo = False
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._stream = None
+        if self._pyaudio is not None:
+            self._pyaudio.terminate()
+            self._pyaudio = None
+        if self.buffer is not None:
+            self.buffer.fechar()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+    # --- segmentação ---------------------------------------------------
+
+    @property
+    def limiar_energia(self):
+        return max(self.piso_ruido * self.razao_energia, self.energia_minima)
+
+    def _segmentar(self):
+        tamanho_bloco = self.bloco * self.largura
+        segundos_bloco = self.bloco / self.taxa
+        blocos_pre_fala = max(1, int(self.pre_fala / segundos_bloco))
+        blocos_pausa = max(1, int(self.pausa / segundos_bloco))
+        blocos_minimos = max(1, int(self.duracao_minima / segundos_bloco))
+        blocos_maximos = max(1, int(self.duracao_maxima / segundos_bloco))
+
+        # Calibração única a partir do primeiro trecho capturado
+        energias = []
+        while self._ativo and len(energias) * segundos_bloco < self.duracao_calibracao:
+            dados = self.buffer.ler(tamanho_bloco, timeout=0.5)
+            if dados is not None:
+                energias.append(audioop.rms(dados, self.largura))
+        if not energias:
+            return
+        self.piso_ruido = sum(energias) / len(energias)
+
+        anteriores = deque(maxlen=blocos_pre_fala)
+        frase = []
+        falando = 0
+        silencio = 0
+        while self._ativo:
+            dados = self.buffer.ler(tamanho_bloco, timeout=0.5)
+            if dados is None:
+                continue
+            energia = audioop.rms(dados, self.largura)
+            voz = energia > self.limiar_energia
+
+            if not frase:
+                if voz:
+                    frase = list(anteriores) + [dados]
+                    falando, silencio = 1, 0
+                else:
+                    # Acompanha a deriva do ruído só fora da fala
+                    self.piso_ruido += self.suavizacao * (energia - self.piso_ruido)
+                    anteriores.append(dados)
+                continue
+
+            frase.append(dados)
+            if voz:
+                falando += 1
+                silencio = 0
+            else:
+                silencio += 1
+
+            if silencio >= blocos_pausa or len(frase) >= blocos_maximos:
+                if len(frase) >= blocos_maximos:
+                    self.frases_cortadas += 1
+                if falando >= blocos_minimos:
+                    self._emitir(b"".join(frase))
+                anteriores.clear()
+                frase = []
+
+    def _emitir(self, dados):
+        audio = sr.AudioData(dados, self.taxa, self.largura)
+        try:
+            self.frases.put_nowait(audio)
+            self.frases_emitidas += 1
+        except queue.Full:
+            # O reconhecimento está atrasado; descarta a frase mais nova
+            self.frases_descartadas += 1
+
+    # --- consumo -------------------------------------------------------
+
+    def proxima_frase(self, timeout=None):
+        """Bloqueia até a próxima frase segmentada (AudioData) ou None no timeout"""
+        try:
+            return self.frases.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    @property
+    def quadros_descartados(self):
+        """Quadros perdidos: sobrescritos no buffer ou perdidos pelo dispositivo"""
+        perdidos_buffer = self.buffer.bytes_descartados // self.largura if self.buffer else 0
+        return perdidos_buffer + self.quadros_perdidos_dispositivo
+
+    def metricas(self):
+        return {
+            "quadros_recebidos": self.quadros_recebidos,
+            "quadros_descartados": self.quadros_descartados,
+            "frases_emitidas": self.frases_emitidas,
+            "frases_descartadas": self.frases_descartadas,
+            "frases_cortadas": self.frases_cortadas,
+            "ocupacao_buffer": len(self.buffer) if self.buffer else 0,
+        }
@@ -0,0 +1,155 @@
+"""Captura de tela para a busca de imagens, com reaproveitamento do quadro.
+
+Um único ``grab`` do ``mss`` serve para todas as imagens procuradas num
+passo: o quadro é convertido para cinza e a pirâmide é montada uma vez só
+(``TelaPreparada``), e cada modelo é buscado sobre esse mesmo quadro. Se
+todos os modelos pendentes têm região de interesse, só o retângulo que
+cobre essas regiões é capturado; um modelo com região só é procurado
+dentro dela (o recorte do quadro também é reaproveitado).
+
+Enquanto a tela não muda, nada é refeito: a cada captura é tirada uma
+assinatura barata (uma amostra esparsa dos pixels); se for igual à do
+quadro anterior, o quadro preparado e os resultados das buscas já feitas
+são reaproveitados. Depois de um clique ou digitação, ``invalidar()``
+força um quadro novo.
+"""
+import threading
+import zlib
+from time import monotonic
+
+import numpy as np
+
+from correspondencia import TelaPreparada
+
+# Passo da amostra de pixels usada para saber se a tela mudou
+PASSO_ASSINATURA = 8
+
+
+class CapturaTela:
+    """Captura com mss e busca em lote de vários modelos no mesmo quadro"""
+
+    def __init__(self, monitor=1, grab=None, relogio=monotonic):
+        self.monitor = monitor
+        self._grab = grab
+        self._relogio = relogio
+        self._local = threading.local()
+        self._quadro = None
+        self._assinatura = None
+        self._area = None
+        self._resultados = {}
+        self._recortes = {}
+
+        self.capturas = 0
+        self.quadros_novos = 0
+        self.correspondencias = 0
+        self._inicio = relogio()
+
+    # --- captura -------------------------------------------------------
+
+    def _mss(self):
+        # Instâncias do mss não podem ser compartilhadas entre threads
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            import mss
+            sct = self._local.sct = mss.mss()
+        return sct
+
+    def area_monitor(self):
+        """(esquerda, topo, largura, altura) do monitor capturado"""
+        if self._grab is not None:
+            return None
+        m = self._mss().monitors[self.monitor]
+        return m["left"], m["top"], m["width"], m["height"]
+
+    def capturar(self, area=None):
+        """Captura a área (esquerda, topo, largura, altura) ou o monitor inteiro"""
+        self.capturas += 1
+        if self._grab is not None:
+            return np.asarray(self._grab(area))
+        if area is None:
+            area = self.area_monitor()
+        esquerda, topo, largura, altura = area
+        imagem = self._mss().grab({"left": esquerda, "top": topo, "width": largura, "height": altura})
+        return np.asarray(imagem)
+
+    def invalidar(self):
+        """Descarta o quadro atual (use depois de clicar ou digitar)"""
+        self._quadro = None
+        self._assinatura = None
+        self._resultados = {}
+        self._recortes = {}
+
+    def quadro(self, area=None):
+        """Quadro preparado da tela; reaproveita o anterior se nada mudou"""
+        pixels = self.capturar(area)
+        amostra = np.ascontiguousarray(pixels[::PASSO_ASSINATURA, ::PASSO_ASSINATURA])
+        assinatura = (pixels.shape, zlib.crc32(amostra))
+        if self._quadro is not None and assinatura == self._assinatura and area == self._area:
+            return self._quadro
+        self._quadro = TelaPreparada(pixels)
+        self._assinatura = assinatura
+        self._area = area
+        self._resultados = {}
+        self._recortes = {}
+        self.quadros_novos += 1
+        return self._quadro
+
+    # --- busca ---------------------------------------------------------
+
+    def localizar_todos(self, motor, modelos, regioes=None, limiar=None):
+        """Busca todos os modelos num único quadro; devolve {modelo: Correspondencia ou None}
+
+        ``regioes`` (opcional) mapeia modelo -> (x, y, largura, altura) em
+        coordenadas do monitor; cada modelo com região só é procurado nela.
+        Se todos tiverem região, só a área que cobre todas é capturada.
+        """
+        regioes = regioes or {}
+        area = None
+        deslocamento = (0, 0)
+        if modelos and all(m in regioes for m in modelos):
+            xs = [regioes[m][0] for m in modelos]
+            ys = [regioes[m][1] for m in modelos]
+            x1 = max(regioes[m][0] + regioes[m][2] for m in modelos)
+            y1 = max(regioes[m][1] + regioes[m][3] for m in modelos)
+            area = (min(xs), min(ys), x1 - min(xs), y1 - min(ys))
+            deslocamento = area[:2]
+        origem = self.area_monitor()
+        if area is not None and origem is not None:
+            area = (area[0] + origem[0], area[1] + origem[1], area[2], area[3])
+
+        tela = self.quadro(area)
+        resultados = {}
+        for modelo in modelos:
+            # O mesmo modelo pode ser buscado com outro limiar ou outra região
+            # sobre o mesmo quadro
+            chave = (modelo, regioes.get(modelo), limiar)
+            if chave not in self._resultados:
+                achado = motor.localizar_em(self._recorte(tela, regioes.get(modelo), deslocamento), modelo, limiar)
+                if achado is not None and deslocamento != (0, 0):
+                    achado = achado._replace(x=achado.x + deslocamento[0], y=achado.y + deslocamento[1])
+                self._resultados[chave] = achado
+                self.correspondencias += 1
+            resultados[modelo] = self._resultados[chave]
+        return resultados
+
+    def _recorte(self, tela, regiao, deslocamento):
+        """Parte do quadro dentro da região do modelo (o quadro inteiro se não houver)"""
+        if regiao is None:
+            return tela
+        if regiao not in self._recortes:
+            x, y, largura, altura = regiao
+            relativa = (x - deslocamento[0], y - deslocamento[1], largura, altura)
+            # TelaPreparada guarda x0/y0, então o achado volta em coordenadas do quadro
+            self._recortes[regiao] = TelaPreparada(tela.cinza, relativa)
+        return self._recortes[regiao]
+
+    # --- métricas ------------------------------------------------------
+
+    def metricas(self):
+        decorrido = max(self._relogio() - self._inicio, 1e-9)
+        return {
+            "capturas": self.capturas,
+            "capturas_por_segundo": self.capturas / decorrido,
+            "quadros_novos": self.quadros_novos,
+            "correspondencias_por_quadro": self.correspondencias / max(self.quadros_novos, 1),
+        }
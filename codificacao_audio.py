@@ -0,0 +1,96 @@
+"""Preparo do áudio de uma frase para o envio ao reconhecimento.
+
+O ``recognize_google`` converte cada frase para FLAC chamando o programa
+``flac`` (um processo novo por frase, no Linux) e envia o áudio na taxa
+nativa do microfone (44,1 ou 48 kHz). Para reconhecer voz, 16 kHz mono
+bastam. Aqui, tudo no próprio processo e com numpy:
+
+- conversão para mono 16 bits;
+- filtro passa-baixa (sinc janelado) e reamostragem para 16 kHz;
+- recorte do silêncio do começo e do fim, com uma pequena margem;
+- envio como PCM linear (``audio/l16``), que o endpoint aceita sem
+  compressão nenhuma.
+
+``codificar`` devolve os bytes, o Content-Type e um resumo (duração antes e
+depois do recorte, bytes enviados) usado nas métricas e no benchmark.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from palavra_chave import detectar_voz
+
+TAXA_ENVIO = 16000
+# Silêncio mantido antes e depois da fala (s), para não cortar consoantes
+MARGEM_SILENCIO = 0.2
+# Coeficientes do filtro passa-baixa da reamostragem
+COEFICIENTES_FILTRO = 63
+
+
+def amostras_mono(audio):
+    """Amostras int16 de um ``speech_recognition.AudioData``"""
+    return np.frombuffer(audio.get_raw_data(convert_width=2), dtype="<i2")
+
+
+def filtro_passa_baixa(corte, tamanho=COEFICIENTES_FILTRO):
+    """Sinc janelado (Hamming); ``corte`` em fração da taxa de amostragem"""
+    n = np.arange(tamanho) - (tamanho - 1) / 2
+    filtro = 2 * corte * np.sinc(2 * corte * n) * np.hamming(tamanho)
+    return (filtro / filtro.sum()).astype(np.float32)
+
+
+def reamostrar_voz(amostras, taxa, nova_taxa=TAXA_ENVIO):
+    """Reamostra para ``nova_taxa``, filtrando antes o que causaria aliasing
+
+    O filtro só é calculado nas amostras vizinhas de cada ponto de saída
+    (interpolação linear entre elas), não no sinal inteiro.
+    """
+    amostras = np.asarray(amostras, dtype=np.float32)
+    if taxa == nova_taxa or len(amostras) == 0:
+        return amostras
+    n = int(len(amostras) * nova_taxa / taxa)
+    posicoes = np.arange(n) * (taxa / nova_taxa)
+    if nova_taxa > taxa:
+        return np.interp(posicoes, np.arange(len(amostras)), amostras).astype(np.float32)
+    # Corta um pouco abaixo de Nyquist da taxa nova
+    filtro = filtro_passa_baixa(0.45 * nova_taxa / taxa)
+    janelas = sliding_window_view(np.pad(amostras, len(filtro) // 2), len(filtro))
+    antes = posicoes.astype(np.intp)
+    depois = np.minimum(antes + 1, len(amostras) - 1)
+    fracao = (posicoes - antes).astype(np.float32)
+    return (janelas[antes] @ filtro) * (1 - fracao) + (janelas[depois] @ filtro) * fracao
+
+
+def trecho_com_voz(amostras, taxa, margem=MARGEM_SILENCIO):
+    """(inicio, fim) sem o silêncio das pontas; sem voz detectada, o áudio todo
+
+    A detecção roda numa versão dizimada para perto de 16 kHz (só a energia
+    importa aqui), antes da reamostragem, que então processa só a fala.
+    """
+    passo = max(taxa // TAXA_ENVIO, 1)
+    trecho = detectar_voz(amostras[::passo])
+    if trecho is None:
+        return 0, len(amostras)
+    folga = int(margem * taxa)
+    return max(trecho[0] * passo - folga, 0), min(trecho[1] * passo + folga, len(amostras))
+
+
+def codificar(audio, taxa=TAXA_ENVIO, recortar=True):
+    """Devolve (bytes, content_type, resumo) prontos para o envio"""
+    originais = amostras_mono(audio)
+    inicio, fim = trecho_com_voz(originais, audio.sample_rate) if recortar else (0, len(originais))
+    amostras = reamostrar_voz(originais[inicio:fim], audio.sample_rate, taxa)
+    dados = np.clip(np.round(amostras), -32768, 32767).astype("<i2").tobytes()
+    resumo = {
+        "duracao_original": len(originais) / audio.sample_rate,
+        "duracao_enviada": len(amostras) / taxa,
+        "bytes": len(dados),
+    }
+    return dados, f"audio/l16; rate={taxa}", resumo
+
+
+def audio_reduzido(audio, taxa=TAXA_ENVIO, recortar=True):
+    """O mesmo preparo, devolvido como ``AudioData`` (para o ``recognize_google``)"""
+    import speech_recognition as sr
+
+    dados, _, _ = codificar(audio, taxa, recortar)
+    return sr.AudioData(dados, taxa, 2)
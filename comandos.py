@@ -0,0 +1,244 @@
+"""Registro de comandos de voz ("bom dia", "abrir SEI", "ler notícias"...).
+
+As frases de todos os comandos são compiladas num único reconhecedor:
+
+- texto sem acentos, em minúsculas, sem pontuação e sem artigos e
+  preposições curtas ("abrir o SEI" = "abrir SEI"), dos dois lados;
+- cada palavra do que foi dito é trocada pela palavra conhecida mais
+  próxima (até 1 erro de digitação/transcrição, 2 em palavras longas),
+  com um índice de deleções no estilo SymSpell: o custo por palavra não
+  depende de quantos comandos existem;
+- as frases viram um autômato de Aho-Corasick sobre palavras, percorrido
+  uma vez só pela transcrição.
+
+Assim a busca é linear no tamanho da transcrição, com 1 ou com 500
+comandos registrados.
+"""
+import re
+import unicodedata
+from collections import deque, namedtuple
+
+Comando = namedtuple("Comando", ["nome", "frases", "acao"])
+Correspondencia = namedtuple("Correspondencia", ["comando", "frase", "inicio", "fim", "erros"])
+
+# Ignoradas dos dois lados ("abra o SEI", "ler as notícias")
+PALAVRAS_VAZIAS = {"o", "a", "os", "as", "um", "uma", "de", "do", "da", "dos", "das", "no", "na", "por", "favor"}
+
+# Palavras com até esta quantidade de letras precisam ser exatas
+TAMANHO_EXATO = 3
+# A partir deste tamanho, aceita 2 erros em vez de 1
+TAMANHO_DOIS_ERROS = 8
+
+
+def normalizar(texto):
+    """'Abrir o e-SAJ!' -> 'abrir e saj'"""
+    texto = unicodedata.normalize("NFKD", texto)
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return " ".join(p for p in re.findall(r"[a-z0-9]+", texto.lower()) if p not in PALAVRAS_VAZIAS)
+
+
+def erros_permitidos(palavra):
+    if len(palavra) <= TAMANHO_EXATO:
+        return 0
+    return 2 if len(palavra) >= TAMANHO_DOIS_ERROS else 1
+
+
+def delecoes(palavra, maximo):
+    """Todas as variantes de ``palavra`` com até ``maximo`` letras removidas"""
+    variantes = {palavra}
+    borda = {palavra}
+    for _ in range(maximo):
+        borda = {p[:i] + p[i + 1:] for p in borda for i in range(len(p))}
+        variantes |= borda
+    return variantes
+
+
+def distancia_edicao(a, b, limite):
+    """Distância de Damerau-Levenshtein (transposição simples), ou limite+1"""
+    if abs(len(a) - len(b)) > limite:
+        return limite + 1
+    anterior2 = None
+    anterior = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        atual = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            custo = 0 if a[i - 1] == b[j - 1] else 1
+            atual[j] = min(anterior[j] + 1, atual[j - 1] + 1, anterior[j - 1] + custo)
+            if (anterior2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                atual[j] = min(atual[j], anterior2[j - 2] + 1)
+        if min(atual) > limite:
+            return limite + 1
+        anterior2, anterior = anterior, atual
+    return anterior[-1]
+
+
+class RegistroComandos:
+    """Comandos de voz com frases compiladas num reconhecedor único"""
+
+    def __init__(self):
+        self.comandos = []
+        self._compilado = False
+
+    def registrar(self, frases, acao, nome=None):
+        """Registra um comando; ``frases`` pode ser uma frase ou uma lista delas"""
+        if isinstance(frases, str):
+            frases = [frases]
+        normalizadas = tuple(f for f in (normalizar(frase) for frase in frases) if f)
+        if not normalizadas:
+            raise ValueError("Comando sem nenhuma frase válida")
+        comando = Comando(nome or normalizadas[0], normalizadas, acao)
+        self.comandos.append(comando)
+        self._compilado = False
+        return comando
+
+    # --- compilação ----------------------------------------------------
+
+    def compilar(self):
+        """Monta o vocabulário, o índice de deleções e o autômato"""
+        self._vocabulario = {}
+        self._delecoes = {}
+        # Autômato: transições por estado, saída (comando, frase, tamanho) e falha
+        self._transicoes = [{}]
+        self._saidas = [[]]
+        for comando in self.comandos:
+            for frase in comando.frases:
+                estado = 0
+                palavras = frase.split()
+                for palavra in palavras:
+                    simbolo = self._simbolo(palavra)
+                    proximo = self._transicoes[estado].get(simbolo)
+                    if proximo is None:
+                        proximo = len(self._transicoes)
+                        self._transicoes[estado][simbolo] = proximo
+                        self._transicoes.append({})
+                        self._saidas.append([])
+                    estado = proximo
+                self._saidas[estado].append((comando, frase, len(palavras)))
+
+        self._falhas = [0] * len(self._transicoes)
+        fila = deque(self._transicoes[0].values())
+        while fila:
+            estado = fila.popleft()
+            for simbolo, proximo in self._transicoes[estado].items():
+                fila.append(proximo)
+                falha = self._falhas[estado]
+                while falha and simbolo not in self._transicoes[falha]:
+                    falha = self._falhas[falha]
+                destino = self._transicoes[falha].get(simbolo, 0)
+                self._falhas[proximo] = destino if destino != proximo else 0
+                self._saidas[proximo] = self._saidas[proximo] + self._saidas[self._falhas[proximo]]
+        self._compilado = True
+
+    def _simbolo(self, palavra):
+        simbolo = self._vocabulario.get(palavra)
+        if simbolo is None:
+            simbolo = self._vocabulario[palavra] = len(self._vocabulario)
+            for variante in delecoes(palavra, erros_permitidos(palavra)):
+                self._delecoes.setdefault(variante, set()).add(palavra)
+        return simbolo
+
+    def _reconhecer_palavra(self, palavra):
+        """(símbolo da palavra conhecida mais próxima, erros) ou (None, 0)"""
+        simbolo = self._vocabulario.get(palavra)
+        if simbolo is not None:
+            return simbolo, 0
+        maximo = erros_permitidos(palavra)
+        melhor, menor = None, maximo + 1
+        for variante in delecoes(palavra, maximo):
+            for candidata in self._delecoes.get(variante, ()):
+                limite = min(maximo, erros_permitidos(candidata))
+                erros = distancia_edicao(palavra, candidata, limite)
+                if erros <= limite and (erros < menor or (erros == menor and candidata < melhor)):
+                    melhor, menor = candidata, erros
+        if melhor is None:
+            return None, 0
+        return self._vocabulario[melhor], menor
+
+    # --- busca -----------------------------------------------------------
+
+    def encontrar(self, texto):
+        """Todas as frases registradas presentes no texto, na ordem em que aparecem"""
+        if not self._compilado:
+            self.compilar()
+        palavras = normalizar(texto or "").split()
+        achados = []
+        estado = 0
+        erros_palavra = []
+        for posicao, palavra in enumerate(palavras):
+            simbolo, erros = self._reconhecer_palavra(palavra)
+            erros_palavra.append(erros)
+            if simbolo is None:
+                estado = 0
+                continue
+            while estado and simbolo not in self._transicoes[estado]:
+                estado = self._falhas[estado]
+            estado = self._transicoes[estado].get(simbolo, 0)
+            for comando, frase, tamanho in self._saidas[estado]:
+                inicio = posicao + 1 - tamanho
+                achados.append(Correspondencia(
+                    comando, frase, inicio, posicao + 1, sum(erros_palavra[inicio:posicao + 1])
+                ))
+        return achados
+
+    def melhor(self, texto):
+        """A frase mais longa encontrada (menos erros no empate), ou None
+
+        Um comando por frase dita: de "bom dia, abrir SEI" só um dos dois é
+        executado (o primeiro, já que as frases empatam no tamanho).
+        """
+        achados = self.encontrar(texto)
+        if not achados:
+            return None
+        return min(achados, key=lambda a: (-(a.fim - a.inicio), a.erros, a.inicio))
+
+    def executar(self, texto):
+        """Executa a ação do melhor comando do texto (só um); devolve o comando ou None"""
+        achado = self.melhor(texto)
+        if achado is None:
+            return None
+        print(f"Comando '{achado.comando.nome}' reconhecido em: {texto}")
+        achado.comando.acao()
+        return achado.comando
+
+
+# --- comandos da automação -------------------------------------------------
+
+# Frases além de "abrir <sistema>" para alguns sistemas
+FRASES_EXTRAS = {
+    "SITES_DE_NOTICIAS": ["ler notícias", "abrir notícias"],
+    "TJ_AL": ["abrir e-SAJ", "abrir esaj"],
+    "GOOGLE_AGENDA": ["abrir agenda"],
+    "GMAIL": ["abrir email", "abrir e-mail", "abrir g mail"],
+    "CHATGPT": ["abrir chat gpt"],
+}
+
+# Formas do verbo aceitas no lugar de "abrir"
+VERBOS_ABRIR = ("abrir", "abre", "abra")
+
+
+def comandos_padrao(disparar_rotina, sistemas, abrir_sistema, frases_extras=FRASES_EXTRAS, despachar=None):
+    """Registro com "bom dia" (rotina inteira) e "abrir <sistema>" para cada sistema
+
+    ``despachar(funcao, *args)`` tira ``abrir_sistema(nome, url)`` do
+    listener, que segue ouvindo enquanto o site abre. Use o
+    ``ExecutorRotina.despachar`` da rotina: a mesma thread única, então um
+    "abrir" nunca digita no meio do "bom dia". Sem ele, o site abre na hora.
+    """
+    def em_segundo_plano(nome, url):
+        def acao():
+            if despachar is None:
+                abrir_sistema(nome, url)
+            else:
+                despachar(abrir_sistema, nome, url)
+        return acao
+
+    registro = RegistroComandos()
+    registro.registrar("bom dia", disparar_rotina, nome="bom dia")
+    for nome, url in sistemas:
+        frases = [f"abrir {nome.replace('_', ' ')}"] + list(frases_extras.get(nome, []))
+        frases += [verbo + frase[len("abrir"):] for frase in frases if frase.startswith("abrir ")
+                   for verbo in VERBOS_ABRIR[1:]]
+        registro.registrar(frases, em_segundo_plano(nome, url), nome=f"abrir {nome}")
+    registro.compilar()
+    return registro
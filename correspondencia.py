@@ -0,0 +1,225 @@
+"""Localização das imagens de referência na tela (modo "Clique em imagem(s)").
+
+Cada imagem enviada pelo usuário é pré-processada uma única vez: tons de
+cinza, versões redimensionadas para as escalas de tela mais comuns (50% a
+200%) e a pirâmide com metade e um quarto da resolução. A busca roda primeiro no
+nível mais reduzido, em todas as escalas, e só refina na resolução cheia ao
+redor do melhor candidato, o que deixa cada busca na casa de poucos
+milissegundos. Uma região de interesse opcional restringe ainda mais a área.
+
+Tudo funciona sobre arrays do numpy, então dá para testar com capturas de
+tela sintéticas, sem monitor.
+"""
+import math
+import os
+import weakref
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+# Escalas relativas entre a captura da imagem e a tela atual (DPI)
+ESCALAS_PADRAO = (1.0, 1.25, 0.8, 1.5, 0.67, 1.75, 2.0, 0.5)
+LIMIAR_PADRAO = 0.8
+
+# Níveis de redução (metade, um quarto...) usados na busca grossa; um nível
+# só é usado se o lado menor continuar com pelo menos LADO_MINIMO_PIRAMIDE px
+NIVEIS_PIRAMIDE = 2
+LADO_MINIMO_PIRAMIDE = 12
+
+# Com confiança a partir daqui na escala testada, as outras nem são tentadas
+CONFIANCA_IMEDIATA = 0.97
+
+# Desvio padrão (tons de cinza) abaixo do qual a imagem é de uma cor só: a
+# correlação normalizada não tem o que comparar e "acha" a imagem em (0, 0)
+DESVIO_MINIMO = 2.0
+
+
+class Correspondencia(namedtuple("Correspondencia", "x y largura altura confianca escala")):
+    """Retângulo encontrado na tela, em pixels da tela inteira"""
+    __slots__ = ()
+
+    @property
+    def centro(self):
+        return self.x + self.largura // 2, self.y + self.altura // 2
+
+
+def para_cinza(imagem):
+    """Converte PIL.Image ou array (cinza, BGR, BGRA) para array uint8 em cinza"""
+    if not isinstance(imagem, np.ndarray):
+        imagem = np.asarray(imagem.convert("L"))
+    if imagem.ndim == 3:
+        codigo = cv2.COLOR_BGRA2GRAY if imagem.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+        imagem = cv2.cvtColor(imagem, codigo)
+    return np.ascontiguousarray(imagem, dtype=np.uint8)
+
+
+class ModeloPreparado:
+    """Imagem de referência já convertida para todas as escalas e níveis"""
+
+    def __init__(self, cinza, escalas=ESCALAS_PADRAO, nome=None):
+        self.nome = nome
+        self.altura, self.largura = cinza.shape
+        self.uniforme = float(cinza.std()) < DESVIO_MINIMO
+        self.variantes = []
+        for escala in escalas:
+            largura = int(round(self.largura * escala))
+            altura = int(round(self.altura * escala))
+            if largura < 4 or altura < 4:
+                continue
+            interpolacao = cv2.INTER_AREA if escala < 1 else cv2.INTER_LINEAR
+            cheia = cinza if escala == 1.0 else cv2.resize(cinza, (largura, altura), interpolation=interpolacao)
+            self.variantes.append((escala, piramide(cheia)))
+
+    @classmethod
+    def de_variantes(cls, variantes, largura, altura, nome=None):
+        """Modelo a partir de variantes já calculadas (ex.: pacote compilado)"""
+        modelo = cls.__new__(cls)
+        modelo.nome = nome
+        modelo.largura, modelo.altura = largura, altura
+        modelo.variantes = variantes
+        modelo.uniforme = not variantes or all(float(niveis[0].std()) < DESVIO_MINIMO for _, niveis in variantes)
+        return modelo
+
+
+def piramide(cinza, niveis=NIVEIS_PIRAMIDE):
+    """[imagem cheia, metade, um quarto, ...] enquanto houver detalhe suficiente"""
+    niveis_imagem = [cinza]
+    while len(niveis_imagem) <= niveis and min(niveis_imagem[-1].shape) >= 2 * LADO_MINIMO_PIRAMIDE:
+        niveis_imagem.append(cv2.pyrDown(niveis_imagem[-1]))
+    return niveis_imagem
+
+
+class MotorCorrespondencia:
+    """Busca de imagens com cache dos modelos pré-processados"""
+
+    def __init__(self, escalas=ESCALAS_PADRAO, limiar=LIMIAR_PADRAO, margem_grossa=0.15):
+        self.escalas = tuple(escalas)
+        self.limiar = limiar
+        self.margem_grossa = margem_grossa
+        self._cache = {}
+        # Imagens passadas como objeto (PIL.Image, array), pelo id enquanto
+        # o objeto existir
+        self._objetos = {}
+
+    def modelo(self, origem, nome=None):
+        """Modelo pré-processado de um caminho, PIL.Image ou array (com cache)"""
+        if isinstance(origem, ModeloPreparado):
+            return origem
+        if isinstance(origem, (str, os.PathLike)):
+            info = os.stat(origem)
+            chave = (os.fspath(origem), info.st_mtime_ns, info.st_size)
+            if chave not in self._cache:
+                cinza = cv2.imread(os.fspath(origem), cv2.IMREAD_GRAYSCALE)
+                if cinza is None:
+                    raise ValueError(f"Não foi possível ler a imagem {origem}")
+                self._cache[chave] = self._preparar(cinza, nome or os.path.basename(origem))
+            return self._cache[chave]
+        if nome is not None:
+            if nome not in self._cache:
+                self._cache[nome] = self._preparar(para_cinza(origem), nome)
+            return self._cache[nome]
+        # O id de um objeto coletado pode ser reaproveitado: a entrada sai do
+        # cache junto com o objeto
+        chave = id(origem)
+        referencia, modelo = self._objetos.get(chave, (None, None))
+        if referencia is None or referencia() is not origem:
+            # Cópia, para o modelo não manter o próprio objeto vivo no cache
+            modelo = self._preparar(para_cinza(origem).copy())
+            referencia = weakref.ref(origem, lambda _, chave=chave: self._objetos.pop(chave, None))
+            self._objetos[chave] = (referencia, modelo)
+        return modelo
+
+    def _preparar(self, cinza, nome=None):
+        modelo = ModeloPreparado(cinza, self.escalas, nome)
+        if modelo.uniforme:
+            print(f"Imagem {nome or ''} tem uma cor só e não pode ser localizada na tela")
+        return modelo
+
+    def carregar_compilados(self, pasta_modelos, pasta_imagens):
+        """Coloca no cache os modelos do pacote compilado; devolve quantos entraram"""
+        from modelos_compilados import carregar
+
+        modelos = carregar(pasta_modelos, pasta_imagens, self.escalas)
+        for caminho, modelo in modelos.items():
+            info = os.stat(caminho)
+            self._cache[(os.fspath(caminho), info.st_mtime_ns, info.st_size)] = modelo
+        return len(modelos)
+
+    def localizar(self, tela, origem, regiao=None, limiar=None):
+        """Procura a imagem na tela; devolve ``Correspondencia`` ou None
+
+        ``regiao`` = (x, y, largura, altura) limita a busca a uma parte da tela.
+        """
+        return self.localizar_em(TelaPreparada(tela, regiao), origem, limiar)
+
+    def localizar_em(self, tela, origem, limiar=None):
+        """Como ``localizar``, mas sobre uma ``TelaPreparada`` reaproveitável"""
+        modelo = self.modelo(origem)
+        if modelo.uniforme:
+            return None
+        limiar = self.limiar if limiar is None else limiar
+        melhor = None
+        for escala, niveis in modelo.variantes:
+            achado = self._buscar_variante(tela, niveis, limiar)
+            if achado is None:
+                continue
+            confianca, x, y = achado
+            if melhor is None or confianca > melhor.confianca:
+                altura, largura = niveis[0].shape
+                melhor = Correspondencia(x + tela.x0, y + tela.y0, largura, altura, confianca, escala)
+            if confianca >= CONFIANCA_IMEDIATA:
+                break
+        if melhor is None or melhor.confianca < limiar:
+            return None
+        return melhor
+
+    def _buscar_variante(self, tela, niveis, limiar):
+        cheia = niveis[0]
+        altura, largura = cheia.shape
+        if altura > tela.cinza.shape[0] or largura > tela.cinza.shape[1]:
+            return None
+
+        # Nível mais reduzido disponível tanto no modelo quanto na tela
+        nivel = min(len(niveis), len(tela.niveis)) - 1
+        while nivel > 0 and (niveis[nivel].shape[0] > tela.niveis[nivel].shape[0]
+                             or niveis[nivel].shape[1] > tela.niveis[nivel].shape[1]):
+            nivel -= 1
+        resultado = cv2.matchTemplate(tela.niveis[nivel], niveis[nivel], cv2.TM_CCOEFF_NORMED)
+        _, confianca, _, (x, y) = cv2.minMaxLoc(resultado)
+        if not math.isfinite(confianca):
+            return None
+        if nivel == 0:
+            return confianca, x, y
+        if confianca < limiar - self.margem_grossa:
+            return None
+
+        # Refinamento na resolução cheia, só ao redor do candidato
+        fator = 2 ** nivel
+        folga = 2 * fator
+        x0 = max(0, fator * x - folga)
+        y0 = max(0, fator * y - folga)
+        x1 = min(tela.cinza.shape[1], fator * x + largura + folga)
+        y1 = min(tela.cinza.shape[0], fator * y + altura + folga)
+        resultado = cv2.matchTemplate(tela.cinza[y0:y1, x0:x1], cheia, cv2.TM_CCOEFF_NORMED)
+        _, confianca, _, (dx, dy) = cv2.minMaxLoc(resultado)
+        if not math.isfinite(confianca):
+            return None
+        return confianca, x0 + dx, y0 + dy
+
+
+class TelaPreparada:
+    """Captura de tela em cinza com a pirâmide já calculada"""
+
+    def __init__(self, tela, regiao=None):
+        cinza = para_cinza(tela)
+        self.x0 = self.y0 = 0
+        if regiao is not None:
+            x, y, largura, altura = regiao
+            self.x0, self.y0 = max(0, x), max(0, y)
+            cinza = cinza[self.y0:y + altura, self.x0:x + largura]
+        self.niveis = piramide(cinza)
+
+    @property
+    def cinza(self):
+        return self.niveis[0]
@@ -0,0 +1,122 @@
+"""Digitação das credenciais com pouca latência.
+
+Antes, cada campo era copiado para a área de transferência (no Linux o
+pyperclip chama ``xclip``/``xsel`` a cada cópia) e colado com Ctrl+V, e
+cada chamada do pyautogui (atalho, Tab, Enter) somava a pausa padrão de
+0,1 s (``pyautogui.PAUSE``). A senha ficava na área de transferência.
+
+- ``EntradaTeclado`` (padrão): login, Tab e senha saem numa única chamada
+  ao pyautogui, que injeta as teclas no próprio processo (XTest no Linux,
+  SendInput no Windows), sem pausa entre elas. Texto que não dá para
+  digitar com segurança (acentos, ou caracteres que são teclas mortas no
+  teclado ABNT2, como ``~ ^ ' " ```) vai pela área de transferência;
+- ``EntradaAreaTransferencia``: cola todos os campos, como antes.
+
+Nos dois casos a área de transferência é limpa logo depois de colar.
+``ENTRADA`` no .env escolhe o modo (``teclado`` ou ``area_transferencia``).
+
+Ritmo, para sites que perdem teclas digitadas rápido demais:
+``INTERVALO_TECLAS`` (s entre teclas) e ``PAUSA_CAMPOS`` (s depois do Tab),
+com variantes por sistema (``INTERVALO_TECLAS_SEI``, ``PAUSA_CAMPOS_SEI``...).
+"""
+import os
+from collections import namedtuple
+from time import sleep
+
+Ritmo = namedtuple("Ritmo", ["intervalo", "pausa_campos"])
+SEM_PAUSA = Ritmo(0.0, 0.0)
+
+# Teclas mortas no ABNT2: digitadas, se combinariam com o caractere seguinte
+TECLAS_MORTAS = set("~^'\"`")
+
+# Separador entre os campos na sequência digitada
+_TAB = object()
+
+
+def ritmo(nome=None, getenv=os.getenv):
+    """Ritmo de digitação de um sistema (variável do sistema ou a geral)"""
+    def valor(chave):
+        return float((nome and getenv(f"{chave}_{nome}")) or getenv(chave) or 0)
+    return Ritmo(valor("INTERVALO_TECLAS"), valor("PAUSA_CAMPOS"))
+
+
+def digitavel(texto):
+    """True se o texto pode ser digitado tecla a tecla em qualquer layout"""
+    return all(32 <= ord(c) < 127 and c not in TECLAS_MORTAS for c in texto)
+
+
+class EntradaAreaTransferencia:
+    """Cola cada campo pela área de transferência e a limpa no fim"""
+
+    def __init__(self, pyautogui=None, pyperclip=None, dormir=sleep):
+        if pyautogui is None:
+            import pyautogui
+        self._pyautogui = pyautogui
+        self._pyperclip = pyperclip
+        self._dormir = dormir
+        # As esperas de verdade são as de prontidão da tela
+        self._pyautogui.PAUSE = 0
+
+    def _digitar_texto(self, texto):
+        return False
+
+    def atalho(self, *teclas):
+        self._pyautogui.hotkey(*teclas)
+
+    def confirmar(self):
+        self._pyautogui.press("enter")
+
+    def preencher(self, login=None, senha=None, ritmo=SEM_PAUSA):
+        """Login, Tab e senha (sem o Enter), com o mínimo de chamadas"""
+        campos = []
+        if login:
+            campos += [login, _TAB]
+        if senha:
+            campos.append(senha)
+        teclas = []
+        colou = False
+        for campo in campos:
+            if campo is _TAB:
+                teclas.append("tab")
+                if ritmo.pausa_campos:
+                    self._enviar(teclas, ritmo)
+                    teclas = []
+                    self._dormir(ritmo.pausa_campos)
+            elif self._digitar_texto(campo):
+                teclas += list(campo)
+            else:
+                self._enviar(teclas, ritmo)
+                teclas = []
+                self._colar(campo)
+                colou = True
+        self._enviar(teclas, ritmo)
+        if colou:
+            self._area_transferencia().copy("")
+
+    def _enviar(self, teclas, ritmo):
+        if teclas:
+            self._pyautogui.press(teclas, interval=ritmo.intervalo)
+
+    def _colar(self, texto):
+        self._area_transferencia().copy(texto)
+        self._pyautogui.hotkey("ctrl", "v")
+
+    def _area_transferencia(self):
+        if self._pyperclip is None:
+            import pyperclip
+            self._pyperclip = pyperclip
+        return self._pyperclip
+
+
+class EntradaTeclado(EntradaAreaTransferencia):
+    """Digita os campos; só cola o que não dá para digitar"""
+
+    def _digitar_texto(self, texto):
+        return digitavel(texto)
+
+
+def criar_entrada(getenv=os.getenv):
+    """Backend escolhido por ``ENTRADA`` (padrão: teclado)"""
+    if getenv("ENTRADA", "teclado").lower() == "area_transferencia":
+        return EntradaAreaTransferencia()
+    return EntradaTeclado()
@@ -0,0 +1,136 @@
+"""Executor da rotina do bom dia mantido "quente" dentro do listener.
+
+Em vez de chamar ``python bom_dia.py`` a cada gatilho (e pagar de novo a
+partida do interpretador, a leitura do .env e os imports pesados de
+``pyautogui``/``cv2``), o script da rotina é importado uma vez na partida do
+listener e a sua ``main()`` é chamada numa thread de trabalho a cada
+gatilho. O subprocesso continua disponível para quem quiser isolamento
+(``ISOLAR_ROTINA=1``) e é usado automaticamente se o aquecimento falhar.
+
+A latência entre o gatilho e a primeira ação da rotina fica registrada em
+``latencias`` (segundos).
+
+Os outros comandos de voz que mexem no navegador e no teclado ("abrir
+SEI"...) passam por ``despachar``, na mesma thread de trabalho: um comando
+por vez, e nenhum no meio da rotina.
+"""
+import importlib.util
+import os
+import subprocess
+import sys
+import threading
+from time import perf_counter
+
+import rotina
+from rastreamento import fase
+
+# Módulos pesados que a rotina usa; importados uma vez no aquecimento
+MODULOS_PESADOS = ["webbrowser", "pyautogui", "pyperclip", "dotenv"]
+
+
+class ExecutorRotina:
+    """Mantém a rotina importada e a dispara numa única thread de trabalho"""
+
+    def __init__(self, caminho_script, isolar=None):
+        self.caminho_script = os.path.abspath(caminho_script)
+        if isolar is None:
+            # Lido aqui, e não na importação, para valer o que estiver no .env
+            isolar = os.getenv("ISOLAR_ROTINA", "0") == "1"
+        self.isolar = isolar
+        self.latencias = []
+        self._modulo = None
+        self._gatilho = None
+        self._trava = threading.Lock()
+        self._thread = None
+
+    def aquecer(self):
+        """Importa a rotina e suas dependências antes do primeiro gatilho"""
+        if self.isolar or self._modulo is not None:
+            return
+        try:
+            for nome in MODULOS_PESADOS:
+                __import__(nome)
+            spec = importlib.util.spec_from_file_location("rotina_bom_dia", self.caminho_script)
+            modulo = importlib.util.module_from_spec(spec)
+            pasta = os.path.dirname(self.caminho_script)
+            if pasta not in sys.path:
+                sys.path.insert(0, pasta)
+            spec.loader.exec_module(modulo)
+            if not hasattr(modulo, "main"):
+                raise AttributeError(f"{self.caminho_script} não tem função main()")
+            self._modulo = modulo
+            print("Rotina do bom dia carregada e pronta.")
+        except Exception as e:
+            print(f"Não foi possível pré-carregar a rotina ({e}); usando subprocesso.")
+            self.isolar = True
+
+    @property
+    def ocupado(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def disparar(self):
+        """Dispara a rotina sem bloquear o listener; ignora gatilhos repetidos"""
+        return self.despachar(self._executar)
+
+    def despachar(self, funcao, *args):
+        """Roda ``funcao(*args)`` na thread de trabalho; ignora se ela estiver ocupada"""
+        with self._trava:
+            if self.ocupado:
+                print("Outro comando já em execução; gatilho ignorado.")
+                return False
+            self._gatilho = perf_counter()
+            self._thread = threading.Thread(target=self._rodar, args=(funcao,) + args, daemon=True)
+            self._thread.start()
+            return True
+
+    def aguardar(self, timeout=None):
+        """Espera a execução em andamento terminar"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _rodar(self, funcao, *args):
+        try:
+            funcao(*args)
+        except Exception as e:
+            print(f"Erro ao executar o comando: {e}")
+
+    def _executar(self):
+        try:
+            with fase("rotina", isolada=self.isolar):
+                if self.isolar:
+                    self._executar_subprocesso()
+                else:
+                    self._executar_em_processo()
+        except Exception as e:
+            print(f"Erro ao executar bom_dia.py: {e}")
+
+    def _executar_em_processo(self):
+        from dotenv import load_dotenv
+
+        # Relê o .env para refletir alterações feitas depois do aquecimento
+        load_dotenv(os.path.join(os.path.dirname(self.caminho_script), '.env'), override=True)
+        rotina.ao_primeira_acao = self._marcar_primeira_acao
+        try:
+            self._modulo.main()
+        finally:
+            rotina.ao_primeira_acao = None
+
+    def _executar_subprocesso(self):
+        processo = subprocess.Popen(
+            [sys.executable, '-u', self.caminho_script],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        marcado = False
+        for linha in processo.stdout:
+            # A primeira ação da rotina é anunciada com "Abrindo ..."
+            if not marcado and linha.startswith("Abrindo"):
+                self._marcar_primeira_acao()
+                marcado = True
+            print(linha, end="")
+        processo.wait()
+
+    def _marcar_primeira_acao(self):
+        latencia = perf_counter() - self._gatilho
+        self.latencias.append(latencia)
+        print(f"Primeira ação {1000 * latencia:.0f} ms após o gatilho")
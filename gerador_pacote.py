@@ -0,0 +1,429 @@
+"""Geração dos arquivos do pacote de instalação de um usuário.
+
+Usado pelo web app (um usuário por vez) e pelo ``lote.py`` (vários usuários
+em paralelo). As funções levantam exceção em caso de erro; quem chama
+decide como mostrar (``st.error`` no web app, relatório no lote).
+"""
+import json
+import shutil
+from pathlib import Path
+
+from modelos_compilados import compilar
+from pacote import CachePacotes, chave_pacote, membros_pasta
+from plano import ARQUIVO_PLANO, VERSAO_PLANO
+
+# Sistemas oferecidos no formulário (e aceitos no lote):
+# nome exibido -> (chave das variáveis LOGIN_/SENHA_ no .env, URL, trecho do
+# título da página quando nem o nome nem o endereço aparecem nele)
+CATALOGO_SISTEMAS = {
+    "GMail": ("GMAIL", "https://mail.google.com", None),
+    "Spotify": ("SPOTIFY", "https://open.spotify.com", None),
+    "Google Agenda": ("GOOGLE_AGENDA", "https://calendar.google.com", None),
+    "Sites de Notícias": ("SITES_DE_NOTICIAS", "https://g1.globo.com", None),
+    "YouTube": ("YOUTUBE", "https://www.youtube.com", None),
+    "Webmail": ("WEBMAIL", "https://webmail.itec.al.gov.br", "Zimbra"),
+    "SEI": ("SEI", "https://sei.al.gov.br/sip/login.php", None),
+    "TJ-AL (e-SAJ)": ("TJ_AL", "https://www2.tjal.jus.br/sajcas/login", "e-SAJ"),
+    "SOLAR": ("SOLAR", "https://solar.defensoria.al.def.br/atendimento/", None),
+    "ChatGPT": ("CHATGPT", "https://chat.openai.com", None),
+    "Diário Oficial": ("DIARIO_OFICIAL", "https://defensoria.al.def.br/diario-oficial", None),
+}
+SISTEMAS_POPULARES = list(CATALOGO_SISTEMAS)
+
+# Módulos de apoio copiados para o pacote junto com os scripts gerados
+MODULOS_RUNTIME = [
+    "prontidao.py",
+    "rotina.py",
+    "ouvinte.py",
+    "palavra_chave.py",
+    "captura_audio.py",
+    "executor_rotina.py",
+    "correspondencia.py",
+    "captura_tela.py",
+    "modelos_compilados.py",
+    "rastreamento.py",
+    "comandos.py",
+    "reconhecimento.py",
+    "codificacao_audio.py",
+    "navegador.py",
+    "entrada.py",
+    "plano.py",
+    "preaquecimento.py",
+    "bom_dia.py",
+]
+
+
+def criar_estrutura_usuario(nome_usuario, email, pasta_base="."):
+    """Cria a estrutura de pastas e arquivos para o usuário"""
+    # Cria pasta do usuário
+    pasta_usuario = Path(pasta_base) / nome_usuario
+    pasta_usuario.mkdir(parents=True, exist_ok=True)
+
+    # Cria pasta imagens
+    (pasta_usuario / "imagens").mkdir(exist_ok=True)
+
+    # Cria arquivo de configuração do usuário
+    config = {
+        "nome": nome_usuario,
+        "email": email,
+        "data_criacao": str(Path.cwd())
+    }
+    # Só grava se mudou (o Streamlit reexecuta isto a cada interação)
+    conteudo = json.dumps(config, indent=4)
+    arquivo_config = pasta_usuario / "config.json"
+    if not arquivo_config.exists() or arquivo_config.read_text() != conteudo:
+        arquivo_config.write_text(conteudo)
+
+    return pasta_usuario
+
+
+def chave_sistema(sistema):
+    """Chave das variáveis do .env de um sistema do catálogo ("TJ-AL (e-SAJ)" -> "TJ_AL")"""
+    return CATALOGO_SISTEMAS[sistema][0]
+
+
+def montar_plano(sistemas_selecionados, sistemas_custom, acoes_imagens=()):
+    """Plano da rotina (ver ``plano.py``): sites na ordem escolhida, depois as imagens"""
+    passos = []
+    for sistema in sistemas_selecionados:
+        chave, url, titulo = CATALOGO_SISTEMAS[sistema]
+        passo = {"tipo": "site", "nome": chave, "url": url,
+                 "login": f"LOGIN_{chave}", "senha": f"SENHA_{chave}"}
+        if titulo:
+            passo["titulo"] = titulo
+        passos.append(passo)
+    # As credenciais dos personalizados ficam no .env pela posição na lista
+    for idx, s in enumerate(sistemas_custom):
+        passos.append({"tipo": "site", "nome": s["nome"], "url": s["url"],
+                       "login": f"LOGIN_CUSTOM_{idx}", "senha": f"SENHA_CUSTOM_{idx}"})
+    for sistema, acoes in acoes_imagens:
+        passos.append({"tipo": "imagens", "nome": sistema,
+                       "acoes": [{"imagem": a["imagem"], "acao": a.get("acao", "")} for a in acoes]})
+    return {"versao": VERSAO_PLANO, "passos": passos}
+
+
+def criar_arquivo_plano(pasta_usuario, sistemas_selecionados, sistemas_custom, acoes_imagens=()):
+    """Grava o plano.json lido pelo bom_dia.py e pelo listener"""
+    plano = montar_plano(sistemas_selecionados, sistemas_custom, acoes_imagens)
+    with open(pasta_usuario / ARQUIVO_PLANO, "w", encoding="utf-8") as f:
+        json.dump(plano, f, ensure_ascii=False, indent=2)
+
+
+def copiar_modulos_runtime(pasta_usuario):
+    """Copia os módulos de apoio usados pelos scripts gerados"""
+    origem = Path(__file__).parent
+    for fname in MODULOS_RUNTIME:
+        shutil.copy2(origem / fname, pasta_usuario / fname)
+
+
+def compilar_modelos(pasta_usuario, acoes_imagens):
+    """Pré-processa as imagens usadas nas ações para a pasta modelos/"""
+    pasta_imagens = pasta_usuario / "imagens"
+    nomes = {acao["imagem"] for _, acoes in acoes_imagens for acao in acoes}
+    caminhos = [pasta_imagens / nome for nome in nomes if (pasta_imagens / nome).exists()]
+    compilar(caminhos, pasta_usuario / "modelos")
+
+
+def criar_arquivo_listener(pasta_usuario):
+    """Cria o arquivo voz_listener.py"""
+    template = """import os
+
+from dotenv import load_dotenv
+
+# O .env vem antes dos outros imports: MODO_OFFLINE, LIMIAR_PALAVRA_CHAVE,
+# TIMEOUT_PAGINA... são lidos quando os módulos são importados
+load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env'))
+
+import plano  # noqa: E402
+from captura_audio import CapturaContinua  # noqa: E402
+from comandos import comandos_padrao  # noqa: E402
+from executor_rotina import ExecutorRotina  # noqa: E402
+from ouvinte import Ouvinte  # noqa: E402
+from palavra_chave import MODO_OFFLINE, DetectorPalavraChave  # noqa: E402
+from preaquecimento import Preaquecedor  # noqa: E402
+
+# Gravações da frase-chave (python palavra_chave.py gravar referencias/bom_dia_1.wav)
+pasta_referencias = os.path.join(os.path.dirname(__file__), 'referencias')
+detector = DetectorPalavraChave.de_pasta(pasta_referencias)
+
+# A rotina fica importada e pronta; o gatilho só a dispara
+# (ISOLAR_ROTINA=1 volta a rodar o bom_dia.py em um processo separado)
+executor = ExecutorRotina(os.path.join(os.path.dirname(__file__), 'bom_dia.py'))
+executor.aquecer()
+
+plano_usuario = plano.carregar(os.path.join(os.path.dirname(__file__), plano.ARQUIVO_PLANO))
+
+# PREAQUECIMENTO=08:00-08:30 (ou auto) abre os sites antes do "bom dia";
+# só vale com a rotina no mesmo processo (sem ISOLAR_ROTINA=1). A abertura
+# roda na thread dos comandos, nunca junto com a rotina
+preaquecedor = Preaquecedor.do_ambiente(
+    lambda: [s.url for s in plano.sites_com_credenciais(plano_usuario["passos"])],
+    os.path.dirname(os.path.abspath(__file__)),
+    despachar=executor.despachar,
+)
+if preaquecedor is not None and not executor.isolar:
+    preaquecedor.iniciar()
+
+
+def bom_dia():
+    if preaquecedor is not None:
+        preaquecedor.registrar_gatilho()
+    executor.disparar()
+
+
+# "bom dia" dispara a rotina inteira; "abrir <sistema>" abre um sistema só,
+# na mesma thread da rotina (um comando por vez)
+registro = comandos_padrao(
+    bom_dia,
+    plano.sistemas(plano_usuario),
+    lambda nome, url: plano.abrir_sistema(plano_usuario, nome, pasta=os.path.dirname(os.path.abspath(__file__))),
+    despachar=executor.despachar,
+)
+
+# O microfone segue gravando enquanto uma frase é reconhecida
+captura = CapturaContinua(duracao_maxima=5)
+ouvinte = Ouvinte(detector=detector, offline=MODO_OFFLINE, captura=captura)
+ouvinte.iniciar()   # calibra ruído uma única vez
+print("Listener iniciado — fone de ouvido ligado.")
+print("Diga: " + ", ".join(c.nome for c in registro.comandos))
+while True:
+    comando = ouvinte.interpretar(ouvinte.ouvir())
+    if comando:
+        registro.executar(comando)
+"""
+
+    with open(pasta_usuario / "voz_listener.py", "w") as f:
+        f.write(template)
+
+
+def criar_arquivo_requirements(pasta_usuario):
+    """Cria o arquivo requirements.txt"""
+    requirements = """PyAutoGUI==0.9.54
+python-dotenv==1.0.1
+opencv-python==4.8.1.78
+Pillow==10.1.0
+openai>=1.14.3
+requests>=2.31.0
+pyttsx3>=2.90
+beautifulsoup4>=4.12.3
+PyPDF2>=3.0.1
+SpeechRecognition>=3.10.1
+numpy==1.26.4
+screeninfo
+mss
+streamlit>=1.32.0
+
+#⚠️ pyaudio deve ser instalado assim:
+# pip install pipwin
+# pipwin install pyaudio
+"""
+    with open(pasta_usuario / "requirements.txt", "w", encoding="utf-8") as f:
+        f.write(requirements)
+
+
+def criar_arquivo_instrucoes(pasta_usuario):
+    """Cria o arquivo de instruções"""
+    instrucoes = """# Instruções de Instalação e Uso
+
+1. Crie o ambiente virtual:
+   ```
+   py -3.11 -m venv .venv
+   ```
+
+2. Ative o ambiente virtual:
+   ```
+   .\.venv\Scripts\Activate.ps1
+   ```
+
+3. Atualize o pip:
+   ```
+   python.exe -m pip install --upgrade pip
+   ```
+
+4. Instale as dependências:
+   ```
+   pip install -r requirements.txt
+   ```
+
+5. Instale o PyAudio:
+   ```
+   pip install pipwin
+   pipwin install pyaudio
+   ```
+
+# Captura de Imagens
+
+Para capturar as imagens necessárias para a automação:
+
+1. Abra cada sistema que deseja automatizar
+2. Use a ferramenta de captura de tela do Windows (Win + Shift + S)
+3. Capture os elementos importantes como:
+   - Campo de login
+   - Campo de senha
+   - Botão de login
+   - Menus importantes
+4. Salve as imagens na pasta 'imagens' com nomes descritivos como:
+   - login_gmail.png
+   - senha_gmail.png
+   - botao_login_gmail.png
+   - menu_principal_gmail.png
+
+# Uso
+
+1. Execute o listener de voz:
+   ```
+   python voz_listener.py
+   ```
+
+2. Diga "bom dia" para iniciar a automação
+
+3. O sistema irá:
+   - Abrir os sites configurados
+   - Preencher login e senha
+   - Navegar pelos menus
+   - Executar as ações programadas
+
+# Frase de ativação offline (opcional)
+
+Para não usar a internet no reconhecimento, defina MODO_OFFLINE=1 e grave
+algumas vezes a frase "bom dia", para que o listener reconheça sua voz
+localmente (nesse modo o único comando é "bom dia"):
+   ```
+   python palavra_chave.py gravar referencias/bom_dia_1.wav
+   python palavra_chave.py gravar referencias/bom_dia_2.wav
+   python palavra_chave.py gravar referencias/bom_dia_3.wav
+   ```
+Sem o modo offline, as gravações não são usadas: silêncio e ruído já são
+descartados localmente e todos os comandos seguem para o Google.
+
+# Comandos de voz
+
+- "bom dia": abre todos os sistemas configurados
+- "abrir <sistema>" (ex.: "abrir SEI", "abrir Gmail"): abre só aquele sistema
+- "ler notícias", "abrir e-SAJ", "abrir agenda": atalhos para alguns sistemas
+
+Acentos, maiúsculas e pequenos erros de transcrição são tolerados.
+
+# Tempos de cada etapa (opcional)
+
+Com RASTREAMENTO=1 no .env, o tempo de cada etapa (calibração, captura,
+reconhecimento, abertura de cada site, login) é gravado em rastreamento.jsonl.
+Para ver a mediana (p50) e o p95 de cada etapa:
+   ```
+   python rastreamento.py resumo --dias 7
+   ```
+
+# Navegador (opcional)
+
+Os sites são abertos de uma vez, como abas, no navegador padrão. Para usar
+outro, defina NAVEGADOR no .env (ex.: NAVEGADOR=chrome ou NAVEGADOR=firefox).
+
+# Digitação do login (opcional)
+
+Login e senha são digitados direto, sem passar pela área de transferência
+(só textos com acentos ou ~ ^ ' " ` são colados, e ela é limpa em seguida).
+Se algum site perder letras, desacelere a digitação só para ele no .env:
+   ```
+   INTERVALO_TECLAS_SEI=0.05
+   PAUSA_CAMPOS_SEI=0.3
+   ```
+(ou INTERVALO_TECLAS / PAUSA_CAMPOS para todos). ENTRADA=area_transferencia
+volta a colar todos os campos.
+
+Antes de digitar, a rotina confere pelo título da janela qual sistema está
+na aba (no Linux, instale o xdotool). Se aparecer "não reconhecida pelo
+título", coloque no .env um trecho do título da página daquele sistema:
+   ```
+   TITULO_TJ_AL=Portal de Serviços e-SAJ
+   ```
+(nos sistemas personalizados, o nome vai em maiúsculas, sem acentos e com _
+no lugar dos espaços: "Sistema Interno" vira TITULO_SISTEMA_INTERNO; a
+mensagem da rotina já mostra o nome certo).
+Se um site costuma receber o login antes de o formulário aparecer, salve um
+recorte do campo de login em imagens/campo_login_<SISTEMA>.png (ex.:
+imagens/campo_login_SEI.png): a rotina espera esse campo estar na tela
+antes de digitar.
+
+# Pré-aquecimento (opcional)
+
+O listener pode abrir os sites antes do "bom dia", num horário dos dias
+úteis; quando o comando chega, só falta preencher os logins. No .env:
+   ```
+   PREAQUECIMENTO=08:00-08:30
+   ```
+ou PREAQUECIMENTO=auto, para aprender o horário com os últimos "bom dia"
+(a partir de 5 dias). Para ver o horário em uso:
+   ```
+   python preaquecimento.py janela
+   ```
+Para testar sem abrir nada, PREAQUECIMENTO_SIMULADO=1 faz o listener só
+avisar quando e quais sites abriria (ou rode `python preaquecimento.py simular`).
+No Linux é preciso o xdotool para o navegador voltar para a frente.
+
+# Observações
+
+- Mantenha o microfone ligado
+- Fale claramente o comando "bom dia"
+- As imagens devem ser capturadas na mesma resolução de tela
+- Não mova as janelas durante a automação
+"""
+    with open(pasta_usuario / "INSTRUCOES.txt", "w", encoding="utf-8") as f:
+        f.write(instrucoes)
+
+
+def criar_arquivo_bat(pasta_usuario):
+    """Cria o arquivo install.bat para instalação automática"""
+    conteudo = r"""@echo off
+cd %~dp0
+py -3.11 -m venv .venv
+call .\.venv\Scripts\activate
+python -m pip install --upgrade pip
+pip install -r requirements.txt
+pip install pipwin
+pipwin install pyaudio
+echo Instalação concluída! Leia o arquivo INSTRUCOES.txt para o próximo passo.
+pause
+"""
+    with open(pasta_usuario / "install.bat", "w", encoding="utf-8") as f:
+        f.write(conteudo)
+
+
+def gerar_arquivos(pasta_usuario, sistemas_selecionados, sistemas_custom, acoes_imagens=()):
+    """Cria na pasta do usuário todos os arquivos que vão no pacote"""
+    criar_arquivo_plano(pasta_usuario, sistemas_selecionados, sistemas_custom, acoes_imagens)
+    copiar_modulos_runtime(pasta_usuario)
+    compilar_modelos(pasta_usuario, acoes_imagens)
+    criar_arquivo_listener(pasta_usuario)
+    criar_arquivo_requirements(pasta_usuario)
+    criar_arquivo_instrucoes(pasta_usuario)
+    criar_arquivo_bat(pasta_usuario)
+
+
+def chave_usuario(pasta_usuario, nome_usuario, email, sistemas_selecionados, sistemas_custom, acoes_imagens=()):
+    """Chave do cache: tudo o que muda o conteúdo do pacote"""
+    configuracao = {
+        "nome": nome_usuario,
+        "email": email,
+        # A ordem escolhida vai para o plano
+        "sistemas": list(sistemas_selecionados),
+        "sistemas_custom": [{"nome": s["nome"], "url": s["url"]} for s in sistemas_custom],
+        "acoes_imagens": list(acoes_imagens),
+    }
+    arquivos = [caminho for caminho, _ in membros_pasta(Path(pasta_usuario) / "imagens")]
+    # O gerador (modelos do listener, instruções...) e os módulos copiados
+    arquivos.append(Path(__file__))
+    arquivos += [Path(__file__).parent / fname for fname in MODULOS_RUNTIME]
+    return chave_pacote(configuracao, arquivos)
+
+
+def gerar_pacote(pasta_usuario, nome_usuario, email, sistemas_selecionados, sistemas_custom,
+                 acoes_imagens=(), cache=None):
+    """Gera (ou reaproveita do cache) o ZIP do usuário; devolve (caminho, reaproveitado)"""
+    cache = cache or CachePacotes()
+    chave = chave_usuario(pasta_usuario, nome_usuario, email, sistemas_selecionados, sistemas_custom, acoes_imagens)
+    arquivo_pacote = cache.obter(chave)
+    if arquivo_pacote is not None:
+        return arquivo_pacote, True
+    gerar_arquivos(pasta_usuario, sistemas_selecionados, sistemas_custom, acoes_imagens)
+    # O ZIP é montado direto dos arquivos da pasta do usuário para o cache
+    return cache.construir(chave, membros_pasta(pasta_usuario)), False
@@ -0,0 +1,169 @@
+"""Geração em lote dos pacotes de instalação, sem o web app.
+
+Lê uma planilha CSV ou um JSON com os usuários e gera o pacote de cada um
+com as mesmas funções do web app (``gerador_pacote``), em paralelo num pool
+de processos (um por núcleo, por padrão). A falha de um usuário não
+interrompe os outros; no fim sai um relatório com os que falharam. Nomes
+repetidos (que gravariam na mesma pasta e no mesmo .zip) são recusados
+antes de começar.
+
+A pasta e o .zip de cada usuário usam o nome só com letras, números, ``.``,
+``-`` e ``_`` (``nome_pasta``), para nenhum nome sair da pasta de saída.
+Cada pacote é montado num cache próprio e temporário: o cache padrão
+(``.cache_pacotes``) é compartilhado, e a limpeza feita por um processo
+podia apagar o ZIP de outro antes da cópia.
+
+CSV (separador vírgula ou ponto e vírgula, listas separadas por ``|``)::
+
+    nome,email,sistemas,custom
+    maria,maria@exemplo.gov.br,GMail|SEI|TJ-AL (e-SAJ),Intranet=https://intranet.exemplo
+
+JSON::
+
+    [{"nome": "maria", "email": "...", "sistemas": ["GMail", "SEI"],
+      "sistemas_custom": [{"nome": "Intranet", "url": "https://..."}]}]
+
+Uso:
+
+    python lote.py usuarios.csv [--saida pacotes] [--processos 8]
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+
+def _lista(valor):
+    return [item.strip() for item in (valor or "").split("|") if item.strip()]
+
+
+def ler_usuarios(caminho):
+    """Lê os usuários de um .csv ou .json; devolve uma lista de dicionários"""
+    caminho = Path(caminho)
+    if caminho.suffix.lower() == ".json":
+        with open(caminho, encoding="utf-8") as f:
+            usuarios = json.load(f)
+    else:
+        with open(caminho, encoding="utf-8-sig", newline="") as f:
+            amostra = f.read(4096)
+            f.seek(0)
+            try:
+                dialeto = csv.Sniffer().sniff(amostra, delimiters=",;")
+            except csv.Error:
+                # Ex.: uma coluna só, sem separador para adivinhar
+                dialeto = csv.excel
+            usuarios = []
+            for linha in csv.DictReader(f, dialect=dialeto):
+                custom = []
+                for item in _lista(linha.get("custom")):
+                    nome, _, url = item.partition("=")
+                    custom.append({"nome": nome.strip(), "url": url.strip()})
+                usuarios.append({
+                    "nome": (linha.get("nome") or "").strip(),
+                    "email": (linha.get("email") or "").strip(),
+                    "sistemas": _lista(linha.get("sistemas")),
+                    "sistemas_custom": custom,
+                })
+    for usuario in usuarios:
+        usuario.setdefault("sistemas", [])
+        usuario.setdefault("sistemas_custom", [])
+    return usuarios
+
+
+def nome_pasta(nome):
+    """Nome seguro para pasta/arquivo ("../José Silva" -> "Jose_Silva")"""
+    nome = unicodedata.normalize("NFKD", nome or "")
+    nome = "".join(c for c in nome if not unicodedata.combining(c))
+    return re.sub(r"[^A-Za-z0-9.-]+", "_", nome).strip("._-")
+
+
+def nomes_repetidos(usuarios):
+    """Nomes que dariam a mesma pasta (sem diferenciar maiúsculas)"""
+    contagem = Counter(nome_pasta(usuario.get("nome")).casefold() for usuario in usuarios)
+    return {nome for nome, vezes in contagem.items() if nome and vezes > 1}
+
+
+def gerar_usuario(usuario, pasta_base, pasta_saida):
+    """Gera o pacote de um usuário (roda num processo do pool)"""
+    from gerador_pacote import SISTEMAS_POPULARES, criar_estrutura_usuario, gerar_pacote
+    from pacote import CachePacotes
+
+    inicio = time.perf_counter()
+    nome, email = usuario.get("nome"), usuario.get("email")
+    if not nome or not email:
+        raise ValueError("nome e email são obrigatórios")
+    pasta = nome_pasta(nome)
+    if not pasta:
+        raise ValueError(f"nome sem letras ou números: {nome!r}")
+    desconhecidos = [s for s in usuario["sistemas"] if s not in SISTEMAS_POPULARES]
+    if desconhecidos:
+        raise ValueError(f"sistemas desconhecidos: {', '.join(desconhecidos)}")
+
+    pasta_usuario = criar_estrutura_usuario(pasta, email, pasta_base)
+    destino = Path(pasta_saida) / f"{pasta}_automacao.zip"
+    with tempfile.TemporaryDirectory(prefix="cache_pacote_") as pasta_cache:
+        arquivo_pacote, _ = gerar_pacote(pasta_usuario, nome, email, usuario["sistemas"],
+                                         usuario["sistemas_custom"], cache=CachePacotes(pasta_cache))
+        shutil.copyfile(arquivo_pacote, destino)
+    return str(destino), time.perf_counter() - inicio
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera os pacotes de instalação de vários usuários")
+    parser.add_argument("usuarios", help="arquivo .csv ou .json com os usuários")
+    parser.add_argument("--saida", default="pacotes", help="pasta onde os .zip são gravados")
+    parser.add_argument("--pastas", default="usuarios", help="pasta base das pastas de cada usuário")
+    parser.add_argument("--processos", type=int, default=os.cpu_count(), help="processos em paralelo")
+    args = parser.parse_args(argv)
+
+    usuarios = ler_usuarios(args.usuarios)
+    os.makedirs(args.saida, exist_ok=True)
+    os.makedirs(args.pastas, exist_ok=True)
+
+    # Dois usuários com o mesmo nome gravariam na mesma pasta ao mesmo tempo
+    falhas = []
+    repetidos = nomes_repetidos(usuarios)
+    validos = []
+    for i, usuario in enumerate(usuarios):
+        nome = usuario.get("nome") or f"#{i + 1}"
+        if nome_pasta(usuario.get("nome")).casefold() in repetidos:
+            falhas.append((nome, ValueError("nome repetido na lista de usuários")))
+        else:
+            validos.append((nome, usuario))
+    for nome, erro in falhas:
+        print(f"{nome}: ERRO {erro}")
+    print(f"Gerando {len(validos)} pacote(s) com {args.processos} processo(s)...")
+
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.processos) as pool:
+        futuros = {
+            pool.submit(gerar_usuario, usuario, args.pastas, args.saida): nome
+            for nome, usuario in validos
+        }
+        for feitos, futuro in enumerate(as_completed(futuros), 1):
+            nome = futuros[futuro]
+            try:
+                destino, duracao = futuro.result()
+                print(f"[{feitos}/{len(validos)}] {nome}: {destino} ({duracao:.1f} s)")
+            except Exception as e:
+                falhas.append((nome, e))
+                print(f"[{feitos}/{len(validos)}] {nome}: ERRO {e}")
+
+    total = time.perf_counter() - inicio
+    print(f"{len(usuarios) - len(falhas)} pacote(s) gerado(s) em {total:.1f} s; {len(falhas)} falha(s)")
+    for nome, erro in falhas:
+        print(f"  - {nome}: {erro}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
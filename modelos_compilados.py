@@ -0,0 +1,132 @@
+"""Pacote de modelos pré-processados para o modo "Clique em imagem(s)".
+
+Na geração do pacote de instalação, cada imagem de referência é convertida
+uma vez para cinza, redimensionada em todas as escalas e reduzida em
+pirâmide (o mesmo que ``correspondencia.ModeloPreparado`` faz). Os arrays
+vão, um atrás do outro, para ``modelos.bin``; ``modelos.json`` guarda, para
+cada imagem, o hash SHA-256 do PNG de origem e o deslocamento e o formato
+de cada array.
+
+Na execução, ``modelos.bin`` é aberto com ``np.memmap`` e cada array é só
+uma fatia do mapeamento, sem decodificar PNG nem copiar nada. Imagens cujo
+hash não bate com o do índice (trocadas depois da geração) são ignoradas e
+voltam a ser preparadas a partir do PNG.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+from correspondencia import ESCALAS_PADRAO, ModeloPreparado
+
+VERSAO_FORMATO = 1
+ARQUIVO_DADOS = "modelos.bin"
+ARQUIVO_INDICE = "modelos.json"
+
+# Cada array começa num múltiplo disso dentro de modelos.bin
+ALINHAMENTO = 64
+
+
+def hash_arquivo(caminho):
+    """SHA-256 do conteúdo de uma imagem"""
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for parte in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(parte)
+    return h.hexdigest()
+
+
+def _gravar_atomico(caminho, escrever):
+    pasta = os.path.dirname(caminho)
+    fd, temporario = tempfile.mkstemp(suffix=".tmp", dir=pasta)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            escrever(f)
+        os.replace(temporario, caminho)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+def compilar(caminhos, pasta_destino, escalas=ESCALAS_PADRAO):
+    """Gera modelos.bin e modelos.json em ``pasta_destino``; devolve o índice
+
+    As imagens que não puderem ser lidas ficam de fora (na execução elas
+    são tratadas como qualquer imagem sem modelo compilado).
+    """
+    os.makedirs(pasta_destino, exist_ok=True)
+    indice = {"versao": VERSAO_FORMATO, "escalas": list(escalas), "modelos": {}}
+    arrays = []
+    posicao = 0
+    for caminho in sorted(str(c) for c in caminhos):
+        cinza = cv2.imread(caminho, cv2.IMREAD_GRAYSCALE)
+        if cinza is None:
+            print(f"Imagem {caminho} ignorada no pacote de modelos (não foi possível ler)")
+            continue
+        modelo = ModeloPreparado(cinza, escalas, os.path.basename(caminho))
+        variantes = []
+        for escala, niveis in modelo.variantes:
+            entradas = []
+            for nivel in niveis:
+                posicao += -posicao % ALINHAMENTO
+                entradas.append({"inicio": posicao, "formato": list(nivel.shape)})
+                arrays.append((posicao, nivel))
+                posicao += nivel.nbytes
+            variantes.append({"escala": escala, "niveis": entradas})
+        indice["modelos"][os.path.basename(caminho)] = {
+            "sha256": hash_arquivo(caminho),
+            "largura": modelo.largura,
+            "altura": modelo.altura,
+            "variantes": variantes,
+        }
+
+    def escrever_dados(f):
+        for inicio, array in arrays:
+            f.write(b"\0" * (inicio - f.tell()))
+            f.write(np.ascontiguousarray(array).tobytes())
+
+    _gravar_atomico(os.path.join(pasta_destino, ARQUIVO_DADOS), escrever_dados)
+    dados_indice = json.dumps(indice, indent=1).encode("utf-8")
+    _gravar_atomico(os.path.join(pasta_destino, ARQUIVO_INDICE), lambda f: f.write(dados_indice))
+    return indice
+
+
+def carregar(pasta_modelos, pasta_imagens, escalas=ESCALAS_PADRAO):
+    """Lê o pacote compilado; devolve {caminho da imagem: ModeloPreparado}
+
+    Só entram imagens que ainda existem em ``pasta_imagens`` com o mesmo
+    conteúdo usado na compilação. Sem pacote, ou com versão ou escalas
+    diferentes, devolve um dicionário vazio.
+    """
+    caminho_indice = os.path.join(pasta_modelos, ARQUIVO_INDICE)
+    caminho_dados = os.path.join(pasta_modelos, ARQUIVO_DADOS)
+    if not (os.path.exists(caminho_indice) and os.path.exists(caminho_dados)):
+        return {}
+    with open(caminho_indice, encoding="utf-8") as f:
+        indice = json.load(f)
+    if indice.get("versao") != VERSAO_FORMATO or indice.get("escalas") != list(escalas):
+        print("Pacote de modelos de outra versão; as imagens serão preparadas na hora")
+        return {}
+    if os.path.getsize(caminho_dados) == 0:
+        return {}
+
+    dados = np.memmap(caminho_dados, dtype=np.uint8, mode="r")
+    modelos = {}
+    for nome, info in indice["modelos"].items():
+        caminho = os.path.join(pasta_imagens, nome)
+        if not os.path.exists(caminho) or hash_arquivo(caminho) != info["sha256"]:
+            continue
+        variantes = []
+        for variante in info["variantes"]:
+            niveis = []
+            for nivel in variante["niveis"]:
+                altura, largura = nivel["formato"]
+                inicio = nivel["inicio"]
+                niveis.append(dados[inicio:inicio + altura * largura].reshape(altura, largura))
+            variantes.append((variante["escala"], niveis))
+        modelos[caminho] = ModeloPreparado.de_variantes(variantes, info["largura"], info["altura"], nome)
+    return modelos
@@ -0,0 +1,181 @@
+"""Abertura de várias URLs no navegador de uma vez só.
+
+``webbrowser.open`` chamado para cada sistema inicia um processo do
+navegador por URL (no Linux, cada chamada ao Chrome/Firefox ainda espera a
+instância aberta responder). Quando o navegador é chamado por linha de
+comando, todas as URLs vão numa única chamada (``google-chrome u1 u2 u3``,
+``firefox -new-tab u1 -new-tab u2``) e abrem como abas na ordem dada. Nos
+outros casos (padrão do Windows, macOS) as URLs são abertas uma a uma,
+como antes.
+
+``NAVEGADOR`` no .env escolhe o navegador pelo nome registrado no módulo
+``webbrowser`` (``chrome``, ``firefox``...); sem ele, vale o padrão do
+sistema. Um navegador falso registrado com ``webbrowser.register`` serve
+para testar (veja ``benchmarks/bench_navegador.py``).
+
+A janela em primeiro plano (para ler o título da aba em foco e para voltar
+ao navegador depois) vem do pygetwindow no Windows e do ``xdotool`` no
+Linux; o processo dono dela diz se é mesmo a janela de um navegador.
+"""
+import os
+import shutil
+import subprocess
+import sys
+import webbrowser
+
+# Tempo (s) esperando a chamada terminar com erro antes de considerá-la aceita
+# (ao iniciar o navegador do zero, o processo continua rodando)
+ESPERA_CONFIRMACAO = 0.25
+
+# Trechos do nome do processo (``chrome.exe``, ``firefox-bin``...) que
+# indicam uma janela de navegador
+PROCESSOS_NAVEGADOR = ("chrome", "chromium", "firefox", "msedge", "brave", "opera", "vivaldi", "safari")
+
+
+def controlador(nome=None):
+    """Navegador do ``webbrowser`` escolhido por ``NAVEGADOR`` (ou o padrão)"""
+    return webbrowser.get(nome or os.getenv("NAVEGADOR") or None)
+
+
+def comando_lote(navegador, urls):
+    """Linha de comando que abre todas as URLs numa chamada, ou None se não der"""
+    if isinstance(navegador, webbrowser.UnixBrowser):
+        # Só a forma "<ação> <url>" pode ser repetida na mesma linha
+        if navegador.remote_args != ["%action", "%s"]:
+            return None
+        acao = navegador.remote_action_newtab or ""
+        comando = [navegador.name]
+        for url in urls:
+            comando += [acao, url] if acao else [url]
+        return comando
+    if isinstance(navegador, webbrowser.GenericBrowser):
+        if navegador.args.count("%s") != 1:
+            return None
+        posicao = navegador.args.index("%s")
+        return [navegador.name] + navegador.args[:posicao] + list(urls) + navegador.args[posicao + 1:]
+    return None
+
+
+def _executar(comando):
+    """Dispara o comando sem esperar o navegador fechar; False se falhou"""
+    try:
+        processo = subprocess.Popen(
+            comando, close_fds=True, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, start_new_session=sys.platform != "win32",
+        )
+    except OSError:
+        return False
+    try:
+        return processo.wait(ESPERA_CONFIRMACAO) == 0
+    except subprocess.TimeoutExpired:
+        return True
+
+
+def abrir_urls(urls, navegador=None):
+    """Abre as URLs na ordem dada; devolve "lote" ou "individual" (como abriu)"""
+    urls = list(urls)
+    if not urls:
+        return None
+    navegador = navegador or controlador()
+    if len(urls) > 1:
+        comando = comando_lote(navegador, urls)
+        if comando is not None and _executar(comando):
+            return "lote"
+    for url in urls:
+        navegador.open(url)
+    return "individual"
+
+
+# --- janela do navegador ---------------------------------------------------
+
+def janela_ativa():
+    """Janela em primeiro plano (do pygetwindow, ou o id do xdotool); None se não der"""
+    try:
+        import pygetwindow
+        janela = pygetwindow.getActiveWindow()
+        if hasattr(janela, "activate"):
+            return janela
+    except (ImportError, NotImplementedError):
+        pass
+    if shutil.which("xdotool"):
+        resultado = subprocess.run(["xdotool", "getactivewindow"], capture_output=True, text=True)
+        if resultado.returncode == 0:
+            return resultado.stdout.strip()
+    return None
+
+
+def ativar_janela(janela):
+    """Traz a janela de volta para a frente; devolve True se conseguiu"""
+    if janela is None:
+        return False
+    if isinstance(janela, str):
+        return subprocess.run(["xdotool", "windowactivate", "--sync", janela]).returncode == 0
+    try:
+        janela.activate()
+        return True
+    except Exception as e:
+        print(f"Não foi possível voltar à janela do navegador: {e}")
+        return False
+
+
+def processo_janela(janela):
+    """Nome do processo dono da janela, em minúsculas; None se não der para saber"""
+    if janela is None:
+        return None
+    if isinstance(janela, str):
+        resultado = subprocess.run(["xdotool", "getwindowpid", janela], capture_output=True, text=True)
+        if resultado.returncode != 0:
+            return None
+        try:
+            with open(f"/proc/{resultado.stdout.strip()}/comm", encoding="utf-8") as f:
+                return f.read().strip().lower() or None
+        except OSError:
+            return None
+    identificador = getattr(janela, "_hWnd", None)
+    if identificador is None or sys.platform != "win32":
+        return None
+    return _processo_windows(identificador)
+
+
+def _processo_windows(identificador):
+    import ctypes
+    from ctypes import wintypes
+
+    pid = wintypes.DWORD()
+    ctypes.windll.user32.GetWindowThreadProcessId(identificador, ctypes.byref(pid))
+    # PROCESS_QUERY_LIMITED_INFORMATION
+    processo = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid.value)
+    if not processo:
+        return None
+    try:
+        caminho = ctypes.create_unicode_buffer(1024)
+        tamanho = wintypes.DWORD(len(caminho))
+        if not ctypes.windll.kernel32.QueryFullProcessImageNameW(processo, 0, caminho, ctypes.byref(tamanho)):
+            return None
+        return os.path.basename(caminho.value).lower()
+    finally:
+        ctypes.windll.kernel32.CloseHandle(processo)
+
+
+def janela_do_navegador(janela, getenv=os.getenv):
+    """True se a janela pertence a um processo de navegador (o de ``NAVEGADOR`` ou um conhecido)"""
+    processo = processo_janela(janela)
+    if processo is None:
+        return False
+    nomes = PROCESSOS_NAVEGADOR
+    configurado = os.path.basename(getenv("NAVEGADOR") or "").lower()
+    if configurado:
+        nomes += (configurado,)
+    return any(nome in processo for nome in nomes)
+
+
+def titulo_janela(janela=None):
+    """Título da janela (a ativa, se nenhuma for dada), ou None se não der para ler"""
+    if janela is None:
+        janela = janela_ativa()
+    if janela is None:
+        return None
+    if isinstance(janela, str):
+        resultado = subprocess.run(["xdotool", "getwindowname", janela], capture_output=True, text=True)
+        return resultado.stdout.strip() if resultado.returncode == 0 else None
+    return janela.title
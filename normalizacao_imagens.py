@@ -0,0 +1,120 @@
+"""Normalização das imagens de referência no upload.
+
+Os usuários costumam enviar capturas de tela inteiras, com margens grandes
+em volta do botão ou campo que interessa. Antes de guardar, cada PNG:
+
+- perde as bordas de cor uniforme (sobra uma margem pequena em volta do
+  conteúdo);
+- perde os metadados (texto, perfil de cor, EXIF);
+- é recomprimido com a compressão máxima do PNG, em paleta quando tem
+  até 256 cores (sem perda) e sem canal alfa quando é todo opaco.
+
+Se o resultado não ficar menor que o arquivo enviado, é guardada a imagem
+enviada sem recorte nem conversão, só sem os metadados.
+
+O DPI gravado na captura e a escala de tela que ele indica (96 DPI = 100%)
+são devolvidos junto, para ficarem registrados com a imagem.
+"""
+import io
+
+from PIL import Image, ImageChops
+
+# Diferença máxima (0-255) de um pixel para a cor da borda ainda contar como borda
+TOLERANCIA_BORDA = 8
+# Pixels mantidos em volta do conteúdo depois do recorte
+MARGEM_RECORTE = 2
+DPI_BASE = 96
+
+
+def _bytes(arquivo):
+    arquivo.seek(0)
+    dados = arquivo.read()
+    arquivo.seek(0)
+    return dados
+
+
+def limites_conteudo(imagem, tolerancia=TOLERANCIA_BORDA, margem=MARGEM_RECORTE):
+    """Caixa (esquerda, topo, direita, base) sem as bordas da cor do canto"""
+    rgb = imagem.convert("RGB")
+    fundo = Image.new("RGB", rgb.size, rgb.getpixel((0, 0)))
+    diferenca = ImageChops.difference(rgb, fundo).convert("L")
+    caixa = diferenca.point(lambda v: 255 if v > tolerancia else 0).getbbox()
+    if caixa is None:
+        return (0, 0) + imagem.size
+    esquerda, topo, direita, base = caixa
+    return (
+        max(0, esquerda - margem),
+        max(0, topo - margem),
+        min(imagem.width, direita + margem),
+        min(imagem.height, base + margem),
+    )
+
+
+def escala_do_dpi(dpi):
+    """Escala de tela indicada pelo DPI da captura (None se não houver DPI)"""
+    if not dpi:
+        return None
+    return round(max(float(dpi[0]), DPI_BASE) / DPI_BASE, 2)
+
+
+def _sem_metadados(imagem):
+    """Cópia da imagem só com a transparência nas informações
+
+    O Pillow leva ``icc_profile`` de ``info`` para o arquivo salvo mesmo sem
+    pedir, e ``crop``/``convert`` copiam ``info``.
+    """
+    limpa = imagem.copy()
+    limpa.info = {k: v for k, v in imagem.info.items() if k == "transparency"}
+    return limpa
+
+
+def _salvar(imagem):
+    saida = io.BytesIO()
+    imagem.save(saida, "PNG", optimize=True)
+    return saida
+
+
+def _compactar(imagem):
+    if imagem.mode in ("RGBA", "LA") and imagem.getchannel("A").getextrema() == (255, 255):
+        imagem = imagem.convert("RGB" if imagem.mode == "RGBA" else "L")
+    elif imagem.mode not in ("RGB", "RGBA", "L", "LA"):
+        imagem = imagem.convert("RGBA" if "transparency" in imagem.info else "RGB")
+    if imagem.mode == "RGB" and imagem.getcolors(256) is not None:
+        # Até 256 cores: a paleta guarda exatamente as mesmas cores
+        imagem = imagem.quantize(colors=256, method=Image.Quantize.MAXCOVERAGE, dither=Image.Dither.NONE)
+    return _salvar(imagem)
+
+
+def normalizar_png(arquivo, tolerancia=TOLERANCIA_BORDA, margem=MARGEM_RECORTE):
+    """Recorta, limpa e recomprime um PNG; devolve (BytesIO, informações)"""
+    original = _bytes(arquivo)
+    try:
+        imagem = Image.open(io.BytesIO(original))
+        imagem.load()
+    except OSError as e:
+        # Arquivo que o Pillow não lê é guardado como veio
+        print(f"Imagem não normalizada ({e}); guardando o arquivo original")
+        return io.BytesIO(original), {
+            "dpi": None, "escala": None, "tamanho_original": None, "recorte": None,
+            "bytes_original": len(original), "bytes_final": len(original),
+        }
+    with imagem:
+        dpi = imagem.info.get("dpi")
+        caixa = limites_conteudo(imagem, tolerancia, margem)
+        limpa = _sem_metadados(imagem)
+        saida = _compactar(limpa.crop(caixa))
+        if saida.getbuffer().nbytes >= len(original):
+            # Recortar e converter não compensou: fica a imagem enviada como
+            # está, mas os metadados saem de qualquer jeito
+            saida = _salvar(limpa)
+            caixa = None
+    info = {
+        "dpi": [round(float(v), 1) for v in dpi] if dpi else None,
+        "escala": escala_do_dpi(dpi),
+        "tamanho_original": list(imagem.size),
+        "recorte": list(caixa) if caixa else None,
+        "bytes_original": len(original),
+        "bytes_final": saida.getbuffer().nbytes,
+    }
+    saida.seek(0)
+    return saida, info
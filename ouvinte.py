@@ -0,0 +1,130 @@
+"""Escuta contínua com um único microfone aberto.
+
+O reconhecedor e o stream de áudio são criados uma vez só e a calibração de
+ruído roda apenas na partida. Depois disso o limiar acompanha o ruído pelo
+ajuste dinâmico do próprio ``speech_recognition``
+(``dynamic_energy_threshold``), que só usa os blocos ouvidos enquanto
+espera a fala começar.
+
+Com um ``detector`` (ver ``palavra_chave.py``), silêncio e ruído não seguem
+para o Google. A comparação com as gravações da frase de ativação só vale
+com ``offline=True``, em que "bom dia" é o único comando; com o Google, os
+outros comandos também precisam passar.
+
+Com uma ``captura`` (ver ``captura_audio.py``), as frases vêm da captura
+contínua por callback em vez de ``listen()``, e o microfone segue gravando
+enquanto a frase anterior é reconhecida.
+
+O envio para o Google passa por um ``backend`` (ver ``reconhecimento.py``),
+por padrão com conexão reaproveitada entre as frases e novas tentativas.
+"""
+import threading
+
+import speech_recognition as sr
+
+from rastreamento import fase
+
+
+class Ouvinte:
+    """Mantém um reconhecedor e um microfone abertos entre as frases"""
+
+    def __init__(self, recognizer=None, microfone=None, duracao_calibracao=1.0, idioma='pt-BR',
+                 detector=None, offline=False, frase_offline="bom dia", captura=None, backend=None):
+        self.recognizer = recognizer or sr.Recognizer()
+        self.recognizer.dynamic_energy_threshold = True
+        self.microfone = microfone
+        self.captura = captura
+        self.backend = backend
+        self.detector = detector
+        self.offline = offline
+        self.frase_offline = frase_offline
+        self.descartadas_localmente = 0
+        self.duracao_calibracao = duracao_calibracao
+        self.idioma = idioma
+        self._fonte = None
+
+    def iniciar(self):
+        """Abre o microfone e calibra o ruído ambiente uma única vez"""
+        if self._fonte is not None:
+            return
+        if not self.offline:
+            # A conexão com o reconhecimento abre enquanto o microfone calibra
+            backend = self._backend()
+            threading.Thread(target=backend.aquecer, daemon=True).start()
+        if self.captura is not None:
+            # A captura contínua calibra e acompanha o ruído por conta própria
+            with fase("calibracao", captura="continua"):
+                self.captura.iniciar()
+            self._fonte = self.captura
+            return
+        if self.microfone is None:
+            self.microfone = sr.Microphone()
+        self._fonte = self.microfone.__enter__()
+        print("Calibrando ruído ambiente...")
+        with fase("calibracao", captura="listen"):
+            self.recognizer.adjust_for_ambient_noise(self._fonte, duration=self.duracao_calibracao)
+
+    def parar(self):
+        """Fecha o microfone"""
+        if self._fonte is None:
+            return
+        if self.captura is not None:
+            self.captura.parar()
+        else:
+            self.microfone.__exit__(None, None, None)
+        self._fonte = None
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, *exc):
+        self.parar()
+
+    def ouvir(self, timeout=None, phrase_time_limit=None):
+        """Captura a próxima frase usando o stream já aberto"""
+        self.iniciar()
+        with fase("captura"):
+            if self.captura is not None:
+                return self.captura.proxima_frase(timeout=timeout)
+            return self.recognizer.listen(self._fonte, timeout=timeout, phrase_time_limit=phrase_time_limit)
+
+    def reconhecer(self, audio):
+        """Envia o áudio ao Google e devolve o texto em minúsculas (ou None)"""
+        try:
+            with fase("reconhecimento"):
+                comando = self._backend().reconhecer(audio, self.idioma)
+            print(f"Comando reconhecido: {comando}")
+            return comando.lower()
+        except sr.UnknownValueError:
+            print("Não foi possível entender o áudio")
+            return None
+        except sr.RequestError as e:
+            print(f"Erro ao fazer requisição ao Google Speech Recognition; {e}")
+            return None
+
+    def _backend(self):
+        if self.backend is None:
+            from reconhecimento import criar_backend
+            self.backend = criar_backend(self.recognizer)
+        return self.backend
+
+    def ouvir_comando(self, phrase_time_limit=None):
+        """Ouve uma frase e devolve o comando reconhecido"""
+        print("Aguardando comando de voz...")
+        return self.interpretar(self.ouvir(phrase_time_limit=phrase_time_limit))
+
+    def interpretar(self, audio):
+        """Passa a frase pelo filtro local e, se for o caso, pelo Google"""
+        if audio is None:
+            return None
+        if self.detector is not None:
+            provavel, distancia = self.detector.avaliar_audio(audio, comparar=self.offline)
+            if not provavel:
+                # Conversa de fundo não vai para a nuvem
+                self.descartadas_localmente += 1
+                return None
+            if self.offline:
+                print(f"Frase de ativação detectada localmente (distância {distancia:.1f})")
+                return self.frase_offline
+        return self.reconhecer(audio)
@@ -0,0 +1,158 @@
+"""Montagem do pacote de instalação (.zip).
+
+Os arquivos entram no ZIP direto dos seus caminhos de origem, lidos em
+blocos pelo ``zipfile``, sem cópia para uma pasta temporária. O arquivo
+compactado é escrito num ``SpooledTemporaryFile``: fica em memória enquanto
+é pequeno e passa para o disco sozinho quando cresce, então o pico de
+memória não depende do tamanho do acervo de imagens.
+
+Pacotes prontos ficam num cache em disco, indexado pelo hash da
+configuração e do conteúdo dos arquivos; pedir de novo o mesmo pacote
+devolve o ZIP já pronto.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zipfile
+
+# Acima disso o buffer do ZIP passa da memória para um arquivo temporário
+LIMITE_MEMORIA = 8 * 1024 * 1024
+
+# Formatos que já são compactados; recomprimir só gasta CPU
+EXTENSOES_COMPACTADAS = {".png", ".jpg", ".jpeg", ".gif", ".zip", ".npz"}
+
+
+def membros_pasta(pasta, prefixo=""):
+    """Lista (caminho, nome no zip) dos arquivos de uma pasta, sem os ocultos"""
+    membros = []
+    for raiz, pastas, arquivos in os.walk(pasta):
+        # Pastas ocultas (ex.: .objetos do armazém de imagens) ficam de fora
+        pastas[:] = sorted(p for p in pastas if not p.startswith("."))
+        for nome in sorted(arquivos):
+            if nome.startswith("."):
+                continue
+            caminho = os.path.join(raiz, nome)
+            membros.append((caminho, os.path.join(prefixo, os.path.relpath(caminho, pasta))))
+    return membros
+
+
+def construir_zip(membros, nivel=6, buffer=None):
+    """Escreve os membros num ZIP comprimido e devolve o buffer já rebobinado
+
+    Sem ``buffer``, usa um ``SpooledTemporaryFile``; pode receber também um
+    arquivo aberto em modo binário.
+    """
+    if buffer is None:
+        buffer = tempfile.SpooledTemporaryFile(max_size=LIMITE_MEMORIA)
+    try:
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED, compresslevel=nivel) as z:
+            for caminho, arcname in membros:
+                extensao = os.path.splitext(caminho)[1].lower()
+                compressao = zipfile.ZIP_STORED if extensao in EXTENSOES_COMPACTADAS else zipfile.ZIP_DEFLATED
+                z.write(caminho, arcname, compress_type=compressao)
+    except BaseException:
+        buffer.close()
+        raise
+    buffer.seek(0)
+    return buffer
+
+
+# --- cache de pacotes --------------------------------------------------
+
+PASTA_CACHE = ".cache_pacotes"
+CACHE_MAX_BYTES = 200 * 1024 * 1024
+CACHE_MAX_IDADE = 7 * 24 * 3600
+
+
+def hash_arquivo(caminho, bloco=1024 * 1024):
+    """SHA-256 do conteúdo de um arquivo, lido em blocos"""
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for parte in iter(lambda: f.read(bloco), b""):
+            h.update(parte)
+    return h.hexdigest()
+
+
+def chave_pacote(configuracao, arquivos=()):
+    """Hash da configuração (JSON) e do conteúdo de todos os arquivos envolvidos
+
+    Os arquivos incluem o próprio gerador e os módulos copiados para o
+    pacote, então mudar um modelo de arquivo gerado já invalida o cache.
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps(configuracao, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    for caminho in sorted(str(c) for c in arquivos):
+        h.update(os.path.basename(caminho).encode("utf-8"))
+        h.update(hash_arquivo(caminho).encode())
+    return h.hexdigest()
+
+
+class CachePacotes:
+    """Pacotes prontos guardados em disco pela chave de conteúdo"""
+
+    def __init__(self, pasta=PASTA_CACHE, max_bytes=CACHE_MAX_BYTES, max_idade=CACHE_MAX_IDADE):
+        self.pasta = pasta
+        self.max_bytes = max_bytes
+        self.max_idade = max_idade
+
+    def _caminho(self, chave):
+        return os.path.join(self.pasta, f"{chave}.zip")
+
+    def obter(self, chave):
+        """Caminho do pacote em cache, ou None; renova a data de uso"""
+        caminho = self._caminho(chave)
+        if not os.path.exists(caminho):
+            return None
+        os.utime(caminho)
+        return caminho
+
+    def construir(self, chave, membros):
+        """Monta o ZIP direto no cache (escrita atômica) e devolve o caminho"""
+        os.makedirs(self.pasta, exist_ok=True)
+        caminho = self._caminho(chave)
+        fd, temporario = tempfile.mkstemp(suffix=".tmp", dir=self.pasta)
+        try:
+            with os.fdopen(fd, "w+b") as f:
+                construir_zip(membros, buffer=f)
+            os.replace(temporario, caminho)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+        self.limpar(manter=caminho)
+        return caminho
+
+    def limpar(self, manter=None):
+        """Remove entradas antigas e, se passar do limite, as menos usadas"""
+        if not os.path.isdir(self.pasta):
+            return
+        agora = time.time()
+        entradas = []
+        for nome in os.listdir(self.pasta):
+            if not nome.endswith(".zip"):
+                continue
+            caminho = os.path.join(self.pasta, nome)
+            if caminho == manter:
+                continue
+            # Outro processo (ex.: lote.py) pode ter removido a entrada antes
+            try:
+                info = os.stat(caminho)
+                if agora - info.st_mtime > self.max_idade:
+                    os.remove(caminho)
+                    continue
+            except FileNotFoundError:
+                continue
+            entradas.append((info.st_mtime, info.st_size, caminho))
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        if manter is not None and os.path.exists(manter):
+            total += os.path.getsize(manter)
+        for _, tamanho, caminho in sorted(entradas):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(caminho)
+            except FileNotFoundError:
+                pass
+            total -= tamanho
@@ -0,0 +1,241 @@
+"""Filtro local da frase de ativação ("bom dia") antes do reconhecimento na nuvem.
+
+Primeiro estágio: detecção de voz por energia, que descarta silêncio, ruído
+e trechos curtos ou longos demais para serem uma frase. Segundo estágio:
+comparação por DTW dos coeficientes MFCC com gravações de referência do
+próprio usuário falando a frase (arquivos WAV em ``PASTA_REFERENCIAS``).
+
+No modo offline só a frase de ativação existe e passa pelos dois estágios,
+sem consultar a nuvem. Com o Google, os outros comandos ("abrir SEI"...)
+também precisam passar, então o listener usa só o primeiro estágio
+(``comparar=False``) e deixa o registro de comandos decidir.
+
+Gravar uma referência:
+
+    python palavra_chave.py gravar referencias/bom_dia_1.wav
+"""
+import os
+import sys
+import wave
+
+import numpy as np
+
+TAXA = 16000
+JANELA = 400   # 25 ms
+PASSO = 160    # 10 ms
+N_FFT = 512
+N_FILTROS = 26
+N_COEFICIENTES = 13
+
+# Duração plausível (s) de uma frase falada depois de recortar o silêncio
+DURACAO_MINIMA = 0.25
+DURACAO_MAXIMA = 5.0
+
+# Limiar de distância usado quando há uma única referência
+LIMIAR_PADRAO = float(os.getenv("LIMIAR_PALAVRA_CHAVE", "25"))
+
+# Lidos na importação: quem usa o .env precisa carregá-lo antes de importar
+# este módulo (o listener gerado faz isso na primeira linha)
+PASTA_REFERENCIAS = os.getenv("PASTA_REFERENCIAS", "referencias")
+MODO_OFFLINE = os.getenv("MODO_OFFLINE", "0") == "1"
+
+
+def carregar_wav(caminho):
+    """Lê um WAV PCM de 16 bits e devolve (amostras mono int16, taxa)"""
+    with wave.open(str(caminho), "rb") as w:
+        if w.getsampwidth() != 2:
+            raise ValueError(f"{caminho}: apenas WAV de 16 bits é suportado")
+        dados = np.frombuffer(w.readframes(w.getnframes()), dtype="<i2")
+        canais = w.getnchannels()
+        taxa = w.getframerate()
+    if canais > 1:
+        dados = dados.reshape(-1, canais).mean(axis=1).astype(np.int16)
+    return dados, taxa
+
+
+def reamostrar(amostras, taxa, nova_taxa=TAXA):
+    """Reamostra por interpolação linear (suficiente para voz)"""
+    if taxa == nova_taxa or len(amostras) == 0:
+        return np.asarray(amostras, dtype=np.float32)
+    n = int(len(amostras) * nova_taxa / taxa)
+    origem = np.linspace(0, len(amostras) - 1, n)
+    return np.interp(origem, np.arange(len(amostras)), amostras).astype(np.float32)
+
+
+def energia_quadros(amostras, janela=JANELA, passo=PASSO):
+    """Energia RMS de cada quadro"""
+    amostras = np.asarray(amostras, dtype=np.float32)
+    if len(amostras) < janela:
+        return np.zeros(0, dtype=np.float32)
+    n = 1 + (len(amostras) - janela) // passo
+    indices = np.arange(janela)[None, :] + passo * np.arange(n)[:, None]
+    return np.sqrt(np.mean(amostras[indices] ** 2, axis=1))
+
+
+def detectar_voz(amostras, fator=3.0, energia_minima=200.0):
+    """Devolve (inicio, fim) em amostras do trecho com voz, ou None
+
+    O piso de ruído é o percentil 10 da energia dos quadros; conta como voz
+    o que fica ``fator`` vezes acima dele.
+    """
+    energia = energia_quadros(amostras)
+    if len(energia) == 0:
+        return None
+    piso = np.percentile(energia, 10)
+    ativos = np.flatnonzero(energia > max(piso * fator, energia_minima))
+    if len(ativos) == 0:
+        return None
+    return ativos[0] * PASSO, ativos[-1] * PASSO + JANELA
+
+
+def _banco_filtros_mel(taxa=TAXA):
+    def mel(f):
+        return 2595 * np.log10(1 + f / 700)
+
+    def hz(m):
+        return 700 * (10 ** (m / 2595) - 1)
+
+    pontos = hz(np.linspace(mel(80), mel(taxa / 2), N_FILTROS + 2))
+    bins = np.floor((N_FFT + 1) * pontos / taxa).astype(int)
+    filtros = np.zeros((N_FILTROS, N_FFT // 2 + 1), dtype=np.float32)
+    for i in range(1, N_FILTROS + 1):
+        esq, centro, dir_ = bins[i - 1], bins[i], bins[i + 1]
+        if centro > esq:
+            filtros[i - 1, esq:centro] = (np.arange(esq, centro) - esq) / (centro - esq)
+        if dir_ > centro:
+            filtros[i - 1, centro:dir_] = (dir_ - np.arange(centro, dir_)) / (dir_ - centro)
+    return filtros
+
+
+_FILTROS = _banco_filtros_mel()
+_DCT = np.cos(np.pi / N_FILTROS * (np.arange(N_FILTROS)[None, :] + 0.5) * np.arange(N_COEFICIENTES)[:, None])
+_HAMMING = np.hamming(JANELA).astype(np.float32)
+
+
+def mfcc(amostras):
+    """MFCC com normalização pela média (um vetor por quadro)"""
+    amostras = np.asarray(amostras, dtype=np.float32)
+    if len(amostras) < JANELA:
+        return np.zeros((0, N_COEFICIENTES), dtype=np.float32)
+    amostras = np.append(amostras[0], amostras[1:] - 0.97 * amostras[:-1])
+    n = 1 + (len(amostras) - JANELA) // PASSO
+    indices = np.arange(JANELA)[None, :] + PASSO * np.arange(n)[:, None]
+    quadros = amostras[indices] * _HAMMING
+    potencia = np.abs(np.fft.rfft(quadros, N_FFT)) ** 2 / N_FFT
+    log_mel = np.log(potencia @ _FILTROS.T + 1e-10)
+    coef = log_mel @ _DCT.T
+    return (coef - coef.mean(axis=0)).astype(np.float32)
+
+
+def distancia_dtw(referencia, consulta):
+    """DTW de subsequência: a referência pode casar com qualquer trecho da consulta
+
+    Devolve o custo médio por quadro da referência (menor = mais parecido).
+    """
+    n, m = len(referencia), len(consulta)
+    if n == 0 or m == 0:
+        return float("inf")
+    custo = np.sqrt(((referencia[:, None, :] - consulta[None, :, :]) ** 2).sum(axis=2))
+    acumulado = custo[0].copy()
+    # Passos (i-1, j), (i-1, j-1) e (i-1, j-2): cada linha depende só da
+    # anterior, então a recorrência fica vetorizada; a frase falada pode ir
+    # da metade ao dobro da velocidade da referência
+    for i in range(1, n):
+        deslocado1 = np.concatenate(([np.inf], acumulado[:-1]))
+        deslocado2 = np.concatenate(([np.inf, np.inf], acumulado[:-2]))[:m]
+        acumulado = custo[i] + np.minimum(np.minimum(acumulado, deslocado1), deslocado2)
+    return float(acumulado.min() / n)
+
+
+class DetectorPalavraChave:
+    """Decide localmente se um trecho de áudio provavelmente é a frase de ativação"""
+
+    def __init__(self, referencias=(), limiar=None, margem=1.3):
+        self.referencias = [mfcc(r) for r in referencias]
+        if limiar is None:
+            limiar = self._limiar_automatico(margem)
+        self.limiar = limiar
+
+    @classmethod
+    def de_pasta(cls, pasta=PASTA_REFERENCIAS, **kwargs):
+        """Carrega todas as gravações .wav de referência de uma pasta"""
+        referencias = []
+        if os.path.isdir(pasta):
+            for nome in sorted(os.listdir(pasta)):
+                if nome.lower().endswith(".wav"):
+                    amostras, taxa = carregar_wav(os.path.join(pasta, nome))
+                    recorte = cls._recortar(reamostrar(amostras, taxa))
+                    if len(recorte):
+                        referencias.append(recorte)
+        return cls(referencias, **kwargs)
+
+    def _limiar_automatico(self, margem):
+        """Com duas ou mais referências, usa a maior distância entre elas"""
+        if len(self.referencias) < 2:
+            return LIMIAR_PADRAO
+        distancias = [
+            distancia_dtw(a, b)
+            for i, a in enumerate(self.referencias)
+            for j, b in enumerate(self.referencias)
+            if i != j
+        ]
+        return max(distancias) * margem
+
+    @staticmethod
+    def _recortar(amostras):
+        trecho = detectar_voz(amostras)
+        if trecho is None:
+            return amostras[:0]
+        return amostras[trecho[0]:trecho[1]]
+
+    def avaliar(self, amostras, taxa=TAXA, comparar=True):
+        """Devolve (provavel, distancia) para um trecho de áudio
+
+        Com ``comparar=False`` só a detecção de voz é aplicada (qualquer
+        frase falada passa).
+        """
+        amostras = reamostrar(amostras, taxa)
+        trecho = detectar_voz(amostras)
+        if trecho is None:
+            return False, float("inf")
+        duracao = (trecho[1] - trecho[0]) / TAXA
+        if not self.referencias or not comparar:
+            # Sem referências gravadas, o filtro é só a detecção de voz
+            return DURACAO_MINIMA <= duracao <= DURACAO_MAXIMA, 0.0
+        if duracao < DURACAO_MINIMA:
+            return False, float("inf")
+        consulta = mfcc(amostras[trecho[0]:trecho[1]])
+        distancia = min(distancia_dtw(r, consulta) for r in self.referencias)
+        return distancia <= self.limiar, distancia
+
+    def avaliar_wav(self, caminho):
+        """Avalia um arquivo WAV (útil para testar com gravações)"""
+        amostras, taxa = carregar_wav(caminho)
+        return self.avaliar(amostras, taxa)
+
+    def avaliar_audio(self, audio, comparar=True):
+        """Avalia um ``speech_recognition.AudioData``"""
+        dados = audio.get_raw_data(convert_rate=TAXA, convert_width=2)
+        return self.avaliar(np.frombuffer(dados, dtype="<i2"), TAXA, comparar)
+
+
+def gravar_referencia(caminho, duracao=3):
+    """Grava a frase de ativação do microfone em um WAV de 16 kHz"""
+    import speech_recognition as sr
+
+    recognizer = sr.Recognizer()
+    with sr.Microphone() as source:
+        recognizer.adjust_for_ambient_noise(source, duration=1)
+        print("Diga \"bom dia\"...")
+        audio = recognizer.listen(source, phrase_time_limit=duracao)
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    with open(caminho, "wb") as f:
+        f.write(audio.get_wav_data(convert_rate=TAXA, convert_width=2))
+    print(f"Referência salva em {caminho}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "gravar":
+        gravar_referencia(sys.argv[2])
+    else:
+        print("Uso: python palavra_chave.py gravar <arquivo.wav>")
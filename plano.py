@@ -0,0 +1,97 @@
+"""Plano da rotina do bom dia (``plano.json``), gerado pelo web app.
+
+Antes, o web app gerava o código do ``bom_dia.py`` de cada usuário a partir
+de um template, e a rotina ainda sondava o ambiente a cada execução
+(``LOGIN_<SISTEMA>`` de cada sistema conhecido, ``URL_CUSTOM_0``,
+``URL_CUSTOM_1``... até faltar um). Agora o pacote traz um plano com os
+passos já resolvidos, na ordem::
+
+    {"versao": 1,
+     "passos": [
+       {"tipo": "site", "nome": "TJ_AL", "url": "https://...",
+        "login": "LOGIN_TJ_AL", "senha": "SENHA_TJ_AL", "titulo": "e-SAJ"},
+       {"tipo": "imagens", "nome": "SOLAR",
+        "acoes": [{"imagem": "menu.png", "acao": "..."}]}
+     ]}
+
+``login`` e ``senha`` são os nomes das variáveis do .env: as credenciais
+não vão no plano. ``titulo`` (opcional) é um trecho do título da página,
+para reconhecer a aba quando o título não tem o nome nem o endereço. Se a pasta ``imagens`` tiver ``campo_login_<nome>.png``
+(um recorte do campo de login do site), a rotina espera esse campo
+aparecer na tela antes de digitar. O ``bom_dia.py`` e o listener são fixos e só leem o
+plano; gerar o pacote de novo é só regravar este arquivo.
+"""
+import json
+import os
+from itertools import groupby
+
+from rotina import Site, executar_acoes_imagens, executar_rotina
+
+VERSAO_PLANO = 1
+ARQUIVO_PLANO = "plano.json"
+# Recorte do campo de login de um site, procurado na pasta imagens
+MODELO_CAMPO_LOGIN = "campo_login_{}.png"
+
+
+def carregar(caminho):
+    """Lê e confere o plano; levanta ``ValueError`` se a versão não for a esperada"""
+    with open(caminho, encoding="utf-8") as f:
+        plano = json.load(f)
+    if plano.get("versao") != VERSAO_PLANO:
+        raise ValueError(
+            f"{caminho}: versão {plano.get('versao')} do plano não suportada "
+            f"(esperada {VERSAO_PLANO}); gere o pacote de novo"
+        )
+    return plano
+
+
+def sistemas(plano):
+    """(nome, url) de cada site do plano, para os comandos "abrir <sistema>" """
+    return [(p["nome"], p["url"]) for p in plano["passos"] if p["tipo"] == "site"]
+
+
+def site(passo, getenv=os.getenv, pasta=None):
+    """Site do passo com as credenciais lidas do ambiente"""
+    campo = None
+    if pasta is not None:
+        campo = os.path.join(pasta, "imagens", MODELO_CAMPO_LOGIN.format(passo["nome"]))
+        if not os.path.exists(campo):
+            campo = None
+    return Site(
+        passo["nome"], passo["url"],
+        getenv(passo["login"]) if passo.get("login") else None,
+        getenv(passo["senha"]) if passo.get("senha") else None,
+        campo,
+        passo.get("titulo"),
+    )
+
+
+def sites_com_credenciais(passos, getenv=os.getenv, pasta=None):
+    """Sites dos passos que têm login ou senha no .env (os únicos que a rotina abre)"""
+    return [s for s in (site(p, getenv, pasta) for p in passos if p["tipo"] == "site") if s.login or s.senha]
+
+
+def executar(plano, pasta, getenv=os.getenv):
+    """Roda os passos na ordem; passos seguidos do mesmo tipo vão juntos
+
+    Os sites seguidos abrem todos de uma vez (``rotina.executar_rotina``) e
+    as ações de imagem seguidas compartilham os modelos carregados.
+    """
+    for tipo, passos in groupby(plano["passos"], key=lambda p: p["tipo"]):
+        if tipo == "site":
+            # Como antes: só entram os sites com login ou senha no .env
+            executar_rotina(sites_com_credenciais(passos, getenv, pasta))
+        elif tipo == "imagens":
+            acoes = [(p["nome"], p["acoes"]) for p in passos]
+            executar_acoes_imagens(acoes, os.path.join(pasta, "imagens"))
+        else:
+            print(f"Passo do tipo '{tipo}' desconhecido; ignorado")
+
+
+def abrir_sistema(plano, nome, getenv=os.getenv, pasta=None):
+    """Abre um único site do plano (comando "abrir <sistema>")"""
+    for passo in plano["passos"]:
+        if passo["tipo"] == "site" and passo["nome"] == nome:
+            executar_rotina([site(passo, getenv, pasta)])
+            return True
+    return False
@@ -0,0 +1,280 @@
+"""Pré-aquecimento: abre os sites no navegador antes do "bom dia".
+
+Sem ele, todo o carregamento das páginas começa só depois do gatilho de
+voz. Com ``PREAQUECIMENTO`` no .env, o listener abre os sites do plano no
+início de uma janela de horário dos dias úteis; quando o "bom dia" chega,
+a rotina só traz o navegador para a frente e preenche os logins
+(``rotina.marcar_preabertos``).
+
+- ``PREAQUECIMENTO=08:00-08:30``: janela fixa;
+- ``PREAQUECIMENTO=auto``: janela aprendida com os horários dos últimos
+  gatilhos (``gatilhos.json``, ao lado do listener): do percentil 10 menos
+  10 minutos ao percentil 90, a partir de 5 gatilhos em dias úteis;
+- vazio ou ``0``: desligado.
+
+As abas abertas valem até 30 minutos depois do fim da janela e só se a
+janela em primeiro plano depois de abrir for mesmo a do navegador e ele
+puder ser trazido de volta para a frente (pygetwindow no Windows,
+``xdotool`` no Linux); fora disso a rotina abre os sites como sempre. No
+"bom dia", a rotina confere as abas e abre de novo os sites que não
+estiverem mais lá. Com ``ISOLAR_ROTINA=1`` (rotina em outro processo) o
+pré-aquecimento não é aproveitado.
+
+No listener, a abertura roda pelo ``despachar`` do ``ExecutorRotina``, na
+mesma thread dos comandos de voz: um "bom dia" ou "abrir ..." nunca digita
+enquanto o pré-aquecimento abre as abas e espera o navegador (e vice-versa).
+Se a thread estiver ocupada, tenta de novo na próxima verificação.
+
+``PREAQUECIMENTO_SIMULADO=1`` liga o modo de ensaio: o listener só avisa
+quando e o que abriria, sem abrir nada.
+
+Ver a janela em uso, ou ensaiar agora com os sites do plano:
+
+    python preaquecimento.py janela [pasta]
+    python preaquecimento.py simular [pasta]
+"""
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from navegador import ativar_janela, janela_ativa, janela_do_navegador
+from rastreamento import fase, percentil
+
+ARQUIVO_GATILHOS = "gatilhos.json"
+# Gatilhos guardados e considerados no aprendizado
+MAXIMO_GATILHOS = 60
+DIAS_HISTORICO = 30
+MINIMO_AMOSTRAS = 5
+# Antecedência (s) da janela aprendida em relação ao gatilho mais cedo típico
+MARGEM_APRENDIDA = 10 * 60
+# Tempo (s) depois do fim da janela em que as abas abertas ainda valem
+VALIDADE = 30 * 60
+# Segunda a sexta
+DIAS_UTEIS = range(5)
+INTERVALO_VERIFICACAO = 30
+# Tempo (s) para o navegador aparecer na frente antes de guardar a janela,
+# conferida a cada PASSO_JANELA s
+ESPERA_JANELA = 3
+PASSO_JANELA = 0.25
+
+
+def ler_janela(texto):
+    """'08:00-08:30' -> (28800, 30600), em segundos desde a meia-noite"""
+    def segundos(hora):
+        h, m = hora.strip().split(":")
+        return int(h) * 3600 + int(m) * 60
+
+    inicio, _, fim = texto.partition("-")
+    try:
+        janela = segundos(inicio), segundos(fim)
+    except ValueError:
+        raise ValueError(f"Janela de pré-aquecimento inválida: {texto!r} (use HH:MM-HH:MM)") from None
+    if janela[0] >= janela[1]:
+        raise ValueError(f"Janela de pré-aquecimento inválida: {texto!r} (início depois do fim)")
+    return janela
+
+
+def segundos_do_dia(momento):
+    return momento.hour * 3600 + momento.minute * 60 + momento.second
+
+
+def formatar(segundos):
+    return f"{int(segundos) // 3600:02d}:{int(segundos) % 3600 // 60:02d}"
+
+
+def aprender_janela(gatilhos, agora):
+    """Janela (início, fim) aprendida com os gatilhos recentes em dias úteis, ou None"""
+    horarios = sorted(
+        segundos_do_dia(datetime.fromtimestamp(t)) for t in gatilhos
+        if agora - t <= DIAS_HISTORICO * 86400 and datetime.fromtimestamp(t).weekday() in DIAS_UTEIS
+    )
+    if len(horarios) < MINIMO_AMOSTRAS:
+        return None
+    return max(percentil(horarios, 10) - MARGEM_APRENDIDA, 0), percentil(horarios, 90)
+
+
+# --- agendador -------------------------------------------------------------
+
+class Preaquecedor:
+    """Abre os sites uma vez por dia útil, no início da janela
+
+    Com ``simular=True`` só avisa o que abriria. ``despachar(funcao)``
+    (opcional) roda a abertura na thread de trabalho e devolve False se ela
+    estiver ocupada; sem ele, abre na thread de quem chamou ``verificar``.
+    """
+
+    def __init__(self, urls, janela=None, aprender=False, pasta=".", abrir=None,
+                 capturar_janela=janela_ativa, ativar=ativar_janela, relogio=time.time,
+                 do_navegador=janela_do_navegador, simular=False, despachar=None):
+        self.urls = urls
+        self.janela_fixa = janela
+        self.aprender = aprender
+        self.simular = simular
+        self.arquivo = os.path.join(pasta, ARQUIVO_GATILHOS)
+        self._abrir = abrir
+        self._capturar_janela = capturar_janela
+        self._ativar = ativar
+        self._do_navegador = do_navegador
+        self._relogio = relogio
+        self._despachar = despachar
+        self._feito_em = None
+        self._parar = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def do_ambiente(cls, urls, pasta=".", getenv=os.getenv, **kwargs):
+        """Preaquecedor configurado por ``PREAQUECIMENTO``, ou None se desligado"""
+        valor = (getenv("PREAQUECIMENTO") or "").strip().lower()
+        if valor in ("", "0"):
+            return None
+        kwargs.setdefault("simular", getenv("PREAQUECIMENTO_SIMULADO", "0") == "1")
+        if valor == "auto":
+            return cls(urls, aprender=True, pasta=pasta, **kwargs)
+        return cls(urls, janela=ler_janela(valor), pasta=pasta, **kwargs)
+
+    # --- histórico ---------------------------------------------------------
+
+    def gatilhos(self):
+        try:
+            with open(self.arquivo, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return []
+
+    def registrar_gatilho(self):
+        """Guarda o horário de um "bom dia" (usado para aprender a janela)"""
+        gatilhos = (self.gatilhos() + [self._relogio()])[-MAXIMO_GATILHOS:]
+        temporario = self.arquivo + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(gatilhos, f)
+        os.replace(temporario, self.arquivo)
+
+    # --- decisão -----------------------------------------------------------
+
+    def janela(self):
+        """(início, fim) em segundos do dia, ou None se ainda não há janela"""
+        if self.aprender:
+            return aprender_janela(self.gatilhos(), self._relogio())
+        return self.janela_fixa
+
+    def devido(self):
+        """True se agora está na janela, num dia útil, e nada foi aberto hoje"""
+        momento = datetime.fromtimestamp(self._relogio())
+        janela = self.janela()
+        if janela is None or momento.weekday() not in DIAS_UTEIS or self._feito_em == momento.date():
+            return False
+        # O "bom dia" já veio hoje antes da janela: não há o que adiantar
+        if any(datetime.fromtimestamp(t).date() == momento.date() for t in self.gatilhos()[-3:]):
+            return False
+        return janela[0] <= segundos_do_dia(momento) < janela[1]
+
+    def preaquecer(self):
+        """Abre os sites agora e avisa a rotina; devolve as URLs abertas"""
+        import rotina
+        from navegador import abrir_urls
+
+        agora = self._relogio()
+        momento = datetime.fromtimestamp(agora)
+        self._feito_em = momento.date()
+        urls = list(self.urls())
+        if not urls:
+            return []
+        if self.simular:
+            print(f"Pré-aquecimento simulado às {momento:%H:%M}: abriria {', '.join(urls)}")
+            return urls
+        print(f"Pré-aquecimento: abrindo {len(urls)} site(s)")
+        with fase("preaquecimento", quantidade=len(urls)):
+            (self._abrir or abrir_urls)(urls)
+        navegador = self._janela_navegador()
+        if navegador is None:
+            # O teclado do "bom dia" iria para outra janela: a rotina abre tudo de novo
+            print("Pré-aquecimento: a janela em primeiro plano não é a do navegador; abas não aproveitadas")
+            return urls
+        janela = self.janela() or (0, 0)
+        validade = max(janela[1] - segundos_do_dia(momento), 0) + VALIDADE
+        rotina.marcar_preabertos(urls, validade, lambda: self._ativar(navegador))
+        return urls
+
+    def _janela_navegador(self):
+        """Janela do navegador em primeiro plano (espera até ESPERA_JANELA s), ou None"""
+        for _ in range(max(1, round(ESPERA_JANELA / PASSO_JANELA))):
+            self._parar.wait(PASSO_JANELA)
+            janela = self._capturar_janela()
+            if janela is not None and self._do_navegador(janela):
+                return janela
+        return None
+
+    def verificar(self):
+        """Pré-aquece se for a hora; devolve True se abriu, simulou ou despachou"""
+        if not self.devido():
+            return False
+        if self._despachar is None:
+            self.preaquecer()
+            return True
+        # Com a thread ocupada, fica para a próxima verificação
+        return self._despachar(self.preaquecer)
+
+    # --- laço do listener ----------------------------------------------------
+
+    def iniciar(self):
+        """Verifica a janela periodicamente numa thread em segundo plano"""
+        self._thread = threading.Thread(target=self._laco, daemon=True)
+        self._thread.start()
+        return self
+
+    def _laco(self):
+        while not self._parar.is_set():
+            try:
+                self.verificar()
+            except Exception as e:
+                print(f"Erro no pré-aquecimento: {e}")
+            self._parar.wait(INTERVALO_VERIFICACAO)
+
+    def parar(self):
+        self._parar.set()
+
+
+def urls_do_plano(pasta):
+    """URLs que o listener pré-aqueceria (sites do plano com login no .env)"""
+    import plano
+
+    caminho = os.path.join(pasta, plano.ARQUIVO_PLANO)
+    if not os.path.exists(caminho):
+        return []
+    return [site.url for site in plano.sites_com_credenciais(plano.carregar(caminho)["passos"])]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in ("janela", "simular"):
+        print(__doc__)
+        return 1
+    pasta = argv[1] if len(argv) > 1 else "."
+    from dotenv import load_dotenv
+
+    load_dotenv(os.path.join(pasta, ".env"))
+    simular = argv[0] == "simular"
+    preaquecedor = Preaquecedor.do_ambiente(lambda: urls_do_plano(pasta), pasta, simular=simular)
+    if preaquecedor is None:
+        print("Pré-aquecimento desligado (defina PREAQUECIMENTO no .env)")
+        return 0
+    janela = preaquecedor.janela()
+    origem = "aprendida" if preaquecedor.aprender else "configurada"
+    if janela is None:
+        print(f"Ainda sem janela: {len(preaquecedor.gatilhos())} gatilho(s) registrados, "
+              f"são necessários {MINIMO_AMOSTRAS} em dias úteis")
+    else:
+        print(f"Janela {origem}: {formatar(janela[0])}-{formatar(janela[1])} (dias úteis)")
+    if simular:
+        if not preaquecedor.verificar():
+            print("Agora não é hora de pré-aquecer (fora da janela, fim de semana ou \"bom dia\" já dito hoje)")
+        elif not urls_do_plano(pasta):
+            print(f"Nenhum site do plano tem login no .env ({pasta}); nada seria aberto")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
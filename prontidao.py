@@ -0,0 +1,108 @@
+"""Detecção de prontidão da página depois de abrir um site.
+
+Em vez de dormir um tempo fixo após o ``webbrowser.open``, observa a tela e
+segue assim que a nova janela/aba aparece e para de mudar, ou, quando há
+uma imagem do campo de login, só quando o campo aparece (uma página pode
+parar de mudar antes de o formulário de login ser desenhado). A fonte de
+tela, o relógio e a espera são injetáveis, então o comportamento pode ser
+exercitado com uma tela falsa.
+"""
+import os
+from time import monotonic, sleep
+
+# Tempo máximo (s) de espera pela página; configurável pelo .env
+TIMEOUT_PAGINA = float(os.getenv("TIMEOUT_PAGINA", "15"))
+
+# Tamanho da miniatura usada para comparar capturas de tela
+TAMANHO_ASSINATURA = (64, 36)
+
+# Diferença de intensidade (0-255) a partir da qual um pixel conta como mudado
+LIMIAR_PIXEL = 8
+
+
+def assinatura_tela():
+    """Captura a tela e devolve uma miniatura em tons de cinza (bytes)"""
+    import pyautogui
+
+    imagem = pyautogui.screenshot()
+    return imagem.convert("L").resize(TAMANHO_ASSINATURA).tobytes()
+
+
+def diferenca(a, b):
+    """Fração (0 a 1) da tela que mudou entre duas assinaturas"""
+    if a is None or b is None:
+        return 0.0 if a is b else 1.0
+    if isinstance(a, (bytes, bytearray)) and isinstance(b, (bytes, bytearray)):
+        if len(a) != len(b) or not a:
+            return 1.0
+        mudados = sum(1 for x, y in zip(a, b) if abs(x - y) > LIMIAR_PIXEL)
+        return mudados / len(a)
+    return 0.0 if a == b else 1.0
+
+
+def aguardar_pronto(
+    fonte=None,
+    referencia=None,
+    pronto=None,
+    timeout=None,
+    estavel=0.3,
+    intervalo=0.1,
+    tolerancia=0.01,
+    relogio=monotonic,
+    dormir=sleep,
+):
+    """Aguarda até a tela ficar pronta; devolve True se pronta, False no timeout
+
+    - ``fonte``: função que devolve a assinatura atual da tela.
+    - ``referencia``: assinatura tirada antes de abrir o site; a tela só é
+      considerada pronta depois de diferir dela (nova janela/aba).
+    - ``pronto``: função opcional que devolve True quando o alvo (ex.: campo
+      de login) já está visível; com ela, a tela parar de mudar não basta.
+    - ``estavel``: tempo (s) sem mudanças para considerar a página carregada.
+    """
+    fonte = fonte or assinatura_tela
+    timeout = TIMEOUT_PAGINA if timeout is None else timeout
+    limite = relogio() + timeout
+    mudou = referencia is None
+    anterior = None
+    estavel_desde = None
+
+    while True:
+        if pronto is not None:
+            if pronto():
+                return True
+            if relogio() >= limite:
+                return False
+            dormir(intervalo)
+            continue
+
+        atual = fonte()
+        agora = relogio()
+        if not mudou and diferenca(atual, referencia) > tolerancia:
+            mudou = True
+
+        if mudou:
+            if anterior is not None and diferenca(atual, anterior) <= tolerancia:
+                if estavel_desde is None:
+                    estavel_desde = agora
+                if agora - estavel_desde >= estavel:
+                    return True
+            else:
+                estavel_desde = None
+        anterior = atual
+
+        if agora >= limite:
+            return False
+        dormir(intervalo)
+
+
+def localizador_imagem(caminho_imagem, motor, captura):
+    """Verificação de prontidão que procura uma imagem na tela
+
+    ``motor`` e ``captura`` são os mesmos do modo "Clique em imagem(s)"
+    (``correspondencia.MotorCorrespondencia`` e ``captura_tela.CapturaTela``),
+    com o modelo da imagem preparado uma vez só.
+    """
+    def visivel():
+        return captura.localizar_todos(motor, [caminho_imagem])[caminho_imagem] is not None
+    return visivel
@@ -0,0 +1,175 @@
+"""Medição do tempo de cada fase (calibração, captura, reconhecimento, sites...).
+
+Cada fase vira um registro JSON por linha em ``rastreamento.jsonl``, num
+arquivo rotativo (``RotatingFileHandler``), com nome da fase, início,
+duração e atributos (ex.: o site). Fica desligado por padrão; com
+``RASTREAMENTO=1`` no ambiente/.env passa a gravar. Desligado, ``fase()``
+devolve sempre o mesmo objeto vazio, sem relógio nem alocação.
+
+    with fase("abrir_site", site="GMAIL"):
+        ...
+
+Resumo (p50/p95 por fase) dos arquivos acumulados ao longo dos dias:
+
+    python rastreamento.py resumo [--dias 7] [arquivo]
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import time
+import uuid
+from logging.handlers import RotatingFileHandler
+
+ARQUIVO_RASTREAMENTO = os.getenv(
+    "ARQUIVO_RASTREAMENTO", os.path.join(os.path.dirname(os.path.abspath(__file__)), "rastreamento.jsonl")
+)
+TAMANHO_MAXIMO = 5 * 1024 * 1024
+ARQUIVOS_ANTIGOS = 5
+
+# Identifica as fases de um mesmo processo (uma sessão do ouvinte, um run-once)
+EXECUCAO = uuid.uuid4().hex[:8]
+
+_logger = None
+
+
+def ativo():
+    """True se o rastreamento está ligado (lido do ambiente a cada chamada)"""
+    return os.getenv("RASTREAMENTO", "0") == "1"
+
+
+def _registro():
+    global _logger
+    if _logger is None:
+        logger = logging.getLogger("rastreamento")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        if not logger.handlers:
+            manipulador = RotatingFileHandler(
+                ARQUIVO_RASTREAMENTO, maxBytes=TAMANHO_MAXIMO, backupCount=ARQUIVOS_ANTIGOS, encoding="utf-8"
+            )
+            manipulador.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(manipulador)
+        _logger = logger
+    return _logger
+
+
+class _FaseNula:
+    """Fase que não mede nada (rastreamento desligado)"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def anotar(self, **atributos):
+        pass
+
+
+_NULA = _FaseNula()
+
+
+class _Fase:
+    __slots__ = ("nome", "atributos", "_inicio", "_relogio")
+
+    def __init__(self, nome, atributos):
+        self.nome = nome
+        self.atributos = atributos
+
+    def __enter__(self):
+        self._inicio = time.time()
+        self._relogio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, erro, _tb):
+        duracao = time.perf_counter() - self._relogio
+        registro = {
+            "fase": self.nome,
+            "inicio": round(self._inicio, 3),
+            "duracao": round(duracao, 6),
+            "execucao": EXECUCAO,
+            "pid": os.getpid(),
+        }
+        if self.atributos:
+            registro["atributos"] = self.atributos
+        if tipo is not None:
+            registro["erro"] = tipo.__name__
+        _registro().info(json.dumps(registro, ensure_ascii=False, default=str))
+        return False
+
+    def anotar(self, **atributos):
+        """Acrescenta atributos conhecidos só no meio da fase"""
+        self.atributos.update(atributos)
+
+
+def fase(nome, **atributos):
+    """Context manager que mede uma fase (vazio se o rastreamento está desligado)"""
+    if not ativo():
+        return _NULA
+    return _Fase(nome, atributos)
+
+
+# --- resumo ------------------------------------------------------------
+
+def ler_registros(caminho=ARQUIVO_RASTREAMENTO, desde=None):
+    """Lê o arquivo e os rotacionados (.1, .2, ...), ignorando linhas quebradas"""
+    for arquivo in sorted(glob.glob(glob.escape(caminho) + "*")):
+        with open(arquivo, encoding="utf-8") as f:
+            for linha in f:
+                try:
+                    registro = json.loads(linha)
+                except ValueError:
+                    continue
+                if desde is None or registro.get("inicio", 0) >= desde:
+                    yield registro
+
+
+def percentil(valores, p):
+    """Percentil ``p`` (0-100) por interpolação linear; ``valores`` ordenados"""
+    if not valores:
+        return None
+    posicao = (len(valores) - 1) * p / 100
+    baixo = int(posicao)
+    alto = min(baixo + 1, len(valores) - 1)
+    return valores[baixo] + (valores[alto] - valores[baixo]) * (posicao - baixo)
+
+
+def resumir(registros):
+    """{fase: (quantidade, p50, p95, erros)}"""
+    duracoes = {}
+    erros = {}
+    for registro in registros:
+        nome = registro["fase"]
+        duracoes.setdefault(nome, []).append(registro["duracao"])
+        if "erro" in registro:
+            erros[nome] = erros.get(nome, 0) + 1
+    resumo = {}
+    for nome, valores in duracoes.items():
+        valores.sort()
+        resumo[nome] = (len(valores), percentil(valores, 50), percentil(valores, 95), erros.get(nome, 0))
+    return resumo
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tempos das fases da automação")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+    resumo = subcomandos.add_parser("resumo", help="p50/p95 por fase")
+    resumo.add_argument("arquivo", nargs="?", default=ARQUIVO_RASTREAMENTO)
+    resumo.add_argument("--dias", type=float, help="considera só os últimos N dias")
+    args = parser.parse_args(argv)
+
+    desde = time.time() - args.dias * 86400 if args.dias else None
+    linhas = resumir(ler_registros(args.arquivo, desde))
+    if not linhas:
+        print("Nenhuma fase registrada")
+        return
+    print(f"{'fase':24s} {'qtd':>6s} {'p50 (ms)':>10s} {'p95 (ms)':>10s} {'erros':>6s}")
+    for nome, (quantidade, p50, p95, erros) in sorted(linhas.items()):
+        print(f"{nome:24s} {quantidade:6d} {p50 * 1000:10.1f} {p95 * 1000:10.1f} {erros:6d}")
+
+
+if __name__ == "__main__":
+    main()
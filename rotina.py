@@ -0,0 +1,380 @@
+"""Rotina do bom dia em duas fases.
+
+1. Todos os sites começam a carregar de uma vez.
+2. Um único trabalhador de entrada percorre as abas, espera cada uma ficar
+   pronta, reconhece o site pelo título da janela e digita as credenciais.
+   O foco do teclado é um recurso único, por isso essa fase é sempre serial.
+
+Com isso o tempo total fica perto do carregamento mais lento somado ao tempo
+de digitação, e não da soma de todos os carregamentos.
+"""
+import os
+import re
+import unicodedata
+from collections import namedtuple
+from time import monotonic, sleep
+from urllib.parse import urlparse
+
+from comandos import normalizar
+from prontidao import aguardar_pronto, assinatura_tela, localizador_imagem
+from rastreamento import fase
+
+# ``campo_login``: imagem do campo de login (opcional), esperada antes de digitar;
+# ``titulo``: trecho do título da página que também identifica a aba (opcional)
+Site = namedtuple("Site", ["nome", "url", "login", "senha", "campo_login", "titulo"], defaults=(None, None))
+
+# Motor de busca e captura de tela, criados só quando alguma ação de imagem roda
+_motor = None
+_captura = None
+# Teclado/área de transferência, criado no primeiro login
+_entrada = None
+
+# Chamado uma vez, logo antes da primeira ação de cada execução (usado para
+# medir a latência entre o gatilho de voz e a rotina começar a agir)
+ao_primeira_acao = None
+
+# Palavras de título e endereço que não distinguem um site de outro
+PALAVRAS_COMUNS = {
+    "com", "org", "net", "gov", "jus", "def", "edu", "login", "http", "https",
+    # nomes do próprio navegador, que aparecem no título da janela
+    "google", "chrome", "chromium", "mozilla", "firefox", "microsoft", "edge", "brave", "opera", "vivaldi",
+}
+
+# Sites já abertos pelo pré-aquecimento: (urls, prazo, função que traz a
+# janela do navegador para a frente); vale para uma única execução
+_preabertos = None
+
+
+def sites_configurados(sistemas, getenv=os.getenv):
+    """Monta os sites populares que têm login ou senha no .env"""
+    sites = []
+    for nome, url in sistemas:
+        login = getenv(f"LOGIN_{nome}")
+        senha = getenv(f"SENHA_{nome}")
+        if login or senha:
+            sites.append(Site(nome, url, login, senha))
+    return sites
+
+
+def sites_personalizados(getenv=os.getenv):
+    """Monta os sites personalizados (URL_CUSTOM_0, URL_CUSTOM_1, ...)"""
+    sites = []
+    idx = 0
+    while True:
+        url = getenv(f"URL_CUSTOM_{idx}")
+        if not url:
+            break
+        sites.append(Site(f"CUSTOM_{idx}", url, getenv(f"LOGIN_CUSTOM_{idx}"), getenv(f"SENHA_CUSTOM_{idx}")))
+        idx += 1
+    return sites
+
+
+def entrada():
+    """Backend de teclado compartilhado (``entrada.criar_entrada``)"""
+    global _entrada
+    if _entrada is None:
+        from entrada import criar_entrada
+        _entrada = criar_entrada()
+    return _entrada
+
+
+def preencher_credenciais(login=None, senha=None, nome=None):
+    """Digita login e senha na aba em foco, no ritmo configurado para o sistema"""
+    from entrada import ritmo
+
+    entrada().preencher(login, senha, ritmo(nome))
+    if senha:
+        # O envio segue em segundo plano; a próxima aba não precisa esperá-lo
+        entrada().confirmar()
+
+
+def focar_aba(*teclas):
+    """Envia o atalho de troca de aba para o navegador"""
+    entrada().atalho(*teclas)
+
+
+def abrir_site(url, login=None, senha=None, timeout=None):
+    """Abre um único site e preenche login/senha quando ele estiver pronto"""
+    from navegador import abrir_urls
+
+    with fase("abrir_site", url=url):
+        referencia = assinatura_tela()
+        abrir_urls([url])
+        aguardar_pronto(referencia=referencia, timeout=timeout)
+    with fase("preencher_login", url=url):
+        preencher_credenciais(login, senha)
+
+
+def abrir_sistema(nome, url, getenv=os.getenv):
+    """Abre um único sistema e preenche o login dele, se houver no .env"""
+    executar_rotina([Site(nome, url, getenv(f"LOGIN_{nome}"), getenv(f"SENHA_{nome}"))])
+
+
+def palavras(texto):
+    """Palavras de um título ou endereço que podem identificar um site"""
+    return {
+        p for p in normalizar(texto).split()
+        if len(p) >= 3 and p not in PALAVRAS_COMUNS and not re.fullmatch(r"www\d*", p)
+    }
+
+
+def marcas_sites(sites):
+    """Palavras do nome e do endereço de cada site que nenhum outro site tem"""
+    proprias = [palavras(site.nome) | palavras(urlparse(site.url).hostname or "")
+                for site in sites]
+    return [
+        marcas - set().union(*(outras for j, outras in enumerate(proprias) if j != i))
+        for i, marcas in enumerate(proprias)
+    ]
+
+
+def chave_titulo(nome):
+    """Variável do .env com o título esperado de um site ("Sistema Interno" -> "TITULO_SISTEMA_INTERNO")"""
+    nome = unicodedata.normalize("NFKD", nome)
+    nome = "".join(c for c in nome if not unicodedata.combining(c))
+    return "TITULO_" + re.sub(r"[^A-Z0-9]+", "_", nome.upper()).strip("_")
+
+
+def identificar_aba(titulo, sites, marcas, getenv=os.getenv):
+    """Site a que pertence a aba com esse título de janela, ou None se não for um só
+
+    Além do nome e do endereço, vale o trecho ``Site.titulo`` (do catálogo,
+    para páginas como a do e-SAJ, cujo título não tem nenhum dos dois).
+    ``TITULO_<SISTEMA>`` no .env substitui os dois pelo trecho informado.
+    """
+    if not titulo:
+        return None
+    no_titulo = palavras(titulo)
+    titulo_normalizado = f" {normalizar(titulo)} "
+
+    def contem(trecho):
+        return f" {normalizar(trecho)} " in titulo_normalizado
+
+    candidatos = []
+    for site, marcas_site in zip(sites, marcas):
+        esperado = getenv(chave_titulo(site.nome))
+        if esperado:
+            reconhecido = contem(esperado)
+        else:
+            reconhecido = bool(marcas_site & no_titulo) or bool(site.titulo and contem(site.titulo))
+        if reconhecido:
+            candidatos.append(site)
+    return candidatos[0] if len(candidatos) == 1 else None
+
+
+def preencher_abas(sites, focar=focar_aba, preencher=preencher_credenciais, aguardar=aguardar_pronto,
+                   titulo=None, timeout=None, getenv=os.getenv, conferir=False):
+    """Percorre as últimas ``len(sites)`` abas e preenche o login de cada site reconhecido
+
+    As abas são visitadas da última para a primeira (Ctrl+9, depois
+    Ctrl+PageUp), sem supor em que ordem o navegador as abriu: antes de
+    digitar, o título da janela precisa indicar um único site ainda sem
+    login. Devolve os sites com credenciais cuja aba não foi reconhecida
+    (nada foi digitado para eles).
+
+    Com ``conferir=True`` (abas que não foram abertas agora), procura a aba
+    de todos os sites, com ou sem login, e devolve os que não têm aba, sem
+    avisar: quem chamou decide se abre de novo.
+    """
+    if titulo is None:
+        from navegador import titulo_janela as titulo
+    marcas = marcas_sites(sites)
+    pendentes = [site for site in sites if conferir or site.login or site.senha]
+    for posicao in range(len(sites)):
+        if not pendentes:
+            break
+        if posicao == 0:
+            focar('ctrl', '9')
+        else:
+            focar('ctrl', 'pageup')
+        # A aba pode ter terminado de carregar em segundo plano; nesse caso
+        # a espera termina assim que a tela fica estável
+        with fase("aguardar_aba", posicao=posicao):
+            aguardar(timeout=timeout)
+        texto = titulo()
+        if texto is None:
+            print("Não foi possível ler o título da janela (no Linux, instale o xdotool)")
+            break
+        site = identificar_aba(texto, sites, marcas, getenv)
+        if site is None:
+            print(f"Aba {texto!r} não reconhecida; nenhum login digitado nela")
+            continue
+        if site not in pendentes:
+            continue
+        pendentes.remove(site)
+        if not (site.login or site.senha):
+            continue
+        if site.campo_login:
+            # A página pode parar de mudar antes de o formulário aparecer
+            with fase("aguardar_campo_login", site=site.nome):
+                if not aguardar(pronto=campo_visivel(site.campo_login), timeout=timeout):
+                    print(f"Campo de login de {site.nome} não encontrado na tela; digitando assim mesmo")
+        print(f"Preenchendo login de {site.nome}...")
+        with fase("preencher_login", site=site.nome):
+            preencher(site.login, site.senha, site.nome)
+    if conferir:
+        return pendentes
+    for site in pendentes:
+        print(f"Login de {site.nome} não preenchido: aba não reconhecida pelo título "
+              f"(defina {chave_titulo(site.nome)} no .env com um trecho do título da página)")
+    return pendentes
+
+
+def marcar_preabertos(urls, validade, focar_janela=None):
+    """Avisa que ``urls`` já estão abertas nas últimas abas, em qualquer ordem
+
+    A próxima execução com esses mesmos sites, dentro de ``validade``
+    segundos, depois de ``focar_janela()`` trazer o navegador para a frente,
+    pula a abertura e vai direto às abas; os sites cuja aba não for
+    encontrada são abertos de novo. Execuções com outros sites ("abrir
+    SEI") não mexem nas abas marcadas.
+    """
+    global _preabertos
+    _preabertos = (sorted(urls), monotonic() + validade, focar_janela)
+
+
+def _usar_preabertos(urls):
+    global _preabertos
+    if _preabertos is None:
+        return False
+    abertas, prazo, focar_janela = _preabertos
+    if monotonic() > prazo:
+        _preabertos = None
+        return False
+    if abertas != sorted(urls):
+        return False
+    _preabertos = None
+    # Sem conseguir voltar à janela do navegador, o teclado iria para outro lugar
+    return focar_janela is None or bool(focar_janela())
+
+
+def executar_rotina(sites, abrir=None, focar=focar_aba, preencher=preencher_credenciais,
+                    aguardar=aguardar_pronto, capturar=assinatura_tela, titulo=None, timeout=None):
+    """Abre todos os sites de uma vez e depois preenche as credenciais em série
+
+    Sem ``abrir`` (uma função por URL), as URLs vão todas numa única chamada
+    ao navegador (``navegador.abrir_urls``). Se o pré-aquecimento já abriu
+    esses sites (``marcar_preabertos``), a fase 1 fica só para os que não
+    tiverem mais aba no navegador.
+    """
+    if not sites:
+        return
+
+    primeira_acao = ao_primeira_acao
+    if abrir is None and _usar_preabertos([site.url for site in sites]):
+        if primeira_acao is not None:
+            primeira_acao()
+            primeira_acao = None
+        print(f"{', '.join(site.nome for site in sites)} já abertos pelo pré-aquecimento")
+        # As abas podem ter sido fechadas (ou nem ter aberto) desde então
+        with fase("conferir_abas", quantidade=len(sites)):
+            sites = preencher_abas(sites, focar, preencher, aguardar, titulo, timeout, conferir=True)
+        if not sites:
+            return
+        print(f"{', '.join(site.nome for site in sites)} sem aba aberta; abrindo de novo")
+
+    # Fase 1: dispara todos os carregamentos
+    referencia = capturar()
+    if primeira_acao is not None:
+        primeira_acao()
+    if abrir is None:
+        from navegador import abrir_urls
+
+        print(f"Abrindo {', '.join(site.nome for site in sites)}...")
+        with fase("abrir_sites", quantidade=len(sites)) as f:
+            f.anotar(modo=abrir_urls([site.url for site in sites]))
+    else:
+        for site in sites:
+            print(f"Abrindo {site.nome}...")
+            with fase("abrir_site", site=site.nome):
+                abrir(site.url)
+
+    # Espera a janela/aba nova aparecer antes de mexer no teclado
+    with fase("aguardar_janela"):
+        aguardar(referencia=referencia, timeout=timeout)
+
+    # Fase 2: as abas abertas são as últimas da janela, em qualquer ordem
+    # (abertas uma a uma, as URLs podem chegar trocadas ao navegador)
+    preencher_abas(sites, focar, preencher, aguardar, titulo, timeout)
+
+
+def campo_visivel(caminho):
+    """Verificação de prontidão: a imagem do campo de login está na tela"""
+    return localizador_imagem(caminho, motor_correspondencia(), captura_tela())
+
+
+def motor_correspondencia():
+    """Motor de busca de imagens compartilhado (mantém o cache dos modelos)"""
+    global _motor
+    if _motor is None:
+        from correspondencia import MotorCorrespondencia
+        _motor = MotorCorrespondencia()
+    return _motor
+
+
+def captura_tela():
+    """Camada de captura compartilhada (reaproveita o quadro enquanto a tela não muda)"""
+    global _captura
+    if _captura is None:
+        from captura_tela import CapturaTela
+        _captura = CapturaTela()
+    return _captura
+
+
+def clicar_imagens(caminhos, timeout=10, intervalo=0.25, regioes=None, motor=None, captura=None,
+                   ao_clicar=None):
+    """Clica nas imagens na ordem dada; devolve quantas foram clicadas
+
+    A cada captura, todas as imagens ainda pendentes são buscadas no mesmo
+    quadro; enquanto a tela não muda, os resultados são reaproveitados.
+    """
+    import pyautogui
+
+    motor = motor or motor_correspondencia()
+    captura = captura or captura_tela()
+    origem = captura.area_monitor() or (0, 0)
+    pendentes = list(caminhos)
+    limite = monotonic() + timeout
+    while pendentes:
+        achado = captura.localizar_todos(motor, pendentes, regioes)[pendentes[0]]
+        if achado is None:
+            if monotonic() >= limite:
+                break
+            sleep(intervalo)
+            continue
+        x, y = achado.centro
+        pyautogui.click(x + origem[0], y + origem[1])
+        captura.invalidar()
+        if ao_clicar is not None:
+            ao_clicar(len(caminhos) - len(pendentes))
+        pendentes.pop(0)
+        limite = monotonic() + timeout
+    return len(caminhos) - len(pendentes)
+
+
+def clicar_imagem(caminho, **kwargs):
+    """Espera a imagem aparecer na tela e clica no centro; devolve True se clicou"""
+    return clicar_imagens([caminho], **kwargs) == 1
+
+
+def executar_acoes_imagens(acoes_imagens, pasta_imagens, pasta_modelos=None):
+    """Clica, em ordem, nas imagens configuradas para cada sistema
+
+    Se o pacote trouxer os modelos já compilados (pasta ``modelos`` ao lado
+    de ``imagens``), eles são usados no lugar de preparar cada PNG na hora.
+    """
+    if acoes_imagens:
+        if pasta_modelos is None:
+            pasta_modelos = os.path.join(os.path.dirname(os.path.abspath(pasta_imagens)), "modelos")
+        motor_correspondencia().carregar_compilados(pasta_modelos, pasta_imagens)
+    for sistema, acoes in acoes_imagens:
+        print(f"Executando ações de imagem de {sistema}...")
+        caminhos = [os.path.join(pasta_imagens, acao["imagem"]) for acao in acoes]
+
+        def anunciar(indice):
+            if acoes[indice].get("acao"):
+                print(f"{acoes[indice]['imagem']}: {acoes[indice]['acao']}")
+
+        clicadas = clicar_imagens(caminhos, ao_clicar=anunciar)
+        if clicadas < len(caminhos):
+            print(f"Imagem {acoes[clicadas]['imagem']} não encontrada na tela")
@@ -0,0 +1,17 @@
+from dotenv import dotenv_values
+
+from arquivo_env import atualizar_env
+
+
+def test_reescreve_todas_as_ocorrencias_e_acrescenta_as_novas(tmp_path):
+    caminho = tmp_path / ".env"
+    caminho.write_text("LOGIN_SEI='a'\n# comentário\nOUTRA=1\nLOGIN_SEI='antigo'\n", encoding="utf-8")
+    atualizar_env(caminho, {"LOGIN_SEI": "novo", "SENHA_SEI": "it's"})
+    assert dotenv_values(caminho) == {"LOGIN_SEI": "novo", "OUTRA": "1", "SENHA_SEI": "it's"}
+    assert "# comentário\n" in caminho.read_text(encoding="utf-8")
+
+
+def test_cria_o_arquivo(tmp_path):
+    caminho = tmp_path / ".env"
+    atualizar_env(caminho, {"LOGIN_SEI": "maria"})
+    assert dotenv_values(caminho) == {"LOGIN_SEI": "maria"}
@@ -0,0 +1,22 @@
+import json
+
+import automacao_voz
+import automacao_generica
+import plano
+from gerador_pacote import montar_plano
+
+
+def test_roda_o_plano_da_pasta_sem_sondar_o_ambiente(tmp_path, monkeypatch):
+    dados = montar_plano(["SEI"], [{"nome": "Intranet", "url": "https://intranet.exemplo"}])
+    (tmp_path / "plano.json").write_text(json.dumps(dados), encoding="utf-8")
+    # Variáveis do formato antigo não fazem mais nada
+    monkeypatch.setenv("URL_CUSTOM_5", "https://antigo.exemplo")
+    executados = []
+    monkeypatch.setattr(plano, "executar", lambda p, pasta: executados.append((p, pasta)))
+
+    automacao_voz.executar_uma_vez(str(tmp_path))
+    assert executados == [(dados, str(tmp_path))]
+
+
+def test_automacao_generica_e_a_mesma_entrada():
+    assert automacao_generica.main is automacao_voz.main
@@ -0,0 +1,52 @@
+import cv2
+import numpy as np
+
+from captura_tela import CapturaTela
+from correspondencia import MotorCorrespondencia
+
+
+def test_resultado_do_quadro_depende_do_limiar(tmp_path):
+    tela = np.random.default_rng(3).integers(0, 256, (300, 400), dtype=np.uint8)
+    tela = cv2.GaussianBlur(tela, (5, 5), 0)
+    caminho = str(tmp_path / "botao.png")
+    cv2.imwrite(caminho, cv2.GaussianBlur(tela[100:140, 150:210], (7, 7), 0))
+    captura = CapturaTela(grab=lambda area: tela)
+    motor = MotorCorrespondencia()
+
+    assert captura.localizar_todos(motor, [caminho], limiar=0.999)[caminho] is None
+    achado = captura.localizar_todos(motor, [caminho], limiar=0.5)[caminho]
+    assert (achado.x, achado.y) == (150, 100)
+    assert captura.quadros_novos == 1
+
+
+def test_modelo_so_e_procurado_na_propria_regiao(tmp_path):
+    tela = np.random.default_rng(4).integers(0, 256, (300, 400), dtype=np.uint8)
+    tela = cv2.GaussianBlur(tela, (5, 5), 0)
+    botao = str(tmp_path / "botao.png")
+    cv2.imwrite(botao, tela[200:240, 300:360])
+    logo = str(tmp_path / "logo.png")
+    cv2.imwrite(logo, tela[20:60, 30:90])
+
+    def grab(area):
+        if area is None:
+            return tela
+        x, y, largura, altura = area
+        return tela[y:y + altura, x:x + largura]
+
+    captura = CapturaTela(grab=grab)
+    motor = MotorCorrespondencia()
+    # O logo não tem região, então o quadro é a tela inteira; mesmo assim o
+    # botão, visível fora da região dele, não é achado
+    resultado = captura.localizar_todos(motor, [botao, logo], {botao: (0, 0, 200, 150)})
+    assert resultado[botao] is None
+    assert (resultado[logo].x, resultado[logo].y) == (30, 20)
+
+    achado = captura.localizar_todos(motor, [botao, logo], {botao: (250, 180, 150, 120)})[botao]
+    assert (achado.x, achado.y) == (300, 200)
+    assert captura.quadros_novos == 1
+
+    # Todos com região: só a área que cobre as regiões é capturada
+    regioes = {botao: (250, 180, 150, 120), logo: (0, 0, 120, 100)}
+    resultado = captura.localizar_todos(motor, [botao, logo], regioes)
+    assert (resultado[botao].x, resultado[botao].y) == (300, 200)
+    assert (resultado[logo].x, resultado[logo].y) == (30, 20)
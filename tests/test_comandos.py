@@ -0,0 +1,32 @@
+import threading
+
+from comandos import comandos_padrao
+from executor_rotina import ExecutorRotina
+
+SISTEMAS = [("GMAIL", "https://mail.google.com"), ("SEI", "https://sei.al.gov.br")]
+
+
+def test_um_comando_por_frase():
+    registro = comandos_padrao(lambda: None, SISTEMAS, lambda nome, url: None)
+    assert registro.melhor("abre o g mail").comando.nome == "abrir GMAIL"
+    assert registro.melhor("bom dia, abrir SEI").comando.nome == "bom dia"
+    assert registro.melhor("boa tarde") is None
+
+
+def test_abrir_passa_pela_thread_da_rotina(tmp_path):
+    liberar = threading.Event()
+    abertos = []
+    executor = ExecutorRotina(str(tmp_path / "bom_dia.py"))
+    registro = comandos_padrao(lambda: executor.despachar(liberar.wait), SISTEMAS,
+                               lambda nome, url: abertos.append(nome), despachar=executor.despachar)
+
+    registro.executar("bom dia")
+    # Com a rotina em andamento, o "abrir" não roda junto
+    registro.executar("abrir SEI")
+    liberar.set()
+    executor.aguardar(1)
+    assert abertos == []
+
+    registro.executar("abrir SEI")
+    executor.aguardar(1)
+    assert abertos == ["SEI"]
@@ -0,0 +1,52 @@
+import gc
+
+import cv2
+import numpy as np
+
+from correspondencia import MotorCorrespondencia
+
+
+def tela_com(modelo, x, y, escala=1.0, semente=1):
+    tela = np.random.default_rng(semente).integers(0, 256, (400, 600), dtype=np.uint8)
+    tela = cv2.GaussianBlur(tela, (5, 5), 0)
+    if escala != 1.0:
+        modelo = cv2.resize(modelo, None, fx=escala, fy=escala, interpolation=cv2.INTER_LINEAR)
+    altura, largura = modelo.shape
+    tela[y:y + altura, x:x + largura] = modelo
+    return tela
+
+
+def botao():
+    modelo = np.full((40, 60), 200, dtype=np.uint8)
+    cv2.rectangle(modelo, (3, 3), (56, 36), 30, 2)
+    cv2.putText(modelo, "OK", (14, 28), cv2.FONT_HERSHEY_SIMPLEX, 0.8, 0, 2)
+    return modelo
+
+
+def test_localiza_na_posicao_e_escala():
+    motor = MotorCorrespondencia()
+    achado = motor.localizar(tela_com(botao(), 250, 120), botao())
+    assert (achado.x, achado.y, achado.escala) == (250, 120, 1.0)
+
+    achado = motor.localizar(tela_com(botao(), 100, 300, escala=1.25), botao())
+    assert achado.escala == 1.25
+    assert abs(achado.x - 100) <= 2 and abs(achado.y - 300) <= 2
+
+
+def test_regiao_devolve_coordenadas_da_tela_inteira():
+    achado = MotorCorrespondencia().localizar(tela_com(botao(), 250, 120), botao(), regiao=(200, 100, 200, 100))
+    assert (achado.x, achado.y) == (250, 120)
+
+
+def test_modelo_de_uma_cor_so_nao_e_encontrado():
+    liso = np.full((20, 30), 128, dtype=np.uint8)
+    assert MotorCorrespondencia().localizar(tela_com(liso, 50, 50), liso) is None
+
+
+def test_cache_acompanha_o_objeto_e_nao_o_id():
+    motor = MotorCorrespondencia()
+    modelo = botao()
+    assert motor.modelo(modelo) is motor.modelo(modelo)
+    del modelo
+    gc.collect()
+    assert motor._objetos == {}
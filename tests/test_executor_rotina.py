@@ -0,0 +1,14 @@
+from dotenv import load_dotenv
+
+from executor_rotina import ExecutorRotina
+
+
+def test_isolar_rotina_vem_do_env_carregado_depois_do_import(tmp_path, monkeypatch):
+    monkeypatch.setenv("ISOLAR_ROTINA", "0")
+    assert not ExecutorRotina(str(tmp_path / "bom_dia.py")).isolar
+
+    monkeypatch.delenv("ISOLAR_ROTINA")
+    (tmp_path / ".env").write_text("ISOLAR_ROTINA=1\n", encoding="utf-8")
+    load_dotenv(tmp_path / ".env")
+    assert ExecutorRotina(str(tmp_path / "bom_dia.py")).isolar
+    assert not ExecutorRotina(str(tmp_path / "bom_dia.py"), isolar=False).isolar
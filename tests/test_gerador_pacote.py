@@ -0,0 +1,20 @@
+import ast
+
+from gerador_pacote import criar_arquivo_listener
+
+
+def test_listener_carrega_o_env_antes_dos_modulos(tmp_path):
+    criar_arquivo_listener(tmp_path)
+    arvore = ast.parse((tmp_path / "voz_listener.py").read_text(encoding="utf-8"))
+    ordem = []
+    for no in arvore.body:
+        if isinstance(no, ast.ImportFrom):
+            ordem.append(no.module)
+        elif isinstance(no, ast.Import):
+            ordem += [alias.name for alias in no.names]
+        elif isinstance(no, ast.Expr) and isinstance(no.value, ast.Call):
+            ordem.append(getattr(no.value.func, "id", None))
+    carregar = ordem.index("load_dotenv")
+    for modulo in ("palavra_chave", "executor_rotina", "prontidao", "plano", "comandos", "captura_audio"):
+        if modulo in ordem:
+            assert ordem.index(modulo) > carregar, modulo
@@ -0,0 +1,47 @@
+from lote import ler_usuarios, main, nomes_repetidos
+
+
+def test_csv_com_ponto_e_virgula(tmp_path):
+    caminho = tmp_path / "usuarios.csv"
+    caminho.write_text("nome;email;sistemas\nmaria;maria@exemplo.gov.br;GMail|SEI\n", encoding="utf-8")
+    assert ler_usuarios(caminho) == [{
+        "nome": "maria", "email": "maria@exemplo.gov.br", "sistemas": ["GMail", "SEI"], "sistemas_custom": [],
+    }]
+
+
+def test_csv_sem_separador_para_adivinhar(tmp_path):
+    caminho = tmp_path / "usuarios.csv"
+    caminho.write_text("nome\nmaria\njoao\n", encoding="utf-8")
+    assert [u["nome"] for u in ler_usuarios(caminho)] == ["maria", "joao"]
+
+
+def test_nomes_repetidos_sao_recusados_antes_do_pool(tmp_path, capsys):
+    usuarios = [{"nome": "Maria"}, {"nome": "joao"}, {"nome": "maria "}, {"nome": ""}]
+    assert nomes_repetidos(usuarios) == {"maria"}
+
+    caminho = tmp_path / "usuarios.csv"
+    caminho.write_text("nome,email\nmaria,a@x\nMaria,b@x\n", encoding="utf-8")
+    assert main([str(caminho), "--saida", str(tmp_path / "zip"), "--pastas", str(tmp_path / "u")]) == 1
+    assert "Gerando 0 pacote(s)" in capsys.readouterr().out
+    assert not any((tmp_path / "u").iterdir())
+
+
+def test_nome_nao_sai_da_pasta_de_saida():
+    from lote import nome_pasta
+
+    assert nome_pasta("../x") == "x"
+    assert nome_pasta("José da Silva/RH") == "Jose_da_Silva_RH"
+    assert nome_pasta("..") == ""
+    assert nomes_repetidos([{"nome": "José Silva"}, {"nome": "jose/silva"}]) == {"jose_silva"}
+
+
+def test_pacotes_em_paralelo_com_cache_proprio(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    caminho = tmp_path / "usuarios.csv"
+    caminho.write_text("nome,email,sistemas\n../maria,a@x,GMail\njoao/rh,b@x,SEI\n", encoding="utf-8")
+    saida, pastas = tmp_path / "zip", tmp_path / "u"
+    assert main([str(caminho), "--saida", str(saida), "--pastas", str(pastas), "--processos", "2"]) == 0
+    assert sorted(p.name for p in saida.iterdir()) == ["joao_rh_automacao.zip", "maria_automacao.zip"]
+    assert sorted(p.name for p in pastas.iterdir()) == ["joao_rh", "maria"]
+    # Nada fica no cache compartilhado
+    assert not (tmp_path / ".cache_pacotes").exists()
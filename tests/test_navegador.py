@@ -0,0 +1,80 @@
+import json
+import os
+import stat
+import sys
+import webbrowser
+
+import navegador
+from navegador import abrir_urls, comando_lote, controlador
+
+URLS = ["https://sei.al.gov.br", "https://mail.google.com", "https://www2.tjal.jus.br"]
+
+SCRIPT = """#!{python}
+import json, sys
+with open({registro!r}, "a") as f:
+    f.write(json.dumps(sys.argv[1:]) + "\\n")
+sys.exit({saida})
+"""
+
+
+def navegador_falso(pasta, saida=0):
+    """Script que anota os argumentos de cada chamada; devolve (caminho, chamadas)"""
+    registro = os.path.join(pasta, "chamadas.jsonl")
+    caminho = os.path.join(pasta, "navegador_falso")
+    with open(caminho, "w") as f:
+        f.write(SCRIPT.format(python=sys.executable, registro=registro, saida=saida))
+    os.chmod(caminho, os.stat(caminho).st_mode | stat.S_IEXEC)
+
+    def chamadas():
+        if not os.path.exists(registro):
+            return []
+        with open(registro) as f:
+            return [json.loads(linha) for linha in f]
+    return caminho, chamadas
+
+
+class Anotador(webbrowser.GenericBrowser):
+    """Navegador por linha de comando que anota o que ``open`` recebeu"""
+
+    def __init__(self, comando):
+        super().__init__(comando)
+        self.abertas = []
+
+    def open(self, url, new=0, autoraise=True):
+        self.abertas.append(url)
+        return True
+
+
+def test_comando_lote_por_tipo_de_navegador():
+    assert comando_lote(webbrowser.Mozilla("firefox"), URLS[:2]) == [
+        "firefox", "-new-tab", URLS[0], "-new-tab", URLS[1]]
+    assert comando_lote(webbrowser.Chrome("google-chrome"), URLS[:2]) == ["google-chrome"] + URLS[:2]
+    assert comando_lote(webbrowser.GenericBrowser(["nav", "--janela", "%s", "-v"]), URLS[:2]) == [
+        "nav", "--janela"] + URLS[:2] + ["-v"]
+    assert comando_lote(webbrowser.GenericBrowser(["nav", "%s", "%s"]), URLS) is None
+
+
+def test_abre_todas_numa_chamada_pelo_navegador_registrado(tmp_path, monkeypatch):
+    caminho, chamadas = navegador_falso(str(tmp_path))
+    webbrowser.register("falso", None, webbrowser.GenericBrowser([caminho, "%s"]))
+    monkeypatch.setenv("NAVEGADOR", "falso")
+
+    assert abrir_urls(URLS, controlador()) == "lote"
+    assert chamadas() == [URLS]
+
+
+def test_volta_para_uma_por_vez_se_a_chamada_falhar(tmp_path, monkeypatch):
+    monkeypatch.setattr(navegador, "ESPERA_CONFIRMACAO", 5)
+    caminho, chamadas = navegador_falso(str(tmp_path), saida=1)
+    falso = Anotador([caminho, "%s"])
+
+    assert abrir_urls(URLS, falso) == "individual"
+    assert chamadas() == [URLS]
+    assert falso.abertas == URLS
+
+
+def test_uma_url_so_nao_usa_o_lote(tmp_path):
+    falso = Anotador(["nao-existe", "%s"])
+    assert abrir_urls(URLS[:1], falso) == "individual"
+    assert falso.abertas == URLS[:1]
+    assert abrir_urls([], falso) is None
@@ -0,0 +1,62 @@
+import io
+
+import numpy as np
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+
+from normalizacao_imagens import normalizar_png
+
+
+def png(imagem, **opcoes):
+    saida = io.BytesIO()
+    imagem.save(saida, "PNG", **opcoes)
+    saida.seek(0)
+    return saida
+
+
+def ruido(largura, altura):
+    pixels = np.random.default_rng(0).integers(0, 256, (altura, largura, 3), dtype=np.uint8)
+    return Image.fromarray(pixels)
+
+
+def test_recorta_as_bordas_uniformes():
+    imagem = Image.new("RGB", (800, 600), "white")
+    imagem.paste(ruido(40, 30), (50, 30))
+    saida, info = normalizar_png(png(imagem, dpi=(144, 144)))
+    assert Image.open(saida).size == (44, 34)
+    assert info["recorte"] == [48, 28, 92, 62]
+    assert info["escala"] == 1.5
+    assert info["bytes_final"] < info["bytes_original"]
+
+
+def test_sem_ganho_guarda_a_imagem_inteira_sem_metadados(monkeypatch):
+    import normalizacao_imagens
+
+    # Recorte/conversão que não compensa (maior que o arquivo enviado)
+    monkeypatch.setattr(normalizacao_imagens, "_compactar", lambda imagem: io.BytesIO(b"x" * 10 ** 6))
+    imagem = ruido(64, 64)
+    metadados = PngInfo()
+    metadados.add_text("Software", "Ferramenta de Captura")
+    original = png(imagem, optimize=True, pnginfo=metadados, icc_profile=b"perfil" * 200).getvalue()
+    saida, info = normalizar_png(io.BytesIO(original))
+    assert info["recorte"] is None
+    guardada = Image.open(saida)
+    assert guardada.mode == "RGB" and guardada.size == (64, 64)
+    assert "Software" not in guardada.info and "icc_profile" not in guardada.info
+    assert np.array_equal(np.asarray(guardada), np.asarray(imagem))
+    assert info["bytes_final"] < info["bytes_original"]
+
+
+def test_ruido_sem_borda_nao_aumenta():
+    original = png(ruido(64, 64), optimize=True).getvalue()
+    saida, info = normalizar_png(io.BytesIO(original))
+    assert np.array_equal(np.asarray(Image.open(saida)), np.asarray(Image.open(io.BytesIO(original))))
+    assert info["bytes_final"] <= info["bytes_original"]
+
+
+def test_recorte_tambem_perde_o_perfil_de_cor():
+    imagem = Image.new("RGB", (800, 600), "white")
+    imagem.paste(ruido(40, 30), (50, 30))
+    saida, info = normalizar_png(png(imagem, icc_profile=b"perfil" * 200))
+    assert info["recorte"] is not None
+    assert "icc_profile" not in Image.open(saida).info
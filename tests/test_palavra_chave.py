@@ -0,0 +1,61 @@
+import wave
+
+import numpy as np
+
+from palavra_chave import TAXA, DetectorPalavraChave, detectar_voz
+
+SILENCIO = 0.3
+
+
+def tons(frequencias, duracao=0.25, taxa=TAXA, ruido=20, semente=0):
+    """Frase sintética: silêncio, uma sequência de tons e silêncio de novo"""
+    sorteio = np.random.default_rng(semente)
+    t = np.arange(int(duracao * taxa)) / taxa
+    partes = [np.zeros(int(SILENCIO * taxa))]
+    partes += [4000 * np.sin(2 * np.pi * f * t) * np.hanning(len(t)) ** 0.2 for f in frequencias]
+    partes.append(np.zeros(int(SILENCIO * taxa)))
+    sinal = np.concatenate(partes) + sorteio.normal(0, ruido, sum(len(p) for p in partes))
+    return sinal.astype(np.int16)
+
+
+BOM_DIA = [300, 900, 500]
+OUTRA = [1800, 250, 1200]
+
+
+def gravar_wav(caminho, amostras, taxa=TAXA):
+    with wave.open(str(caminho), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(taxa)
+        w.writeframes(amostras.tobytes())
+
+
+def test_detectar_voz_recorta_o_silencio():
+    inicio, fim = detectar_voz(tons(BOM_DIA).astype(np.float32))
+    assert abs(inicio / TAXA - SILENCIO) < 0.05
+    assert abs(fim / TAXA - (SILENCIO + 0.75)) < 0.05
+    assert detectar_voz(np.random.default_rng(0).normal(0, 20, TAXA)) is None
+
+
+def test_sem_referencias_filtra_so_pela_voz():
+    detector = DetectorPalavraChave()
+    assert detector.avaliar(tons(OUTRA))[0]
+    assert not detector.avaliar(np.zeros(TAXA, dtype=np.int16))[0]
+    # Um estalo curto demais para ser uma frase
+    assert not detector.avaliar(tons([700], duracao=0.1))[0]
+
+
+def test_referencias_em_wav(tmp_path):
+    for semente in range(3):
+        gravar_wav(tmp_path / f"bom_dia_{semente}.wav", tons(BOM_DIA, semente=semente))
+    detector = DetectorPalavraChave.de_pasta(str(tmp_path))
+    assert len(detector.referencias) == 3
+
+    # A mesma frase, 20% mais lenta, em outra taxa de amostragem e com outro ruído
+    falada = tons(BOM_DIA, duracao=0.3, taxa=44100, semente=7)
+    provavel, distancia = detector.avaliar(falada, 44100)
+    assert provavel
+    assert not detector.avaliar(tons(OUTRA, semente=7))[0]
+    assert detector.avaliar(tons(OUTRA, semente=7))[1] > distancia
+    # Sem comparar com as gravações, outra frase falada também passa
+    assert detector.avaliar(tons(OUTRA, semente=7), comparar=False)[0]
@@ -0,0 +1,179 @@
+import threading
+import webbrowser
+from datetime import datetime
+
+import pytest
+
+import navegador
+import preaquecimento
+import rotina
+from executor_rotina import ExecutorRotina
+from preaquecimento import Preaquecedor
+from rotina import Site
+from test_navegador import navegador_falso
+
+SITES = [
+    Site("SEI", "https://sei.al.gov.br", "maria", "senha"),
+    Site("GMAIL", "https://mail.google.com", "maria", "senha"),
+]
+URLS = [site.url for site in SITES]
+# Segunda-feira
+SEGUNDA = datetime(2024, 5, 6)
+
+
+class Relogio:
+    def __init__(self, momento):
+        self.momento = momento
+
+    def __call__(self):
+        return self.momento.timestamp()
+
+
+class Navegador:
+    """Abas com título; abrir acrescenta no fim, Ctrl+9 e Ctrl+PageUp mudam o foco"""
+
+    TITULOS = {"https://sei.al.gov.br": "SEI - Acesso", "https://mail.google.com": "Gmail"}
+
+    def __init__(self):
+        self.abas = []
+        self.ativa = None
+        self.aberturas = []
+        self.preenchidas = []
+
+    def abrir(self, urls):
+        self.aberturas.append(list(urls))
+        self.abas += [self.TITULOS[url] for url in urls]
+
+    def focar(self, *teclas):
+        self.ativa = len(self.abas) - 1 if teclas == ("ctrl", "9") else self.ativa - 1
+
+    def titulo(self):
+        return self.abas[self.ativa]
+
+    def preencher(self, login, senha, nome):
+        self.preenchidas.append(nome)
+
+
+@pytest.fixture
+def sem_espera(monkeypatch):
+    monkeypatch.setattr(preaquecimento, "ESPERA_JANELA", 0.01)
+    monkeypatch.setattr(preaquecimento, "PASSO_JANELA", 0.001)
+    monkeypatch.setattr(rotina, "_preabertos", None)
+
+
+def preaquecedor(tmp_path, relogio, falso, **kwargs):
+    opcoes = dict(janela=(8 * 3600, 8 * 3600 + 1800), pasta=str(tmp_path), abrir=falso.abrir,
+                  capturar_janela=lambda: "janela", ativar=lambda janela: True,
+                  do_navegador=lambda janela: True, relogio=relogio)
+    opcoes.update(kwargs)
+    return Preaquecedor(lambda: URLS, **opcoes)
+
+
+def test_abre_uma_vez_dentro_da_janela_em_dia_util(tmp_path, sem_espera):
+    relogio = Relogio(SEGUNDA.replace(hour=7, minute=59))
+    falso = Navegador()
+    agendador = preaquecedor(tmp_path, relogio, falso)
+    assert not agendador.verificar()
+    relogio.momento = SEGUNDA.replace(hour=8, minute=1)
+    assert agendador.verificar()
+    assert not agendador.verificar()
+    assert falso.aberturas == [URLS]
+
+    # Sábado
+    relogio.momento = datetime(2024, 5, 11, 8, 1)
+    assert not agendador.verificar()
+
+
+def test_bom_dia_usa_as_abas_e_so_reabre_as_que_sumiram(tmp_path, sem_espera, monkeypatch):
+    falso = Navegador()
+    preaquecedor(tmp_path, Relogio(SEGUNDA.replace(hour=8)), falso).preaquecer()
+    # O usuário fechou o Gmail e abriu outra coisa antes do "bom dia"
+    falso.abas[-1] = "Planilha - LibreOffice"
+    monkeypatch.setattr(navegador, "abrir_urls", falso.abrir)
+
+    rotina.executar_rotina(SITES, focar=falso.focar, preencher=falso.preencher,
+                           aguardar=lambda **kwargs: True, capturar=lambda: None, titulo=falso.titulo)
+    assert falso.aberturas == [URLS, ["https://mail.google.com"]]
+    assert sorted(falso.preenchidas) == ["GMAIL", "SEI"]
+
+
+def test_abrir_outro_sistema_nao_gasta_as_abas_do_bom_dia(tmp_path, sem_espera):
+    preaquecedor(tmp_path, Relogio(SEGUNDA.replace(hour=8)), Navegador()).preaquecer()
+    assert not rotina._usar_preabertos(["https://sei.al.gov.br"])
+    assert rotina._usar_preabertos(list(reversed(URLS)))
+    assert rotina._preabertos is None
+
+
+def test_janela_que_nao_e_do_navegador_nao_e_aproveitada(tmp_path, sem_espera):
+    falso = Navegador()
+    preaquecedor(tmp_path, Relogio(SEGUNDA.replace(hour=8)), falso, do_navegador=lambda janela: False).preaquecer()
+    assert falso.aberturas == [URLS]
+    assert rotina._preabertos is None
+
+
+@pytest.fixture
+def navegador_registrado(tmp_path, monkeypatch):
+    """Navegador de linha de comando registrado no webbrowser; devolve as chamadas"""
+    caminho, chamadas = navegador_falso(str(tmp_path))
+    webbrowser.register("falso_preaquecimento", None, webbrowser.GenericBrowser([caminho, "%s"]))
+    monkeypatch.setenv("NAVEGADOR", "falso_preaquecimento")
+    return chamadas
+
+
+def test_abre_pelo_navegador_registrado(tmp_path, sem_espera, navegador_registrado):
+    relogio = Relogio(SEGUNDA.replace(hour=8, minute=5))
+    agendador = preaquecedor(tmp_path, relogio, Navegador(), abrir=None)
+    assert agendador.verificar()
+    assert navegador_registrado() == [URLS]
+
+
+def test_modo_simulado_nao_abre_nada(tmp_path, sem_espera, navegador_registrado):
+    relogio = Relogio(SEGUNDA.replace(hour=8, minute=5))
+    agendador = Preaquecedor.do_ambiente(
+        lambda: URLS, str(tmp_path), getenv={"PREAQUECIMENTO": "08:00-08:30", "PREAQUECIMENTO_SIMULADO": "1"}.get,
+        relogio=relogio,
+    )
+    assert agendador.simular
+    assert agendador.verificar()
+    assert navegador_registrado() == []
+    assert rotina._preabertos is None
+
+
+def test_abre_na_thread_dos_comandos(tmp_path, sem_espera):
+    executor = ExecutorRotina(str(tmp_path / "bom_dia.py"), isolar=False)
+    liberar = threading.Event()
+    threads = []
+
+    def abrir(urls):
+        threads.append(threading.current_thread())
+        liberar.wait(5)
+
+    relogio = Relogio(SEGUNDA.replace(hour=8, minute=5))
+    agendador = preaquecedor(tmp_path, relogio, Navegador(), abrir=abrir, despachar=executor.despachar)
+    assert agendador.verificar()
+    # Enquanto abre as abas, um "abrir SEI" (ou o "bom dia") não roda junto
+    assert not executor.despachar(lambda: None)
+    liberar.set()
+    executor.aguardar(5)
+    assert threads and threads[0] is not threading.main_thread()
+    assert rotina._preabertos is not None
+    # Já feito hoje
+    assert not agendador.verificar()
+
+
+def test_com_a_thread_ocupada_tenta_na_proxima_verificacao(tmp_path, sem_espera):
+    falso = Navegador()
+    ocupado = [True]
+
+    def despachar(funcao):
+        if ocupado[0]:
+            return False
+        funcao()
+        return True
+
+    agendador = preaquecedor(tmp_path, Relogio(SEGUNDA.replace(hour=8, minute=5)), falso, despachar=despachar)
+    assert not agendador.verificar()
+    assert falso.aberturas == []
+    ocupado[0] = False
+    assert agendador.verificar()
+    assert falso.aberturas == [URLS]
@@ -0,0 +1,84 @@
+from prontidao import aguardar_pronto, diferenca
+
+
+class TelaRoteirizada:
+    """Fonte de tela que devolve um quadro por captura, com relógio falso"""
+
+    def __init__(self, quadros):
+        self.quadros = list(quadros)
+        self.agora = 0.0
+        self.capturas = 0
+
+    def fonte(self):
+        quadro = self.quadros[min(self.capturas, len(self.quadros) - 1)]
+        self.capturas += 1
+        return quadro
+
+    def relogio(self):
+        return self.agora
+
+    def dormir(self, segundos):
+        self.agora += segundos
+
+
+def esperar(tela, **kwargs):
+    return aguardar_pronto(fonte=tela.fonte, relogio=tela.relogio, dormir=tela.dormir, **kwargs)
+
+
+def test_diferenca():
+    assert diferenca(b"\x00" * 4, b"\x00" * 4) == 0
+    assert diferenca(b"\x00" * 4, b"\x00\x00\xff\xff") == 0.5
+    assert diferenca(b"\x00" * 4, b"\x00" * 3) == 1.0
+
+
+def test_pronta_quando_para_de_mudar():
+    carregando = [bytes([i % 2 * 255]) * 16 for i in range(10)]
+    tela = TelaRoteirizada(carregando + [b"\x80" * 16])
+    assert esperar(tela, estavel=0.3, intervalo=0.1, timeout=5)
+    # Segue logo depois dos quadros de carregamento, sem esperar o timeout
+    assert tela.agora < 1.5
+
+
+def test_espera_a_tela_diferir_da_referencia():
+    referencia = b"\x10" * 16
+    tela = TelaRoteirizada([referencia] * 5 + [b"\x80" * 16])
+    assert esperar(tela, referencia=referencia, estavel=0.2, intervalo=0.1, timeout=5)
+    assert tela.capturas > 5
+
+
+def test_timeout_se_a_tela_nunca_muda():
+    referencia = b"\x10" * 16
+    tela = TelaRoteirizada([referencia])
+    assert not esperar(tela, referencia=referencia, intervalo=0.1, timeout=1)
+    assert tela.agora >= 1
+
+
+def test_com_campo_de_login_a_tela_parada_nao_basta():
+    tela = TelaRoteirizada([b"\x80" * 16])
+    assert esperar(tela, pronto=lambda: tela.agora >= 2, estavel=0.3, intervalo=0.1, timeout=5)
+    assert 2 <= tela.agora < 2.2
+
+
+def test_timeout_se_o_campo_de_login_nao_aparece():
+    tela = TelaRoteirizada([b"\x80" * 16])
+    assert not esperar(tela, pronto=lambda: False, intervalo=0.1, timeout=1)
+    assert tela.agora >= 1
+
+
+def test_localizador_de_imagem(tmp_path):
+    import cv2
+    import numpy as np
+
+    from captura_tela import CapturaTela
+    from correspondencia import MotorCorrespondencia
+    from prontidao import localizador_imagem
+
+    tela = cv2.GaussianBlur(np.random.default_rng(5).integers(0, 256, (200, 300), dtype=np.uint8), (5, 5), 0)
+    caminho = str(tmp_path / "campo_login.png")
+    cv2.imwrite(caminho, tela[50:80, 100:180])
+    # Primeiro a página em branco, depois com o formulário
+    quadros = iter([np.full_like(tela, 255), tela])
+    captura = CapturaTela(grab=lambda area: next(quadros))
+    visivel = localizador_imagem(caminho, MotorCorrespondencia(), captura)
+    assert not visivel()
+    assert visivel()
@@ -0,0 +1,114 @@
+from rotina import Site, identificar_aba, marcas_sites, preencher_abas
+
+SITES = [
+    Site("GMAIL", "https://mail.google.com", "maria", "senha"),
+    Site("GOOGLE_AGENDA", "https://calendar.google.com", "maria", "senha"),
+    Site("SOLAR", "https://solar.defensoria.al.def.br/atendimento/", "maria", "senha"),
+    Site("DIARIO_OFICIAL", "https://defensoria.al.def.br/diario-oficial", None, None),
+]
+
+
+def identificar(titulo, getenv=lambda chave: None):
+    site = identificar_aba(titulo, SITES, marcas_sites(SITES), getenv)
+    return site and site.nome
+
+
+def test_identifica_pelo_nome_ou_endereco():
+    assert identificar("Caixa de entrada (3) - maria@gmail.com - Gmail - Google Chrome") == "GMAIL"
+    assert identificar("Google Agenda - Semana de 6 de maio - Google Chrome") == "GOOGLE_AGENDA"
+    assert identificar("solar.defensoria.al.def.br/atendimento - Google Chrome") == "SOLAR"
+    assert identificar("Diário Oficial - Mozilla Firefox") == "DIARIO_OFICIAL"
+
+
+def test_nao_identifica_titulo_ambiguo_ou_alheio():
+    # "google" e "defensoria" são comuns a mais de um site
+    assert identificar("Google Chrome") is None
+    assert identificar("Defensoria Pública") is None
+    assert identificar("Planilha sem título - LibreOffice Calc") is None
+    assert identificar(None) is None
+
+
+def test_titulo_configurado_no_env():
+    getenv = {"TITULO_SOLAR": "Sistema de Atendimento"}.get
+    assert identificar("Sistema de Atendimento - Google Chrome", getenv) == "SOLAR"
+    assert identificar("solar.defensoria.al.def.br - Google Chrome", getenv) is None
+
+
+class AbasFalsas:
+    """Abas em ordem qualquer; Ctrl+9 e Ctrl+PageUp mudam a aba em foco"""
+
+    def __init__(self, titulos):
+        self.titulos = titulos
+        self.ativa = None
+        self.preenchidas = []
+
+    def focar(self, *teclas):
+        self.ativa = len(self.titulos) - 1 if teclas == ("ctrl", "9") else self.ativa - 1
+
+    def titulo(self):
+        return self.titulos[self.ativa]
+
+    def preencher(self, login, senha, nome):
+        self.preenchidas.append((self.titulos[self.ativa], nome))
+
+
+def test_preenche_cada_aba_pelo_titulo_em_qualquer_ordem():
+    abas = AbasFalsas(["Solar", "Diário Oficial", "Gmail", "Página nova"])
+    pendentes = preencher_abas(SITES, abas.focar, abas.preencher, lambda **kwargs: True, abas.titulo)
+    assert sorted(abas.preenchidas) == [("Gmail", "GMAIL"), ("Solar", "SOLAR")]
+    # A aba que não foi reconhecida não recebe nada; a agenda fica pendente
+    assert [site.nome for site in pendentes] == ["GOOGLE_AGENDA"]
+
+
+def test_nao_digita_sem_titulo():
+    abas = AbasFalsas(["Gmail"])
+    pendentes = preencher_abas(SITES[:1], abas.focar, abas.preencher, lambda **kwargs: True, lambda: None)
+    assert abas.preenchidas == []
+    assert pendentes == SITES[:1]
+
+
+def test_espera_o_campo_de_login_quando_ha_imagem(tmp_path, monkeypatch):
+    import plano
+    import rotina
+
+    (tmp_path / "imagens").mkdir()
+    (tmp_path / "imagens" / "campo_login_GMAIL.png").write_bytes(b"")
+    passo = {"tipo": "site", "nome": "GMAIL", "url": "https://mail.google.com", "login": "LOGIN_GMAIL"}
+    site = plano.site(passo, {"LOGIN_GMAIL": "maria"}.get, str(tmp_path))
+    assert site.campo_login == str(tmp_path / "imagens" / "campo_login_GMAIL.png")
+    assert plano.site(dict(passo, nome="SEI"), {}.get, str(tmp_path)).campo_login is None
+
+    monkeypatch.setattr(rotina, "campo_visivel", lambda caminho: ("campo", caminho))
+    esperas = []
+    abas = AbasFalsas(["Gmail"])
+    preencher_abas([site], abas.focar, abas.preencher, lambda **kwargs: esperas.append(kwargs) or True, abas.titulo)
+    assert esperas[-1]["pronto"] == ("campo", site.campo_login)
+    assert abas.preenchidas == [("Gmail", "GMAIL")]
+
+
+def test_sites_do_catalogo_com_titulo_sem_nome_nem_endereco():
+    import plano
+    from gerador_pacote import montar_plano
+
+    passos = montar_plano(["TJ-AL (e-SAJ)", "Webmail", "SEI"], [{"nome": "Intranet Jurídica", "url": "https://intranet.exemplo"}])
+    sites = [plano.site(passo, lambda chave: None) for passo in passos["passos"]]
+    marcas = marcas_sites(sites)
+
+    def nome(titulo):
+        site = identificar_aba(titulo, sites, marcas, lambda chave: None)
+        return site and site.nome
+
+    assert nome("Portal de Serviços e-SAJ - Google Chrome") == "TJ_AL"
+    assert nome("Zimbra Web Client Sign In - Mozilla Firefox") == "WEBMAIL"
+    assert nome("SEI - Sistema Eletrônico de Informações") == "SEI"
+
+
+def test_chave_do_titulo_pode_ser_escrita_no_env():
+    from rotina import chave_titulo
+
+    assert chave_titulo("TJ_AL") == "TITULO_TJ_AL"
+    assert chave_titulo("Sistema Interno") == "TITULO_SISTEMA_INTERNO"
+    assert chave_titulo("Gestão (RH)") == "TITULO_GESTAO_RH"
+    site = Site("Sistema Interno", "https://si.exemplo", "maria", "senha")
+    getenv = {"TITULO_SISTEMA_INTERNO": "Intranet"}.get
+    assert identificar_aba("Intranet - Chrome", [site], marcas_sites([site]), getenv) == site